@@ -0,0 +1,36 @@
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+import jwt
+import os
+
+from cache.token_cache import TokenCache
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+JWT_SECRET = os.getenv("JWT_SECRET", "thenromanov-secret-key")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+
+token_cache = TokenCache(max_size=JWT_CACHE_SIZE, name="jwt")
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    payload = token_cache.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        except jwt.PyJWTError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        token_cache.set(token, payload)
+
+    user_id = payload.get("id")
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return {"user_id": user_id}
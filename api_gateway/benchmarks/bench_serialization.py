@@ -0,0 +1,115 @@
+import json
+import timeit
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from proto import post_pb2
+from routes.post_routes import PaginatedResponse, GetCommentsResponse
+from serialization.fast_json import FastJSONResponse, posts_page_to_dict, comments_page_to_dict
+
+PAGE_SIZE = 100
+ROUNDS = 200
+
+
+def make_posts_page():
+    now = datetime.now().isoformat()
+    return post_pb2.ListPostsResponse(
+        posts=[
+            post_pb2.Post(
+                id=f"post-{i}",
+                title=f"Post title {i}",
+                description="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+                creator_id=f"user-{i % 10}",
+                created_at=now,
+                updated_at=now,
+                is_private=False,
+                tags=["python", "grpc", "fastapi"],
+            )
+            for i in range(PAGE_SIZE)
+        ],
+        total=PAGE_SIZE * 10,
+        page=1,
+        page_size=PAGE_SIZE,
+    )
+
+
+def make_comments_page():
+    now = datetime.now().isoformat()
+    return post_pb2.GetCommentsResponse(
+        comments=[
+            post_pb2.Comment(
+                id=f"comment-{i}",
+                post_id="post-1",
+                user_id=f"user-{i % 10}",
+                text="Nice post, thanks for sharing!",
+                created_at=now,
+            )
+            for i in range(PAGE_SIZE)
+        ],
+        total=PAGE_SIZE * 10,
+        page=1,
+        page_size=PAGE_SIZE,
+    )
+
+
+def model_posts_page(response):
+    content = {
+        "posts": [
+            {
+                "id": post.id,
+                "title": post.title,
+                "description": post.description,
+                "creator_id": post.creator_id,
+                "created_at": datetime.fromisoformat(post.created_at),
+                "updated_at": datetime.fromisoformat(post.updated_at),
+                "is_private": post.is_private,
+                "tags": list(post.tags),
+            }
+            for post in response.posts
+        ],
+        "total": response.total,
+        "page": response.page,
+        "page_size": response.page_size,
+    }
+    return json.dumps(jsonable_encoder(PaginatedResponse(**content))).encode("utf-8")
+
+
+def model_comments_page(response):
+    content = {
+        "comments": [
+            {
+                "id": c.id,
+                "post_id": c.post_id,
+                "user_id": c.user_id,
+                "text": c.text,
+                "created_at": datetime.fromisoformat(c.created_at),
+            }
+            for c in response.comments
+        ],
+        "total": response.total,
+        "page": response.page,
+        "page_size": response.page_size,
+    }
+    return json.dumps(jsonable_encoder(GetCommentsResponse(**content))).encode("utf-8")
+
+
+def per_item_us(fn, response):
+    seconds = min(timeit.repeat(lambda: fn(response), number=ROUNDS, repeat=5))
+    return seconds / ROUNDS / PAGE_SIZE * 1e6
+
+
+def main():
+    cases = [
+        ("posts", make_posts_page(), model_posts_page, posts_page_to_dict),
+        ("comments", make_comments_page(), model_comments_page, comments_page_to_dict),
+    ]
+    print(f"{'page':<10}{'response_model':>18}{'fast path':>14}{'speedup':>10}")
+    for name, response, model_fn, to_dict in cases:
+        baseline = per_item_us(model_fn, response)
+        fast = per_item_us(lambda r: FastJSONResponse(to_dict(r)).body, response)
+        print(f"{name:<10}{baseline:>15.2f} us{fast:>11.2f} us{baseline / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import asyncio
+
+from metrics.registry import SINGLEFLIGHT_CALLS
+
+
+class SingleFlight:
+    def __init__(self, name="default"):
+        self.name = name
+        self.calls = {}
+        self.executed = 0
+        self.collapsed = 0
+
+    def start(self, key, fn):
+        task = self.calls.get(key)
+        if task is not None:
+            self.collapsed += 1
+            SINGLEFLIGHT_CALLS.labels(self.name, "collapsed").inc()
+            return task
+
+        self.executed += 1
+        SINGLEFLIGHT_CALLS.labels(self.name, "executed").inc()
+        task = asyncio.ensure_future(fn())
+        self.calls[key] = task
+
+        def forget(done):
+            if self.calls.get(key) is done:
+                del self.calls[key]
+
+        task.add_done_callback(forget)
+        return task
+
+    async def do(self, key, fn):
+        return await asyncio.shield(self.start(key, fn))
@@ -0,0 +1,51 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from metrics.registry import CACHE_REQUESTS
+
+
+class TokenCache:
+    def __init__(self, max_size=10000, name="token"):
+        self.max_size = max_size
+        self.name = name
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token):
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token):
+        key = self._key(token)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            CACHE_REQUESTS.labels(self.name, "miss").inc()
+            return None
+
+        payload, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self.entries[key]
+            self.misses += 1
+            CACHE_REQUESTS.labels(self.name, "miss").inc()
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        CACHE_REQUESTS.labels(self.name, "hit").inc()
+        return payload
+
+    def set(self, token, payload):
+        expires_at = payload.get("exp")
+        key = self._key(token)
+        self.entries[key] = (payload, float(expires_at) if expires_at is not None else None)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,73 @@
+import logging
+import time
+from collections import OrderedDict
+
+from cache.singleflight import SingleFlight
+from metrics.registry import CACHE_REQUESTS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    def __init__(self, ttl, stale_ttl=0, max_size=1024, name="ttl"):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.name = name
+        self.entries = OrderedDict()
+        self.singleflight = SingleFlight(name=name)
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return entry[0]
+
+    def set(self, key, value):
+        self.entries[key] = (value, time.monotonic())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    async def get_or_load(self, key, loader):
+        entry = self.entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age < self.ttl:
+                self.hits += 1
+                CACHE_REQUESTS.labels(self.name, "hit").inc()
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                CACHE_REQUESTS.labels(self.name, "stale_hit").inc()
+                self._refresh(key, loader)
+                return value
+
+        self.misses += 1
+        CACHE_REQUESTS.labels(self.name, "miss").inc()
+        return await self.singleflight.do(key, lambda: self._fetch(key, loader))
+
+    async def _fetch(self, key, loader):
+        value = await loader()
+        self.set(key, value)
+        return value
+
+    def _refresh(self, key, loader):
+        if key in self.singleflight.calls:
+            return
+
+        task = self.singleflight.start(key, lambda: self._fetch(key, loader))
+
+        def log_failure(done):
+            if not done.cancelled() and done.exception() is not None:
+                logger.warning(f"Background refresh of {key} failed: {done.exception()}")
+
+        task.add_done_callback(log_failure)
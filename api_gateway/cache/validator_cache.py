@@ -0,0 +1,69 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from metrics.registry import CACHE_REQUESTS
+
+
+def make_etag(*parts):
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8"))
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+
+def opaque_tag(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match or not etag:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or opaque_tag(candidate) == opaque_tag(etag):
+            return True
+    return False
+
+
+class ValidatorCache:
+    def __init__(self, ttl, max_size=10000, name="validator"):
+        self.ttl = ttl
+        self.name = name
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, post_id, variant=None):
+        return self.get_any(post_id, (variant,))
+
+    def get_any(self, post_id, variants):
+        variants_entries = self.entries.get(post_id, {})
+        for variant in variants:
+            entry = variants_entries.get(variant)
+            if entry is None:
+                continue
+
+            etag, stored_at = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del variants_entries[variant]
+                continue
+
+            self.hits += 1
+            CACHE_REQUESTS.labels(self.name, "hit").inc()
+            return etag
+
+        self.misses += 1
+        CACHE_REQUESTS.labels(self.name, "miss").inc()
+        return None
+
+    def set(self, post_id, etag, variant=None):
+        self.entries.setdefault(post_id, {})[variant] = (etag, time.monotonic())
+        self.entries.move_to_end(post_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, post_id):
+        self.entries.pop(post_id, None)
+
+    def clear(self):
+        self.entries.clear()
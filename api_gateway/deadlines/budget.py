@@ -0,0 +1,38 @@
+import os
+import time
+from contextvars import ContextVar
+
+DEADLINE_BUDGETS = {
+    "reads": float(os.getenv("DEADLINE_READS", "2")),
+    "writes": float(os.getenv("DEADLINE_WRITES", "5")),
+    "engagement": float(os.getenv("DEADLINE_ENGAGEMENT", "2")),
+    "auth": float(os.getenv("DEADLINE_AUTH", "10")),
+}
+
+request_deadline = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, server_address):
+        super().__init__(f"Deadline exceeded waiting for {server_address}")
+        self.server_address = server_address
+
+
+def deadline_budget(route_class):
+    async def set_deadline():
+        request_deadline.set(time.monotonic() + DEADLINE_BUDGETS[route_class])
+
+    return set_deadline
+
+
+def time_remaining():
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0)
+
+
+reads_budget = deadline_budget("reads")
+writes_budget = deadline_budget("writes")
+engagement_budget = deadline_budget("engagement")
+auth_budget = deadline_budget("auth")
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import os
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MAX_REQUEST_BODY_BYTES = int(os.getenv("MAX_REQUEST_BODY_BYTES", str(1024 * 1024)))
+
+
+async def send_payload_too_large(send):
+    body = b'{"detail":"Request body too large"}'
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class CancelOnDisconnectMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self.cancelled = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope.get("headers", [])).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > MAX_REQUEST_BODY_BYTES:
+            await send_payload_too_large(send)
+            return
+
+        messages = []
+        body_size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body_size += len(message.get("body", b""))
+            if body_size > MAX_REQUEST_BODY_BYTES:
+                await send_payload_too_large(send)
+                return
+            messages.append(message)
+            if not message.get("more_body", False):
+                break
+
+        disconnect_task = asyncio.ensure_future(receive())
+
+        async def replay_receive():
+            if messages:
+                return messages.pop(0)
+            return await asyncio.shield(disconnect_task)
+
+        app_task = asyncio.ensure_future(self.app(scope, replay_receive, send))
+        await asyncio.wait({app_task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED)
+
+        if app_task.done():
+            disconnect_task.cancel()
+            app_task.result()
+            return
+
+        self.cancelled += 1
+        logger.info(f"Client disconnected, cancelling {scope['method']} {scope['path']}")
+        app_task.cancel()
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,185 @@
+import asyncio
+import functools
+import grpc
+import json
+import logging
+import os
+import time
+
+from deadlines.budget import DeadlineExceeded, time_remaining
+from grpc_client.channel_pool import CHANNEL_SELECTION, ChannelPool
+from grpc_client.circuit_breaker import CircuitBreaker
+from grpc_client.hedging import LatencyTracker, hedged_call
+from limits.concurrency_limiter import ConcurrencyLimiter
+from metrics.registry import GRPC_CLIENT_HEDGES, GRPC_CLIENT_LATENCY
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_BYTES = int(os.getenv("GRPC_MAX_MESSAGE_BYTES", str(16 * 1024 * 1024)))
+
+CHANNEL_OPTIONS = [
+    ("grpc.initial_reconnect_backoff_ms", 200),
+    ("grpc.min_reconnect_backoff_ms", 200),
+    ("grpc.max_reconnect_backoff_ms", 10000),
+    ("grpc.dns_min_time_between_resolutions_ms", 5000),
+    ("grpc.enable_retries", 1),
+    ("grpc.keepalive_time_ms", int(os.getenv("GRPC_KEEPALIVE_TIME_MS", "30000"))),
+    ("grpc.keepalive_timeout_ms", int(os.getenv("GRPC_KEEPALIVE_TIMEOUT_MS", "10000"))),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_send_message_length", MAX_MESSAGE_BYTES),
+    ("grpc.max_receive_message_length", MAX_MESSAGE_BYTES),
+]
+
+RETRY_POLICY = {
+    "maxAttempts": 3,
+    "initialBackoff": "0.05s",
+    "maxBackoff": "0.5s",
+    "backoffMultiplier": 2,
+    "retryableStatusCodes": ["UNAVAILABLE"],
+}
+RETRY_THROTTLING = {"maxTokens": 10, "tokenRatio": 0.1}
+
+
+def resolver_target(server_address):
+    if "://" in server_address or server_address.startswith(("unix:", "ipv4:", "ipv6:")):
+        return server_address
+    return f"dns:///{server_address}"
+
+
+class BaseClient:
+    stub_class = None
+    service_name = ""
+    idempotent_methods = ()
+    non_idempotent_methods = ()
+
+    def __init__(self, server_address, max_in_flight, pool_size=1):
+        self.server_address = server_address
+        self.target = resolver_target(server_address)
+        self.limiter = ConcurrencyLimiter(server_address, max_in_flight)
+        self.breaker = CircuitBreaker(server_address)
+        self.latencies = {name: LatencyTracker() for name in self.idempotent_methods}
+        self.hedged = 0
+        self.pool = ChannelPool(
+            self.service_name,
+            self.target,
+            self.stub_class,
+            self.channel_options(),
+            pool_size,
+            CHANNEL_SELECTION,
+        )
+        self.connected = False
+
+    def service_config(self):
+        config = {
+            "loadBalancingConfig": [{"round_robin": {}}],
+            "healthCheckConfig": {"serviceName": self.service_name},
+        }
+        method_config = []
+        if self.idempotent_methods:
+            method_config.append(
+                {
+                    "name": [
+                        {"service": self.service_name, "method": name}
+                        for name in self.idempotent_methods
+                    ],
+                    "retryPolicy": RETRY_POLICY,
+                }
+            )
+            config["retryThrottling"] = RETRY_THROTTLING
+        if self.non_idempotent_methods:
+            method_config.append(
+                {
+                    "name": [
+                        {"service": self.service_name, "method": name}
+                        for name in self.non_idempotent_methods
+                    ],
+                }
+            )
+        if method_config:
+            config["methodConfig"] = method_config
+        return config
+
+    def channel_options(self):
+        return CHANNEL_OPTIONS + [("grpc.service_config", json.dumps(self.service_config()))]
+
+    def connect(self):
+        self.breaker.set_state(self.breaker.state)
+        self.pool.connect()
+
+    async def wait_until_ready(self, initial_timeout=0.5, max_timeout=10):
+        self.connect()
+        timeout = initial_timeout
+        attempt = 0
+        while True:
+            attempt += 1
+            logger.info(f"Connecting {self.server_address} {attempt}")
+            try:
+                await asyncio.wait_for(self.pool.channel_ready(), timeout=timeout)
+                self.connected = True
+                logger.info(f"Connected {self.server_address}")
+                return
+            except asyncio.TimeoutError:
+                logger.warning(f"Timeout {attempt}, next wait {min(timeout * 2, max_timeout)} sec")
+                timeout = min(timeout * 2, max_timeout)
+
+    async def invoke(self, name, request, **kwargs):
+        with self.pool.acquire() as stub:
+            return await getattr(stub, name)(request, **kwargs)
+
+    async def call(self, name, request, timeout=None, **kwargs):
+        method = functools.partial(self.invoke, name)
+        remaining = time_remaining()
+        if remaining is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        with self.limiter.slot():
+            self.breaker.allow()
+            code = grpc.StatusCode.OK
+            started = time.perf_counter()
+            try:
+                if name in self.latencies:
+                    response, hedged = await hedged_call(
+                        method,
+                        request,
+                        self.latencies[name],
+                        timeout=timeout,
+                        limiter=self.limiter,
+                        **kwargs,
+                    )
+                    if hedged:
+                        self.hedged += 1
+                        GRPC_CLIENT_HEDGES.labels(self.service_name, name).inc()
+                    return response
+                return await method(request, timeout=timeout, **kwargs)
+            except grpc.RpcError as e:
+                code = e.code()
+                if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED and remaining is not None:
+                    raise DeadlineExceeded(self.server_address) from e
+                raise
+            except asyncio.CancelledError:
+                code = grpc.StatusCode.CANCELLED
+                raise
+            finally:
+                duration = time.perf_counter() - started
+                if code == grpc.StatusCode.CANCELLED:
+                    self.breaker.release()
+                else:
+                    self.breaker.record(code, duration)
+                GRPC_CLIENT_LATENCY.labels(self.service_name, name, code.name).observe(duration)
+
+    def is_ready(self):
+        if not self.connected or not self.pool.channels:
+            return False
+        return any(
+            state not in (
+                grpc.ChannelConnectivity.TRANSIENT_FAILURE,
+                grpc.ChannelConnectivity.SHUTDOWN,
+            )
+            for state in self.pool.states()
+        )
+
+    async def close(self):
+        if self.pool.channels:
+            await self.pool.close()
+            self.connected = False
@@ -0,0 +1,70 @@
+import asyncio
+import grpc
+import itertools
+import os
+from collections import Counter
+from contextlib import contextmanager
+
+from metrics.registry import GRPC_CHANNEL_CALLS, GRPC_CHANNEL_IN_FLIGHT
+
+CHANNEL_SELECTION = os.getenv("GRPC_CHANNEL_SELECTION", "least_loaded")
+
+LEAST_LOADED = "least_loaded"
+ROUND_ROBIN = "round_robin"
+
+
+class ChannelPool:
+    def __init__(self, service_name, target, stub_class, options, size=1, selection=CHANNEL_SELECTION):
+        if selection not in (LEAST_LOADED, ROUND_ROBIN):
+            raise ValueError(f"Unknown channel selection {selection}")
+        self.service_name = service_name
+        self.target = target
+        self.stub_class = stub_class
+        self.options = options
+        self.size = max(1, size)
+        self.selection = selection
+        self.channels = []
+        self.stubs = []
+        self.in_flight = Counter()
+        self.cursor = itertools.count()
+
+    def connect(self):
+        if not self.channels:
+            for _ in range(self.size):
+                channel = grpc.aio.insecure_channel(
+                    self.target, options=self.options + [("grpc.use_local_subchannel_pool", 1)]
+                )
+                self.channels.append(channel)
+                self.stubs.append(self.stub_class(channel))
+
+    def pick(self):
+        start = next(self.cursor) % len(self.stubs)
+        order = [(start + offset) % len(self.stubs) for offset in range(len(self.stubs))]
+        if self.selection == ROUND_ROBIN:
+            return order[0]
+        return min(order, key=lambda index: self.in_flight[index])
+
+    @contextmanager
+    def acquire(self):
+        index = self.pick()
+        label = str(index)
+        self.in_flight[index] += 1
+        GRPC_CHANNEL_IN_FLIGHT.labels(self.service_name, label).inc()
+        GRPC_CHANNEL_CALLS.labels(self.service_name, label).inc()
+        try:
+            yield self.stubs[index]
+        finally:
+            self.in_flight[index] -= 1
+            GRPC_CHANNEL_IN_FLIGHT.labels(self.service_name, label).dec()
+
+    async def channel_ready(self):
+        await asyncio.gather(*(channel.channel_ready() for channel in self.channels))
+
+    def states(self):
+        return [channel.get_state() for channel in self.channels]
+
+    async def close(self):
+        channels = self.channels
+        self.channels = []
+        self.stubs = []
+        await asyncio.gather(*(channel.close() for channel in channels))
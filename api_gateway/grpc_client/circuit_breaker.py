@@ -0,0 +1,129 @@
+import logging
+import math
+import os
+import time
+from collections import deque
+
+import grpc
+
+from limits.concurrency_limiter import BackendOverloaded
+from metrics.registry import CIRCUIT_BREAKER_REJECTED, CIRCUIT_BREAKER_STATE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", "50"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "20"))
+CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+CIRCUIT_SLOW_CALL_RATE = float(os.getenv("CIRCUIT_SLOW_CALL_RATE", "0.8"))
+CIRCUIT_SLOW_CALL_DURATION = float(os.getenv("CIRCUIT_SLOW_CALL_DURATION", "1"))
+CIRCUIT_OPEN_DURATION = float(os.getenv("CIRCUIT_OPEN_DURATION", "5"))
+CIRCUIT_HALF_OPEN_CALLS = int(os.getenv("CIRCUIT_HALF_OPEN_CALLS", "3"))
+
+FAILURE_CODES = (
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.INTERNAL,
+    grpc.StatusCode.UNKNOWN,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpen(BackendOverloaded):
+    def __init__(self, server_address, retry_after):
+        Exception.__init__(self, f"Circuit for {server_address} is open")
+        self.server_address = server_address
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        server_address,
+        window=CIRCUIT_WINDOW,
+        min_calls=CIRCUIT_MIN_CALLS,
+        failure_rate=CIRCUIT_FAILURE_RATE,
+        slow_call_rate=CIRCUIT_SLOW_CALL_RATE,
+        slow_call_duration=CIRCUIT_SLOW_CALL_DURATION,
+        open_duration=CIRCUIT_OPEN_DURATION,
+        half_open_calls=CIRCUIT_HALF_OPEN_CALLS,
+    ):
+        self.server_address = server_address
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_rate = slow_call_rate
+        self.slow_call_duration = slow_call_duration
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.outcomes = deque(maxlen=window)
+        self.opened_at = None
+        self.probes = 0
+        self.probe_successes = 0
+        self.state = CLOSED
+
+    def set_state(self, state):
+        self.state = state
+        CIRCUIT_BREAKER_STATE.labels(self.server_address).set(STATE_VALUES[state])
+
+    def allow(self):
+        if self.state == OPEN:
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < self.open_duration:
+                CIRCUIT_BREAKER_REJECTED.labels(self.server_address).inc()
+                raise CircuitOpen(
+                    self.server_address, max(math.ceil(self.open_duration - elapsed), 1)
+                )
+            logger.info(f"Circuit for {self.server_address} half-open, probing")
+            self.set_state(HALF_OPEN)
+            self.probes = 0
+            self.probe_successes = 0
+
+        if self.state == HALF_OPEN:
+            if self.probes >= self.half_open_calls:
+                CIRCUIT_BREAKER_REJECTED.labels(self.server_address).inc()
+                raise CircuitOpen(self.server_address, 1)
+            self.probes += 1
+
+    def record(self, code, duration):
+        failed = code in FAILURE_CODES
+        slow = duration >= self.slow_call_duration
+
+        if self.state == HALF_OPEN:
+            if failed or slow:
+                self.trip()
+                return
+            self.probe_successes += 1
+            if self.probe_successes >= self.half_open_calls:
+                logger.info(f"Circuit for {self.server_address} closed")
+                self.outcomes.clear()
+                self.set_state(CLOSED)
+            return
+
+        if self.state != CLOSED:
+            return
+
+        self.outcomes.append((failed, slow))
+        if len(self.outcomes) < self.min_calls:
+            return
+        failures = sum(1 for failed, _ in self.outcomes if failed)
+        slow_calls = sum(1 for _, slow in self.outcomes if slow)
+        if (
+            failures >= self.failure_rate * len(self.outcomes)
+            or slow_calls >= self.slow_call_rate * len(self.outcomes)
+        ):
+            self.trip()
+
+    def release(self):
+        if self.state == HALF_OPEN and self.probes > 0:
+            self.probes -= 1
+
+    def trip(self):
+        logger.warning(f"Circuit for {self.server_address} opened")
+        self.opened_at = time.monotonic()
+        self.outcomes.clear()
+        self.set_state(OPEN)
@@ -0,0 +1,77 @@
+import asyncio
+import grpc
+import os
+import time
+from collections import deque
+
+HEDGE_PERCENTILE = float(os.getenv("GRPC_HEDGE_PERCENTILE", "0.95"))
+HEDGE_DEFAULT_DELAY = float(os.getenv("GRPC_HEDGE_DEFAULT_DELAY", "0.1"))
+HEDGE_MIN_DELAY = float(os.getenv("GRPC_HEDGE_MIN_DELAY", "0.01"))
+HEDGE_WINDOW = int(os.getenv("GRPC_HEDGE_WINDOW", "200"))
+HEDGE_MIN_SAMPLES = int(os.getenv("GRPC_HEDGE_MIN_SAMPLES", "20"))
+
+NON_FATAL_CODES = (grpc.StatusCode.UNAVAILABLE,)
+
+
+class LatencyTracker:
+    def __init__(self, window=HEDGE_WINDOW, min_samples=HEDGE_MIN_SAMPLES):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+
+    def percentile(self, q):
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+    def hedge_delay(self):
+        delay = self.percentile(HEDGE_PERCENTILE)
+        if delay is None:
+            return HEDGE_DEFAULT_DELAY
+        return max(delay, HEDGE_MIN_DELAY)
+
+
+def is_fatal(error):
+    return not (isinstance(error, grpc.RpcError) and error.code() in NON_FATAL_CODES)
+
+
+async def hedged_call(method, request, tracker, timeout=None, limiter=None, **kwargs):
+    started = time.monotonic()
+    attempt_started = {}
+
+    def attempt():
+        attempt_timeout = None
+        if timeout is not None:
+            attempt_timeout = max(timeout - (time.monotonic() - started), 0)
+        task = asyncio.ensure_future(method(request, timeout=attempt_timeout, **kwargs))
+        attempt_started[task] = time.monotonic()
+        return task
+
+    attempts = {attempt()}
+    hedged = False
+    error = None
+    try:
+        done, _ = await asyncio.wait(attempts, timeout=tracker.hedge_delay())
+        if not done and (limiter is None or limiter.try_acquire()):
+            hedge = attempt()
+            if limiter is not None:
+                hedge.add_done_callback(lambda _: limiter.release())
+            attempts.add(hedge)
+            hedged = True
+
+        while attempts:
+            done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    tracker.record(time.monotonic() - attempt_started[task])
+                    return task.result(), hedged
+                if is_fatal(error):
+                    raise error
+        raise error
+    finally:
+        for task in attempts:
+            task.cancel()
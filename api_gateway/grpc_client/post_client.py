@@ -1,37 +1,30 @@
 import os
-import grpc
-import logging
-import time
 from proto import post_pb2, post_pb2_grpc
+from grpc_client.base_client import BaseClient
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
 
-class PostClient:
+class PostClient(BaseClient):
+    stub_class = post_pb2_grpc.PostServiceStub
+    service_name = post_pb2.DESCRIPTOR.services_by_name["PostService"].full_name
+    idempotent_methods = ("GetPost", "ListPosts", "BatchGetPosts", "SearchPosts", "GetTagCounts", "GetComments")
+    non_idempotent_methods = (
+        "CreatePost",
+        "UpdatePost",
+        "DeletePost",
+        "ViewPost",
+        "RecordViews",
+        "LikePost",
+        "AddComment",
+    )
+
     def __init__(self):
-        self.server_address = os.getenv("POST_SERVICE_ADDRESS", "post-service:50052")
-        self.channel = None
-        self.stub = None
-        self.connect_with_retry()
-    
-    def connect_with_retry(self,max_retries=5, retry_delay=2):
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"Connecting {self.server_address} {attempt+1}")
-                self.channel = grpc.insecure_channel(self.server_address)
-                self.stub = post_pb2_grpc.PostServiceStub(self.channel)
-                grpc.channel_ready_future(self.channel).result(timeout=5)
-                logger.info(f"Connected {self.server_address}")
-                return
-            except grpc.FutureTimeoutError:
-                logger.warning(f"Timeout {attempt+1}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                else:
-                    logger.error("Connection failed")
-                    raise Exception("Connection error")
-
-    def create_post(self, title, description, creator_id, is_private, tags):
+        super().__init__(
+            os.getenv("POST_SERVICE_ADDRESS", "post-service:50052"),
+            int(os.getenv("POST_SERVICE_MAX_IN_FLIGHT", "32")),
+            int(os.getenv("POST_SERVICE_CHANNELS", "4")),
+        )
+
+    async def create_post(self, title, description, creator_id, is_private, tags):
         request = post_pb2.CreatePostRequest(
             title=title,
             description=description,
@@ -39,9 +32,9 @@ class PostClient:
             is_private=is_private,
             tags=tags,
         )
-        return self.stub.CreatePost(request)
+        return await self.call("CreatePost", request)
 
-    def update_post(self, post_id, title, description, creator_id, is_private, tags):
+    async def update_post(self, post_id, title, description, creator_id, is_private, tags):
         request = post_pb2.UpdatePostRequest(
             id=post_id,
             title=title,
@@ -50,46 +43,85 @@ class PostClient:
             is_private=is_private,
             tags=tags,
         )
-        return self.stub.UpdatePost(request)
+        return await self.call("UpdatePost", request)
 
-    def delete_post(self, post_id, creator_id):
+    async def delete_post(self, post_id, creator_id):
         request = post_pb2.DeletePostRequest(id=post_id, creator_id=creator_id)
-        return self.stub.DeletePost(request)
+        return await self.call("DeletePost", request)
 
-    def get_post(self, post_id, user_id):
+    async def get_post(self, post_id, user_id):
         request = post_pb2.GetPostRequest(id=post_id, user_id=user_id)
-        return self.stub.GetPost(request)
+        return await self.call("GetPost", request)
+
+    async def list_posts(
+        self, page, page_size, user_id, page_token="", include_total=False, tags_any=(), tags_all=()
+    ):
+        request = post_pb2.ListPostsRequest(
+            page=page,
+            page_size=page_size,
+            user_id=user_id,
+            page_token=page_token,
+            include_total=include_total,
+            tags_any=tags_any,
+            tags_all=tags_all,
+        )
+        return await self.call("ListPosts", request)
+
+    async def search_posts(self, query, page_size, user_id, page_token=""):
+        request = post_pb2.SearchPostsRequest(
+            query=query,
+            page_size=page_size,
+            user_id=user_id,
+            page_token=page_token,
+        )
+        return await self.call("SearchPosts", request)
+
+    async def get_tag_counts(self, limit):
+        request = post_pb2.GetTagCountsRequest(limit=limit)
+        return await self.call("GetTagCounts", request)
 
-    def list_posts(self, page, page_size, user_id):
-        request = post_pb2.ListPostsRequest(page=page, page_size=page_size, user_id=user_id)
-        return self.stub.ListPosts(request)
+    async def batch_get_posts(self, post_ids, user_id):
+        request = post_pb2.BatchGetPostsRequest(ids=post_ids, user_id=user_id)
+        return await self.call("BatchGetPosts", request)
 
-    def view_post(self, post_id, user_id):
+    async def view_post(self, post_id, user_id):
         request = post_pb2.ViewPostRequest(
             post_id=post_id,
             user_id=user_id
         )
-        return self.stub.ViewPost(request)
-    
-    def like_post(self, post_id, user_id):
+        return await self.call("ViewPost", request)
+
+    async def record_views(self, views, user_id):
+        request = post_pb2.RecordViewsRequest(
+            user_id=user_id,
+            views=[
+                post_pb2.ViewEvent(post_id=post_id, viewed_at=viewed_at)
+                for post_id, viewed_at in views
+            ],
+        )
+        return await self.call("RecordViews", request)
+
+    async def like_post(self, post_id, user_id):
         request = post_pb2.LikePostRequest(
             post_id=post_id,
             user_id=user_id
         )
-        return self.stub.LikePost(request)
-    
-    def add_comment(self, post_id, user_id, text):
+        return await self.call("LikePost", request)
+
+    async def add_comment(self, post_id, user_id, text):
         request = post_pb2.AddCommentRequest(
             post_id=post_id,
             user_id=user_id,
             text=text
         )
-        return self.stub.AddComment(request)
-    
-    def get_comments(self, post_id, page=1, page_size=10):
+        return await self.call("AddComment", request)
+
+    async def get_comments(self, post_id, user_id="", page=1, page_size=10, page_token=""):
         request = post_pb2.GetCommentsRequest(
             post_id=post_id,
+            user_id=user_id,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            page_token=page_token,
         )
-        return self.stub.GetComments(request)
\ No newline at end of file
+        return await self.call("GetComments", request)
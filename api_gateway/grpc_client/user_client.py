@@ -1,63 +1,51 @@
 import os
 import grpc
 import logging
-import time
 from proto import user_pb2, user_pb2_grpc
+from grpc_client.base_client import BaseClient
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+RECONNECT_TIMEOUT = 5
 
-class UserClient:
-    def __init__(self):
-        self.server_address = os.getenv("USER_SERVICE_ADDRESS", "user-service:50051")
-        self.channel = None
-        self.stub = None
-        self.connect_with_retry()
 
-    def connect_with_retry(self, max_retries=5, retry_delay=2):
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"Connecting {self.server_address} {attempt+1}")
-                self.channel = grpc.insecure_channel(self.server_address)
-                self.stub = user_pb2_grpc.UserServiceStub(self.channel)
-                grpc.channel_ready_future(self.channel).result(timeout=5)
-                logger.info(f"Connected {self.server_address}")
-                return
-            except grpc.FutureTimeoutError:
-                logger.warning(f"Timeout {attempt+1}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                else:
-                    logger.error("Connection failed")
-                    raise Exception("Connection error")
+class UserClient(BaseClient):
+    stub_class = user_pb2_grpc.UserServiceStub
+    service_name = user_pb2.DESCRIPTOR.services_by_name["UserService"].full_name
+    non_idempotent_methods = ("Register", "Login")
+
+    def __init__(self):
+        super().__init__(
+            os.getenv("USER_SERVICE_ADDRESS", "user-service:50051"),
+            int(os.getenv("USER_SERVICE_MAX_IN_FLIGHT", "32")),
+            int(os.getenv("USER_SERVICE_CHANNELS", "2")),
+        )
 
-    def register(self, username, email, password):
+    async def register(self, username, email, password):
         try:
             request = user_pb2.RegisterRequest(username=username, email=email, password=password)
             logger.info(f"Register {email}")
-            return self.stub.Register(request)
+            return await self.call("Register", request)
         except grpc.RpcError as e:
             logger.error(f"Register error {e}")
             if e.code() == grpc.StatusCode.UNAVAILABLE:
                 logger.info("Reconnect")
-                self.connect_with_retry()
-                request = user_pb2.RegisterRequest(
-                    username=username, email=email, password=password
+                return await self.call(
+                    "Register", request, wait_for_ready=True, timeout=RECONNECT_TIMEOUT
                 )
-                return self.stub.Register(request)
             raise
 
-    def login(self, email, password):
+    async def login(self, email, password):
         try:
             request = user_pb2.LoginRequest(email=email, password=password)
             logger.info(f"Login {email}")
-            return self.stub.Login(request)
+            return await self.call("Login", request)
         except grpc.RpcError as e:
             logger.error(f"Login error {e}")
             if e.code() == grpc.StatusCode.UNAVAILABLE:
                 logger.info("Reconnect")
-                self.connect_with_retry()
-                request = user_pb2.LoginRequest(email=email, password=password)
-                return self.stub.Login(request)
+                return await self.call(
+                    "Login", request, wait_for_ready=True, timeout=RECONNECT_TIMEOUT
+                )
             raise
@@ -0,0 +1,43 @@
+import logging
+from contextlib import contextmanager
+
+from metrics.registry import BACKEND_SHED
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BackendOverloaded(Exception):
+    def __init__(self, server_address, retry_after=1):
+        super().__init__(f"Backend {server_address} is overloaded")
+        self.server_address = server_address
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    def __init__(self, server_address, max_in_flight):
+        self.server_address = server_address
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.shed = 0
+
+    def try_acquire(self):
+        if self.in_flight >= self.max_in_flight:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+
+    @contextmanager
+    def slot(self):
+        if not self.try_acquire():
+            self.shed += 1
+            BACKEND_SHED.labels(self.server_address).inc()
+            logger.warning(f"Shedding request to {self.server_address}, {self.in_flight} in flight")
+            raise BackendOverloaded(self.server_address)
+        try:
+            yield
+        finally:
+            self.release()
@@ -0,0 +1,80 @@
+import math
+import os
+import time
+from collections import OrderedDict
+
+from fastapi import Depends, HTTPException, status
+
+from auth.jwt_auth import get_current_user
+from metrics.registry import RATE_LIMITED
+
+RATE_LIMITS = {
+    "reads": (
+        float(os.getenv("RATE_LIMIT_READS_RATE", "50")),
+        float(os.getenv("RATE_LIMIT_READS_BURST", "100")),
+    ),
+    "writes": (
+        float(os.getenv("RATE_LIMIT_WRITES_RATE", "5")),
+        float(os.getenv("RATE_LIMIT_WRITES_BURST", "20")),
+    ),
+    "engagement": (
+        float(os.getenv("RATE_LIMIT_ENGAGEMENT_RATE", "10")),
+        float(os.getenv("RATE_LIMIT_ENGAGEMENT_BURST", "30")),
+    ),
+}
+
+
+class RateLimiter:
+    def __init__(self, rate, burst, max_size=100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_size = max_size
+        self.buckets = OrderedDict()
+        self.allowed = 0
+        self.rejected = 0
+
+    def acquire(self, key):
+        now = time.monotonic()
+        tokens, updated_at = self.buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+        if tokens >= 1:
+            self.buckets[key] = (tokens - 1, now)
+            self.buckets.move_to_end(key)
+            while len(self.buckets) > self.max_size:
+                self.buckets.popitem(last=False)
+            self.allowed += 1
+            return 0
+
+        self.buckets[key] = (tokens, now)
+        self.rejected += 1
+        return (1 - tokens) / self.rate
+
+    def clear(self):
+        self.buckets.clear()
+
+
+rate_limiters = {
+    route_class: RateLimiter(rate=rate, burst=burst)
+    for route_class, (rate, burst) in RATE_LIMITS.items()
+}
+
+
+def rate_limited(route_class):
+    async def check_rate_limit(current_user: dict = Depends(get_current_user)):
+        retry_after = rate_limiters[route_class].acquire(current_user["user_id"])
+        if retry_after:
+            RATE_LIMITED.labels(route_class).inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded for {route_class}",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+        return current_user
+
+    return check_rate_limit
+
+
+limit_reads = rate_limited("reads")
+limit_writes = rate_limited("writes")
+limit_engagement = rate_limited("engagement")
@@ -1,22 +1,112 @@
+import asyncio
+import os
+import shutil
 import uvicorn
-from fastapi import FastAPI
-from routes.user_routes import router as user_router
-from routes.post_routes import router as post_router
-from routes.stats_routes import router as stats_router
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
+from deadlines.budget import DeadlineExceeded
+from deadlines.disconnect import CancelOnDisconnectMiddleware
+from limits.concurrency_limiter import BackendOverloaded
+from metrics.middleware import MetricsMiddleware
+from metrics.registry import metrics_response
+from routes.user_routes import router as user_router, user_client
+from routes.post_routes import router as post_router, post_client
+from routes.stats_routes import router as stats_router, stats_client
+from routes.page_routes import router as page_router
+
+GATEWAY_ENV = os.getenv("GATEWAY_ENV", "development")
+GATEWAY_HOST = os.getenv("GATEWAY_HOST", "0.0.0.0")
+GATEWAY_PORT = int(os.getenv("GATEWAY_PORT", "3000"))
+GATEWAY_WORKERS = int(os.getenv("GATEWAY_WORKERS", str(os.cpu_count() or 1)))
+GATEWAY_BACKLOG = int(os.getenv("GATEWAY_BACKLOG", "2048"))
+GATEWAY_KEEP_ALIVE = int(os.getenv("GATEWAY_KEEP_ALIVE", "75"))
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
 
 app = FastAPI(
     title="System API Gateway", description="API Gateway for auth system", version="1.0.0"
 )
+app.add_middleware(CancelOnDisconnectMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(user_router, prefix="/auth", tags=["users"])
 app.include_router(post_router, prefix="/posts", tags=["posts"])
+app.include_router(page_router, prefix="/posts", tags=["posts"])
 app.include_router(stats_router, prefix="/stats", tags=["stats"])
 
 
+backend_clients = {
+    "user-service": user_client,
+    "post-service": post_client,
+    "stats-service": stats_client,
+}
+
+
+@app.exception_handler(BackendOverloaded)
+async def backend_overloaded_handler(request: Request, exc: BackendOverloaded):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": str(exc)},
+    )
+
+
+@app.on_event("startup")
+async def connect_clients():
+    for client in backend_clients.values():
+        client.connect()
+    app.state.readiness_task = asyncio.ensure_future(
+        asyncio.gather(*(client.wait_until_ready() for client in backend_clients.values()))
+    )
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    app.state.readiness_task.cancel()
+    for client in backend_clients.values():
+        await client.close()
+
+
 @app.get("/", tags=["root"])
 async def read_root():
     return {"message": "API Gateway"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    return metrics_response()
+
+
+@app.get("/ready", tags=["root"])
+async def read_ready(response: Response):
+    backends = {name: client.is_ready() for name, client in backend_clients.items()}
+    ready = all(backends.values())
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"ready": ready, "backends": backends}
+
+
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=3000, reload=True)
+    if GATEWAY_ENV == "production":
+        if PROMETHEUS_MULTIPROC_DIR:
+            shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+            os.makedirs(PROMETHEUS_MULTIPROC_DIR)
+        uvicorn.run(
+            "main:app",
+            host=GATEWAY_HOST,
+            port=GATEWAY_PORT,
+            workers=GATEWAY_WORKERS,
+            loop="uvloop",
+            http="httptools",
+            backlog=GATEWAY_BACKLOG,
+            timeout_keep_alive=GATEWAY_KEEP_ALIVE,
+        )
+    else:
+        uvicorn.run("main:app", host=GATEWAY_HOST, port=GATEWAY_PORT, reload=True)
@@ -0,0 +1,49 @@
+import time
+
+from starlette.routing import Match
+
+from metrics.registry import HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS
+
+UNMATCHED_ROUTE = "unmatched"
+CLIENT_CLOSED_REQUEST = 499
+
+
+def route_path(scope):
+    for route in scope["app"].routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_path(scope)
+        status_code = CLIENT_CLOSED_REQUEST
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            in_flight.dec()
+            HTTP_REQUESTS.labels(method, route, status_code).inc()
+            HTTP_LATENCY.labels(method, route, status_code).observe(time.perf_counter() - started)
@@ -0,0 +1,96 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.responses import Response
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+HTTP_REQUESTS = Counter(
+    "gateway_http_requests_total",
+    "HTTP requests handled by the gateway",
+    ["method", "route", "status"],
+)
+HTTP_IN_FLIGHT = Gauge(
+    "gateway_http_requests_in_flight",
+    "HTTP requests currently being handled",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+HTTP_LATENCY = Histogram(
+    "gateway_http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+GRPC_CLIENT_LATENCY = Histogram(
+    "gateway_grpc_client_duration_seconds",
+    "Latency of gRPC calls to backend services",
+    ["service", "method", "code"],
+    buckets=LATENCY_BUCKETS,
+)
+GRPC_CLIENT_HEDGES = Counter(
+    "gateway_grpc_client_hedged_total",
+    "gRPC calls that needed a hedged attempt",
+    ["service", "method"],
+)
+GRPC_CHANNEL_IN_FLIGHT = Gauge(
+    "gateway_grpc_channel_streams_in_flight",
+    "Active gRPC streams per pooled channel",
+    ["service", "channel"],
+    multiprocess_mode="livesum",
+)
+GRPC_CHANNEL_CALLS = Counter(
+    "gateway_grpc_channel_calls_total",
+    "gRPC calls started per pooled channel",
+    ["service", "channel"],
+)
+BACKEND_SHED = Counter(
+    "gateway_backend_shed_total",
+    "Backend calls rejected by the concurrency limiter",
+    ["backend"],
+)
+CIRCUIT_BREAKER_STATE = Gauge(
+    "gateway_circuit_breaker_state",
+    "Circuit breaker state per backend (0 closed, 1 half-open, 2 open)",
+    ["backend"],
+    multiprocess_mode="livemax",
+)
+CIRCUIT_BREAKER_REJECTED = Counter(
+    "gateway_circuit_breaker_rejected_total",
+    "Backend calls failed fast by an open circuit breaker",
+    ["backend"],
+)
+RATE_LIMITED = Counter(
+    "gateway_rate_limited_total",
+    "Requests rejected by the per-user rate limiter",
+    ["route_class"],
+)
+
+CACHE_REQUESTS = Counter(
+    "gateway_cache_requests_total",
+    "Gateway cache lookups by result",
+    ["cache", "result"],
+)
+SINGLEFLIGHT_CALLS = Counter(
+    "gateway_singleflight_calls_total",
+    "Single-flight calls that executed or joined an in-flight call",
+    ["flight", "result"],
+)
+
+
+def metrics_response():
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\npost.proto\x12\x04post\"\x94\x01\n\x04Post\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x12\n\ncreator_id\x18\x04 \x01(\t\x12\x12\n\ncreated_at\x18\x05 \x01(\t\x12\x12\n\nupdated_at\x18\x06 \x01(\t\x12\x12\n\nis_private\x18\x07 \x01(\x08\x12\x0c\n\x04tags\x18\x08 \x03(\t\"m\n\x11\x43reatePostRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\x12\x12\n\ncreator_id\x18\x03 \x01(\t\x12\x12\n\nis_private\x18\x04 \x01(\x08\x12\x0c\n\x04tags\x18\x05 \x03(\t\"y\n\x11UpdatePostRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x12\n\ncreator_id\x18\x04 \x01(\t\x12\x12\n\nis_private\x18\x05 \x01(\x08\x12\x0c\n\x04tags\x18\x06 \x03(\t\"3\n\x11\x44\x65letePostRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x12\n\ncreator_id\x18\x02 \x01(\t\"!\n\x0e\x44\x65leteResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"-\n\x0eGetPostRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\t\"D\n\x10ListPostsRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\x11\n\tpage_size\x18\x02 \x01(\x05\x12\x0f\n\x07user_id\x18\x03 \x01(\t\"^\n\x11ListPostsResponse\x12\x19\n\x05posts\x18\x01 \x03(\x0b\x32\n.post.Post\x12\r\n\x05total\x18\x02 \x01(\x05\x12\x0c\n\x04page\x18\x03 \x01(\x05\x12\x11\n\tpage_size\x18\x04 \x01(\x05\"3\n\x0fViewPostRequest\x12\x0f\n\x07post_id\x18\x01 \x01(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\t\"\x12\n\x10ViewPostResponse\"3\n\x0fLikePostRequest\x12\x0f\n\x07post_id\x18\x01 \x01(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\t\"\x12\n\x10LikePostResponse\"Y\n\x07\x43omment\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07post_id\x18\x02 \x01(\t\x12\x0f\n\x07user_id\x18\x03 \x01(\t\x12\x0c\n\x04text\x18\x04 \x01(\t\x12\x12\n\ncreated_at\x18\x05 \x01(\t\"C\n\x11\x41\x64\x64\x43ommentRequest\x12\x0f\n\x07post_id\x18\x01 \x01(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x0c\n\x04text\x18\x03 \x01(\t\"F\n\x12GetCommentsRequest\x12\x0f\n\x07post_id\x18\x01 \x01(\t\x12\x0c\n\x04page\x18\x02 \x01(\x05\x12\x11\n\tpage_size\x18\x03 \x01(\x05\"f\n\x13GetCommentsResponse\x12\x1f\n\x08\x63omments\x18\x01 \x03(\x0b\x32\r.post.Comment\x12\r\n\x05total\x18\x02 \x01(\x05\x12\x0c\n\x04page\x18\x03 \x01(\x05\x12\x11\n\tpage_size\x18\x04 \x01(\x05\x32\x9d\x04\n\x0bPostService\x12\x33\n\nCreatePost\x12\x17.post.CreatePostRequest\x1a\n.post.Post\"\x00\x12\x33\n\nUpdatePost\x12\x17.post.UpdatePostRequest\x1a\n.post.Post\"\x00\x12=\n\nDeletePost\x12\x17.post.DeletePostRequest\x1a\x14.post.DeleteResponse\"\x00\x12-\n\x07GetPost\x12\x14.post.GetPostRequest\x1a\n.post.Post\"\x00\x12>\n\tListPosts\x12\x16.post.ListPostsRequest\x1a\x17.post.ListPostsResponse\"\x00\x12;\n\x08ViewPost\x12\x15.post.ViewPostRequest\x1a\x16.post.ViewPostResponse\"\x00\x12;\n\x08LikePost\x12\x15.post.LikePostRequest\x1a\x16.post.LikePostResponse\"\x00\x12\x36\n\nAddComment\x12\x17.post.AddCommentRequest\x1a\r.post.Comment\"\x00\x12\x44\n\x0bGetComments\x12\x18.post.GetCommentsRequest\x1a\x19.post.GetCommentsResponse\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\npost.proto\x12\x04post\"\x94\x01\n\x04Post\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x12\n\ncreator_id\x18\x04 \x01(\t\x12\x12\n\ncreated_at\x18\x05 \x01(\t\x12\x12\n\nupdated_at\x18\x06 \x01(\t\x12\x12\n\nis_private\x18\x07 \x01(\x08\x12\x0c\n\x04tags\x18\x08 \x03(\t\"m\n\x11\x43reatePostRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\x12\x12\n\ncreator_id\x18\x03 \x01(\t\x12\x12\n\nis_private\x18\x04 \x01(\x08\x12\x0c\n\x04tags\x18\x05 \x03(\t\"y\n\x11UpdatePostRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x12\n\ncreator_id\x18\x04 \x01(\t\x12\x12\n\nis_private\x18\x05 \x01(\x08\x12\x0c\n\x04tags\x18\x06 \x03(\t\"3\n\x11\x44\x65letePostRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x12\n\ncreator_id\x18\x02 \x01(\t\"!\n\x0e\x44\x65leteResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"-\n\x0eGetPostRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\t\"\x93\x01\n\x10ListPostsRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\x11\n\tpage_size\x18\x02 \x01(\x05\x12\x0f\n\x07user_id\x18\x03 \x01(\t\x12\x12\n\npage_token\x18\x04 \x01(\t\x12\x15\n\rinclude_total\x18\x05 \x01(\x08\x12\x10\n\x08tags_any\x18\x06 \x03(\t\x12\x10\n\x08tags_all\x18\x07 \x03(\t\"\x86\x01\n\x11ListPostsResponse\x12\x19\n\x05posts\x18\x01 \x03(\x0b\x32\n.post.Post\x12\x12\n\x05total\x18\x02 \x01(\x05H\x00\x88\x01\x01\x12\x0c\n\x04page\x18\x03 \x01(\x05\x12\x11\n\tpage_size\x18\x04 \x01(\x05\x12\x17\n\x0fnext_page_token\x18\x05 \x01(\tB\x08\n\x06_total\"4\n\x14\x42\x61tchGetPostsRequest\x12\x0b\n\x03ids\x18\x01 \x03(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\t\"2\n\x15\x42\x61tchGetPostsResponse\x12\x19\n\x05posts\x18\x01 \x03(\x0b\x32\n.post.Post\"3\n\x0fViewPostRequest\x12\x0f\n\x07post_id\x18\x01 \x01(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\t\"\x12\n\x10ViewPostResponse\"/\n\tViewEvent\x12\x0f\n\x07post_id\x18\x01 \x01(\t\x12\x11\n\tviewed_at\x18\x02 \x01(\t\"E\n\x12RecordViewsRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x1e\n\x05views\x18\x02 \x03(\x0b\x32\x0f.post.ViewEvent\"B\n\x13RecordViewsResponse\x12\x10\n\x08recorded\x18\x01 \x01(\x05\x12\x19\n\x11rejected_post_ids\x18\x02 \x03(\t\"3\n\x0fLikePostRequest\x12\x0f\n\x07post_id\x18\x01 \x01(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\t\"\x12\n\x10LikePostResponse\"Y\n\x07\x43omment\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07post_id\x18\x02 \x01(\t\x12\x0f\n\x07user_id\x18\x03 \x01(\t\x12\x0c\n\x04text\x18\x04 \x01(\t\x12\x12\n\ncreated_at\x18\x05 \x01(\t\"C\n\x11\x41\x64\x64\x43ommentRequest\x12\x0f\n\x07post_id\x18\x01 \x01(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x0c\n\x04text\x18\x03 \x01(\t\"k\n\x12GetCommentsRequest\x12\x0f\n\x07post_id\x18\x01 \x01(\t\x12\x0c\n\x04page\x18\x02 \x01(\x05\x12\x11\n\tpage_size\x18\x03 \x01(\x05\x12\x0f\n\x07user_id\x18\x04 \x01(\t\x12\x12\n\npage_token\x18\x05 \x01(\t\"\x7f\n\x13GetCommentsResponse\x12\x1f\n\x08\x63omments\x18\x01 \x03(\x0b\x32\r.post.Comment\x12\r\n\x05total\x18\x02 \x01(\x05\x12\x0c\n\x04page\x18\x03 \x01(\x05\x12\x11\n\tpage_size\x18\x04 \x01(\x05\x12\x17\n\x0fnext_page_token\x18\x05 \x01(\t\"[\n\x12SearchPostsRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12\x11\n\tpage_size\x18\x02 \x01(\x05\x12\x0f\n\x07user_id\x18\x03 \x01(\t\x12\x12\n\npage_token\x18\x04 \x01(\t\"\\\n\x13SearchPostsResponse\x12\x19\n\x05posts\x18\x01 \x03(\x0b\x32\n.post.Post\x12\x11\n\tpage_size\x18\x02 \x01(\x05\x12\x17\n\x0fnext_page_token\x18\x03 \x01(\t\"$\n\x13GetTagCountsRequest\x12\r\n\x05limit\x18\x01 \x01(\x05\"+\n\x08TagCount\x12\x0b\n\x03tag\x18\x01 \x01(\t\x12\x12\n\npost_count\x18\x02 \x01(\x05\"4\n\x14GetTagCountsResponse\x12\x1c\n\x04tags\x18\x01 \x03(\x0b\x32\x0e.post.TagCount2\xbe\x06\n\x0bPostService\x12\x33\n\nCreatePost\x12\x17.post.CreatePostRequest\x1a\n.post.Post\"\x00\x12\x33\n\nUpdatePost\x12\x17.post.UpdatePostRequest\x1a\n.post.Post\"\x00\x12=\n\nDeletePost\x12\x17.post.DeletePostRequest\x1a\x14.post.DeleteResponse\"\x00\x12-\n\x07GetPost\x12\x14.post.GetPostRequest\x1a\n.post.Post\"\x00\x12>\n\tListPosts\x12\x16.post.ListPostsRequest\x1a\x17.post.ListPostsResponse\"\x00\x12J\n\rBatchGetPosts\x12\x1a.post.BatchGetPostsRequest\x1a\x1b.post.BatchGetPostsResponse\"\x00\x12\x44\n\x0bSearchPosts\x12\x18.post.SearchPostsRequest\x1a\x19.post.SearchPostsResponse\"\x00\x12G\n\x0cGetTagCounts\x12\x19.post.GetTagCountsRequest\x1a\x1a.post.GetTagCountsResponse\"\x00\x12;\n\x08ViewPost\x12\x15.post.ViewPostRequest\x1a\x16.post.ViewPostResponse\"\x00\x12\x44\n\x0bRecordViews\x12\x18.post.RecordViewsRequest\x1a\x19.post.RecordViewsResponse\"\x00\x12;\n\x08LikePost\x12\x15.post.LikePostRequest\x1a\x16.post.LikePostResponse\"\x00\x12\x36\n\nAddComment\x12\x17.post.AddCommentRequest\x1a\r.post.Comment\"\x00\x12\x44\n\x0bGetComments\x12\x18.post.GetCommentsRequest\x1a\x19.post.GetCommentsResponse\"\x00\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -43,26 +43,46 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_DELETERESPONSE']._serialized_end=491
   _globals['_GETPOSTREQUEST']._serialized_start=493
   _globals['_GETPOSTREQUEST']._serialized_end=538
-  _globals['_LISTPOSTSREQUEST']._serialized_start=540
-  _globals['_LISTPOSTSREQUEST']._serialized_end=608
-  _globals['_LISTPOSTSRESPONSE']._serialized_start=610
-  _globals['_LISTPOSTSRESPONSE']._serialized_end=704
-  _globals['_VIEWPOSTREQUEST']._serialized_start=706
-  _globals['_VIEWPOSTREQUEST']._serialized_end=757
-  _globals['_VIEWPOSTRESPONSE']._serialized_start=759
-  _globals['_VIEWPOSTRESPONSE']._serialized_end=777
-  _globals['_LIKEPOSTREQUEST']._serialized_start=779
-  _globals['_LIKEPOSTREQUEST']._serialized_end=830
-  _globals['_LIKEPOSTRESPONSE']._serialized_start=832
-  _globals['_LIKEPOSTRESPONSE']._serialized_end=850
-  _globals['_COMMENT']._serialized_start=852
-  _globals['_COMMENT']._serialized_end=941
-  _globals['_ADDCOMMENTREQUEST']._serialized_start=943
-  _globals['_ADDCOMMENTREQUEST']._serialized_end=1010
-  _globals['_GETCOMMENTSREQUEST']._serialized_start=1012
-  _globals['_GETCOMMENTSREQUEST']._serialized_end=1082
-  _globals['_GETCOMMENTSRESPONSE']._serialized_start=1084
-  _globals['_GETCOMMENTSRESPONSE']._serialized_end=1186
-  _globals['_POSTSERVICE']._serialized_start=1189
-  _globals['_POSTSERVICE']._serialized_end=1730
+  _globals['_LISTPOSTSREQUEST']._serialized_start=541
+  _globals['_LISTPOSTSREQUEST']._serialized_end=688
+  _globals['_LISTPOSTSRESPONSE']._serialized_start=691
+  _globals['_LISTPOSTSRESPONSE']._serialized_end=825
+  _globals['_BATCHGETPOSTSREQUEST']._serialized_start=827
+  _globals['_BATCHGETPOSTSREQUEST']._serialized_end=879
+  _globals['_BATCHGETPOSTSRESPONSE']._serialized_start=881
+  _globals['_BATCHGETPOSTSRESPONSE']._serialized_end=931
+  _globals['_VIEWPOSTREQUEST']._serialized_start=933
+  _globals['_VIEWPOSTREQUEST']._serialized_end=984
+  _globals['_VIEWPOSTRESPONSE']._serialized_start=986
+  _globals['_VIEWPOSTRESPONSE']._serialized_end=1004
+  _globals['_VIEWEVENT']._serialized_start=1006
+  _globals['_VIEWEVENT']._serialized_end=1053
+  _globals['_RECORDVIEWSREQUEST']._serialized_start=1055
+  _globals['_RECORDVIEWSREQUEST']._serialized_end=1124
+  _globals['_RECORDVIEWSRESPONSE']._serialized_start=1126
+  _globals['_RECORDVIEWSRESPONSE']._serialized_end=1192
+  _globals['_LIKEPOSTREQUEST']._serialized_start=1194
+  _globals['_LIKEPOSTREQUEST']._serialized_end=1245
+  _globals['_LIKEPOSTRESPONSE']._serialized_start=1247
+  _globals['_LIKEPOSTRESPONSE']._serialized_end=1265
+  _globals['_COMMENT']._serialized_start=1267
+  _globals['_COMMENT']._serialized_end=1356
+  _globals['_ADDCOMMENTREQUEST']._serialized_start=1358
+  _globals['_ADDCOMMENTREQUEST']._serialized_end=1425
+  _globals['_GETCOMMENTSREQUEST']._serialized_start=1427
+  _globals['_GETCOMMENTSREQUEST']._serialized_end=1534
+  _globals['_GETCOMMENTSRESPONSE']._serialized_start=1536
+  _globals['_GETCOMMENTSRESPONSE']._serialized_end=1663
+  _globals['_SEARCHPOSTSREQUEST']._serialized_start=1665
+  _globals['_SEARCHPOSTSREQUEST']._serialized_end=1756
+  _globals['_SEARCHPOSTSRESPONSE']._serialized_start=1758
+  _globals['_SEARCHPOSTSRESPONSE']._serialized_end=1850
+  _globals['_GETTAGCOUNTSREQUEST']._serialized_start=1852
+  _globals['_GETTAGCOUNTSREQUEST']._serialized_end=1888
+  _globals['_TAGCOUNT']._serialized_start=1890
+  _globals['_TAGCOUNT']._serialized_end=1933
+  _globals['_GETTAGCOUNTSRESPONSE']._serialized_start=1935
+  _globals['_GETTAGCOUNTSRESPONSE']._serialized_end=1987
+  _globals['_POSTSERVICE']._serialized_start=1990
+  _globals['_POSTSERVICE']._serialized_end=2820
 # @@protoc_insertion_point(module_scope)
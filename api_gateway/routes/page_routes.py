@@ -0,0 +1,99 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+from pydantic import BaseModel
+import asyncio
+import grpc
+import logging
+import os
+
+from auth.jwt_auth import get_current_user
+from deadlines.budget import DeadlineExceeded, reads_budget
+from limits.concurrency_limiter import BackendOverloaded
+from limits.rate_limiter import limit_reads
+from routes.post_routes import Post, GetCommentsResponse, post_client, fetch_post
+from routes.stats_routes import PostStats, stats_client
+from serialization.fast_json import FastJSONResponse, post_to_dict, comments_page_to_dict
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(dependencies=[Depends(reads_budget)])
+
+PAGE_STATS_TIMEOUT = float(os.getenv("PAGE_STATS_TIMEOUT", "0.3"))
+
+
+class PostPage(BaseModel):
+    post: Post
+    comments: GetCommentsResponse
+    stats: Optional[PostStats] = None
+
+
+async def fetch_stats(post_id):
+    try:
+        return await asyncio.wait_for(
+            stats_client.get_post_stats(post_id=post_id), timeout=PAGE_STATS_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"Stats for post {post_id} timed out, returning partial page")
+    except grpc.RpcError as e:
+        logger.warning(f"Stats for post {post_id} failed, returning partial page: {e.details()}")
+    except BackendOverloaded:
+        logger.warning(f"Stats for post {post_id} shed, returning partial page")
+    except DeadlineExceeded:
+        logger.warning(f"Stats for post {post_id} ran out of budget, returning partial page")
+    return None
+
+
+@router.get("/{post_id}/page", response_model=PostPage)
+async def get_post_page(
+    post_id: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    current_user: dict = Depends(limit_reads),
+):
+    post_task = asyncio.ensure_future(fetch_post(post_id, current_user["user_id"]))
+    comments_task = asyncio.ensure_future(
+        post_client.get_comments(
+            post_id=post_id, user_id=current_user["user_id"], page=page, page_size=page_size
+        )
+    )
+    stats_task = asyncio.ensure_future(fetch_stats(post_id))
+
+    tasks = (post_task, comments_task, stats_task)
+    try:
+        try:
+            post, comments = await asyncio.gather(post_task, comments_task)
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.NOT_FOUND:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail=f"Post ID {post_id} not found"
+                )
+            elif e.code() == grpc.StatusCode.PERMISSION_DENIED:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Permission denied",
+                )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Error getting post page: {e.details()}",
+            )
+
+        stats = await stats_task
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return FastJSONResponse(
+        {
+            "post": post_to_dict(post),
+            "comments": comments_page_to_dict(comments),
+            "stats": {
+                "post_id": post_id,
+                "views": stats.views,
+                "likes": stats.likes,
+                "comments": stats.comments,
+            } if stats is not None else None,
+        }
+    )
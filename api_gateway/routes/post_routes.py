@@ -1,20 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 import grpc
-import jwt
 import os
 
+from auth.jwt_auth import get_current_user
+from cache.singleflight import SingleFlight
+from cache.ttl_cache import TTLCache
+from cache.validator_cache import ValidatorCache, make_etag, etag_matches
+from deadlines.budget import reads_budget, writes_budget, engagement_budget
 from grpc_client.post_client import PostClient
+from limits.rate_limiter import limit_reads, limit_writes, limit_engagement
+from serialization.fast_json import (
+    FastJSONResponse,
+    post_to_dict,
+    posts_page_to_dict,
+    search_page_to_dict,
+    comments_page_to_dict,
+)
 
 router = APIRouter()
 post_client = PostClient()
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-JWT_SECRET = os.getenv("JWT_SECRET", "thenromanov-secret-key")
-JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+PUBLIC_VIEWER = ""
+MAX_BATCH_GET_SIZE = 100
+MAX_VIEW_BATCH_SIZE = 500
+MAX_TAG_FILTERS = 10
+MAX_SEARCH_QUERY_LENGTH = 256
+
+get_post_flight = SingleFlight(name="get_post")
+
+VALIDATOR_CACHE_TTL = float(os.getenv("VALIDATOR_CACHE_TTL", "5"))
+CACHE_CONTROL = "private, no-cache"
+
+validator_cache = ValidatorCache(ttl=VALIDATOR_CACHE_TTL, name="etag")
+
+TAG_COUNTS_CACHE_TTL = float(os.getenv("TAG_COUNTS_CACHE_TTL", "30"))
+TAG_COUNTS_CACHE_STALE_TTL = float(os.getenv("TAG_COUNTS_CACHE_STALE_TTL", "300"))
+
+tag_counts_cache = TTLCache(
+    ttl=TAG_COUNTS_CACHE_TTL, stale_ttl=TAG_COUNTS_CACHE_STALE_TTL, name="tag_counts"
+)
 
 
 class PostBase(BaseModel):
@@ -44,9 +71,47 @@ class Post(PostBase):
 
 class PaginatedResponse(BaseModel):
     posts: List[Post]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
+    next_page_token: Optional[str] = None
+
+
+class SearchResponse(BaseModel):
+    posts: List[Post]
+    page_size: int
+    next_page_token: Optional[str] = None
+
+
+class TagCount(BaseModel):
+    tag: str
+    count: int
+
+
+class TagCountsResponse(BaseModel):
+    tags: List[TagCount]
+
+
+class BatchGetRequest(BaseModel):
+    ids: List[str] = Field(..., min_items=1, max_items=MAX_BATCH_GET_SIZE)
+
+
+class BatchGetResponse(BaseModel):
+    posts: List[Post]
+
+
+class ViewEvent(BaseModel):
+    post_id: str
+    viewed_at: Optional[datetime] = None
+
+
+class ViewBatchRequest(BaseModel):
+    views: List[ViewEvent] = Field(..., min_items=1, max_items=MAX_VIEW_BATCH_SIZE)
+
+
+class ViewBatchResponse(BaseModel):
+    recorded: int
+    rejected_post_ids: List[str]
 
 
 class CommentCreate(BaseModel):
@@ -66,31 +131,57 @@ class GetCommentsResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_page_token: Optional[str] = None
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+async def fetch_post(post_id, user_id):
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("id")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return {"user_id": user_id}
-    except jwt.PyJWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
+        return await get_post_flight.do(
+            (post_id, PUBLIC_VIEWER),
+            lambda: post_client.get_post(post_id=post_id, user_id=PUBLIC_VIEWER),
         )
+    except grpc.RpcError as e:
+        if e.code() != grpc.StatusCode.PERMISSION_DENIED:
+            raise
+
+    return await get_post_flight.do(
+        (post_id, user_id),
+        lambda: post_client.get_post(post_id=post_id, user_id=user_id),
+    )
+
 
+def not_modified(etag):
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
 
-@router.post("/", response_model=Post, status_code=status.HTTP_201_CREATED)
-async def create_post(post: PostCreate, current_user: dict = Depends(get_current_user)):
+
+def handle_grpc_error(e, action, post_id):
+    if e.code() == grpc.StatusCode.NOT_FOUND:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Post ID {post_id} not found"
+        )
+    elif e.code() == grpc.StatusCode.PERMISSION_DENIED:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Error {action}: {e.details()}",
+    )
+
+
+@router.post(
+    "/",
+    response_model=Post,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(writes_budget)],
+)
+async def create_post(post: PostCreate, current_user: dict = Depends(limit_writes)):
     try:
-        response = post_client.create_post(
+        response = await post_client.create_post(
             title=post.title,
             description=post.description,
             creator_id=current_user["user_id"],
@@ -119,12 +210,12 @@ async def create_post(post: PostCreate, current_user: dict = Depends(get_current
         )
 
 
-@router.put("/{post_id}", response_model=Post)
+@router.put("/{post_id}", response_model=Post, dependencies=[Depends(writes_budget)])
 async def update_post(
-    post_id: str, post: PostUpdate, current_user: dict = Depends(get_current_user)
+    post_id: str, post: PostUpdate, current_user: dict = Depends(limit_writes)
 ):
     try:
-        response = post_client.update_post(
+        response = await post_client.update_post(
             post_id=post_id,
             title=post.title,
             description=post.description,
@@ -132,6 +223,7 @@ async def update_post(
             is_private=post.is_private,
             tags=post.tags,
         )
+        validator_cache.invalidate(post_id)
         return {
             "id": response.id,
             "title": response.title,
@@ -158,14 +250,19 @@ async def update_post(
         )
 
 
-@router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_post(post_id: str, current_user: dict = Depends(get_current_user)):
+@router.delete(
+    "/{post_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(writes_budget)],
+)
+async def delete_post(post_id: str, current_user: dict = Depends(limit_writes)):
     try:
-        response = post_client.delete_post(post_id=post_id, creator_id=current_user["user_id"])
+        response = await post_client.delete_post(post_id=post_id, creator_id=current_user["user_id"])
         if not response.success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail=f"Post ID {post_id} not found"
             )
+        validator_cache.invalidate(post_id)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     except grpc.RpcError as e:
         if e.code() == grpc.StatusCode.NOT_FOUND:
@@ -183,68 +280,103 @@ async def delete_post(post_id: str, current_user: dict = Depends(get_current_use
         )
 
 
-@router.get("/{post_id}", response_model=Post)
-async def get_post(post_id: str, current_user: dict = Depends(get_current_user)):
+@router.get("/search", response_model=SearchResponse, dependencies=[Depends(reads_budget)])
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=MAX_SEARCH_QUERY_LENGTH),
+    page_size: int = Query(10, ge=1, le=100),
+    page_token: Optional[str] = Query(None),
+    current_user: dict = Depends(limit_reads),
+):
     try:
-        response = post_client.get_post(post_id=post_id, user_id=current_user["user_id"])
-        return {
-            "id": response.id,
-            "title": response.title,
-            "description": response.description,
-            "creator_id": response.creator_id,
-            "created_at": datetime.fromisoformat(response.created_at),
-            "updated_at": datetime.fromisoformat(response.updated_at),
-            "is_private": response.is_private,
-            "tags": list(response.tags),
-        }
+        response = await post_client.search_posts(
+            query=q,
+            page_size=page_size,
+            user_id=current_user["user_id"],
+            page_token=page_token or "",
+        )
+        return FastJSONResponse(search_page_to_dict(response))
+    except grpc.RpcError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error searching posts: {e.details()}",
+        )
+
+
+@router.get("/tags", response_model=TagCountsResponse, dependencies=[Depends(reads_budget)])
+async def get_tag_counts(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(limit_reads),
+):
+    try:
+        response = await tag_counts_cache.get_or_load(
+            limit, lambda: post_client.get_tag_counts(limit=limit)
+        )
+        return FastJSONResponse(
+            {"tags": [{"tag": tag.tag, "count": tag.post_count} for tag in response.tags]}
+        )
     except grpc.RpcError as e:
-        if e.code() == grpc.StatusCode.NOT_FOUND:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail=f"Post ID {post_id} not found"
-            )
-        elif e.code() == grpc.StatusCode.PERMISSION_DENIED:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Permission denied",
-            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error getting post: {e.details()}",
+            detail=f"Error getting tag counts: {e.details()}",
         )
 
 
-@router.get("/", response_model=PaginatedResponse)
+@router.get("/{post_id}", response_model=Post, dependencies=[Depends(reads_budget)])
+async def get_post(
+    post_id: str,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(limit_reads),
+):
+    viewer = current_user["user_id"]
+    cached_etag = validator_cache.get_any(
+        post_id, [("post", PUBLIC_VIEWER), ("post", viewer)]
+    )
+    if etag_matches(if_none_match, cached_etag):
+        return not_modified(cached_etag)
+
+    try:
+        post = await fetch_post(post_id, viewer)
+    except grpc.RpcError as e:
+        handle_grpc_error(e, "getting post", post_id)
+
+    etag = make_etag(post.id, post.updated_at, post.is_private)
+    validator_cache.set(post_id, etag, ("post", viewer if post.is_private else PUBLIC_VIEWER))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    return FastJSONResponse(
+        post_to_dict(post), headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+
+@router.get("/", response_model=PaginatedResponse, dependencies=[Depends(reads_budget)])
 async def list_posts(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
-    current_user: dict = Depends(get_current_user),
+    page_token: Optional[str] = Query(None),
+    include_total: bool = Query(False),
+    tags_any: List[str] = Query([]),
+    tags_all: List[str] = Query([]),
+    current_user: dict = Depends(limit_reads),
 ):
-    try:
-        response = post_client.list_posts(
-            page=page, page_size=page_size, user_id=current_user["user_id"]
+    if len(tags_any) > MAX_TAG_FILTERS or len(tags_all) > MAX_TAG_FILTERS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {MAX_TAG_FILTERS} tags per filter",
         )
 
-        posts = []
-        for post in response.posts:
-            posts.append(
-                {
-                    "id": post.id,
-                    "title": post.title,
-                    "description": post.description,
-                    "creator_id": post.creator_id,
-                    "created_at": datetime.fromisoformat(post.created_at),
-                    "updated_at": datetime.fromisoformat(post.updated_at),
-                    "is_private": post.is_private,
-                    "tags": list(post.tags),
-                }
-            )
+    try:
+        response = await post_client.list_posts(
+            page=page,
+            page_size=page_size,
+            user_id=current_user["user_id"],
+            page_token=page_token or "",
+            include_total=include_total,
+            tags_any=tags_any,
+            tags_all=tags_all,
+        )
 
-        return {
-            "posts": posts,
-            "total": response.total,
-            "page": response.page,
-            "page_size": response.page_size,
-        }
+        return FastJSONResponse(posts_page_to_dict(response))
     except grpc.RpcError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -252,10 +384,52 @@ async def list_posts(
         )
 
 
-@router.post("/{post_id}/view", status_code=status.HTTP_200_OK)
-async def view_post(post_id: str, current_user: dict = Depends(get_current_user)):
+@router.post("/batch-get", response_model=BatchGetResponse, dependencies=[Depends(reads_budget)])
+async def batch_get_posts(
+    batch: BatchGetRequest, current_user: dict = Depends(limit_reads)
+):
+    try:
+        response = await post_client.batch_get_posts(
+            post_ids=batch.ids, user_id=current_user["user_id"]
+        )
+        return FastJSONResponse({"posts": [post_to_dict(post) for post in response.posts]})
+    except grpc.RpcError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error getting posts: {e.details()}",
+        )
+
+
+@router.post(
+    "/views:batch",
+    response_model=ViewBatchResponse,
+    dependencies=[Depends(engagement_budget)],
+)
+async def record_views(batch: ViewBatchRequest, current_user: dict = Depends(limit_engagement)):
     try:
-        post_client.view_post(post_id=post_id, user_id=current_user["user_id"])
+        response = await post_client.record_views(
+            views=[
+                (view.post_id, view.viewed_at.isoformat() if view.viewed_at else "")
+                for view in batch.views
+            ],
+            user_id=current_user["user_id"],
+        )
+        return {
+            "recorded": response.recorded,
+            "rejected_post_ids": list(response.rejected_post_ids),
+        }
+    except grpc.RpcError as e:
+        handle_grpc_error(e, "recording views", None)
+
+
+@router.post(
+    "/{post_id}/view",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(engagement_budget)],
+)
+async def view_post(post_id: str, current_user: dict = Depends(limit_engagement)):
+    try:
+        await post_client.view_post(post_id=post_id, user_id=current_user["user_id"])
         return {"message": "Post viewed successfully"}
     except grpc.RpcError as e:
         if e.code() == grpc.StatusCode.NOT_FOUND:
@@ -268,10 +442,14 @@ async def view_post(post_id: str, current_user: dict = Depends(get_current_user)
         )
 
 
-@router.post("/{post_id}/like", status_code=status.HTTP_200_OK)
-async def like_post(post_id: str, current_user: dict = Depends(get_current_user)):
+@router.post(
+    "/{post_id}/like",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(engagement_budget)],
+)
+async def like_post(post_id: str, current_user: dict = Depends(limit_engagement)):
     try:
-        post_client.like_post(post_id=post_id, user_id=current_user["user_id"])
+        await post_client.like_post(post_id=post_id, user_id=current_user["user_id"])
         return {"message": "Post liked successfully"}
     except grpc.RpcError as e:
         if e.code() == grpc.StatusCode.NOT_FOUND:
@@ -284,18 +462,24 @@ async def like_post(post_id: str, current_user: dict = Depends(get_current_user)
         )
 
 
-@router.post("/{post_id}/comment", response_model=Comment, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{post_id}/comment",
+    response_model=Comment,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(engagement_budget)],
+)
 async def add_comment(
     post_id: str, 
     comment_data: CommentCreate,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(limit_engagement)
 ):
     try:
-        comment = post_client.add_comment(
+        comment = await post_client.add_comment(
             post_id=post_id,
             user_id=current_user["user_id"],
             text=comment_data.text
         )
+        validator_cache.invalidate(post_id)
         
         return {
             "id": comment.id,
@@ -308,35 +492,48 @@ async def add_comment(
         handle_grpc_error(e, "adding comment", post_id)
 
 
-@router.get("/{post_id}/comments", response_model=GetCommentsResponse)
+@router.get(
+    "/{post_id}/comments",
+    response_model=GetCommentsResponse,
+    dependencies=[Depends(reads_budget)],
+)
 async def get_comments(
     post_id: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
-    current_user: dict = Depends(get_current_user)
+    page_token: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(limit_reads)
 ):
+    variant = ("comments", page, page_size, page_token, current_user["user_id"])
+    cached_etag = validator_cache.get(post_id, variant)
+    if etag_matches(if_none_match, cached_etag):
+        return not_modified(cached_etag)
+
     try:
-        response = post_client.get_comments(
+        comments_response = await post_client.get_comments(
             post_id=post_id,
+            user_id=current_user["user_id"],
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            page_token=page_token or "",
         )
-        
-        comments = []
-        for c in response.comments:
-            comments.append({
-                "id": c.id,
-                "post_id": c.post_id,
-                "user_id": c.user_id,
-                "text": c.text,
-                "created_at": datetime.fromisoformat(c.created_at)
-            })
-        
-        return {
-            "comments": comments,
-            "total": response.total,
-            "page": response.page,
-            "page_size": response.page_size
-        }
     except grpc.RpcError as e:
-        handle_grpc_error(e, "getting comments", post_id)
\ No newline at end of file
+        handle_grpc_error(e, "getting comments", post_id)
+
+    etag = make_etag(
+        post_id,
+        comments_response.page,
+        comments_response.page_size,
+        comments_response.total,
+        comments_response.next_page_token,
+        *(c.id for c in comments_response.comments),
+    )
+    validator_cache.set(post_id, etag, variant)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    return FastJSONResponse(
+        comments_page_to_dict(comments_response),
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
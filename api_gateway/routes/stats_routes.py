@@ -1,20 +1,43 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from fastapi.security import OAuth2PasswordBearer
 from typing import List, Optional, Dict
 from pydantic import BaseModel
 from datetime import datetime, date
 import grpc
-import jwt
+import logging
 import os
 
+from auth.jwt_auth import get_current_user
+from cache.ttl_cache import TTLCache
+from deadlines.budget import reads_budget
+from grpc_client.circuit_breaker import CircuitOpen
 from grpc_client.stats_client import StatsClient
+from limits.rate_limiter import limit_reads
 
-router = APIRouter()
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(dependencies=[Depends(reads_budget)])
 stats_client = StatsClient()
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-JWT_SECRET = os.getenv("JWT_SECRET", "thenromanov-secret-key")
-JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+TOP_CACHE_TTL = float(os.getenv("TOP_CACHE_TTL", "30"))
+TOP_CACHE_STALE_TTL = float(os.getenv("TOP_CACHE_STALE_TTL", "300"))
+STATS_FALLBACK_SIZE = int(os.getenv("STATS_FALLBACK_SIZE", "4096"))
+
+top_cache = TTLCache(ttl=TOP_CACHE_TTL, stale_ttl=TOP_CACHE_STALE_TTL, name="top_stats")
+fallback_cache = TTLCache(ttl=0, max_size=STATS_FALLBACK_SIZE, name="stats_fallback")
+
+
+async def load_with_fallback(key, loader):
+    try:
+        response = await loader()
+    except CircuitOpen:
+        response = fallback_cache.get(key)
+        if response is None:
+            raise
+        logger.warning(f"Stats circuit open, serving last known {key}")
+        return response
+    fallback_cache.set(key, response)
+    return response
 
 
 class PostStats(BaseModel):
@@ -53,29 +76,12 @@ class TopUsers(BaseModel):
     users: List[TopUserEntry]
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("id")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return {"user_id": user_id}
-    except jwt.PyJWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-
 @router.get("/posts/{post_id}", response_model=PostStats)
-async def get_post_stats(post_id: str, current_user: dict = Depends(get_current_user)):
+async def get_post_stats(post_id: str, current_user: dict = Depends(limit_reads)):
     try:
-        response = stats_client.get_post_stats(post_id=post_id)
+        response = await load_with_fallback(
+            ("post", post_id), lambda: stats_client.get_post_stats(post_id=post_id)
+        )
         return {
             "post_id": post_id,
             "views": response.views,
@@ -98,10 +104,13 @@ async def get_post_stats(post_id: str, current_user: dict = Depends(get_current_
 async def get_post_views_timeline(
     post_id: str, 
     days: int = Query(7, ge=1, le=30),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(limit_reads)
 ):
     try:
-        response = stats_client.get_post_views_timeline(post_id=post_id, days=days)
+        response = await load_with_fallback(
+            ("views_timeline", post_id, days),
+            lambda: stats_client.get_post_views_timeline(post_id=post_id, days=days),
+        )
         return {"entries": [{"date": entry.date, "count": entry.count} for entry in response.entries]}
     except grpc.RpcError as e:
         if e.code() == grpc.StatusCode.NOT_FOUND:
@@ -119,10 +128,13 @@ async def get_post_views_timeline(
 async def get_post_likes_timeline(
     post_id: str, 
     days: int = Query(7, ge=1, le=30),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(limit_reads)
 ):
     try:
-        response = stats_client.get_post_likes_timeline(post_id=post_id, days=days)
+        response = await load_with_fallback(
+            ("likes_timeline", post_id, days),
+            lambda: stats_client.get_post_likes_timeline(post_id=post_id, days=days),
+        )
         return {"entries": [{"date": entry.date, "count": entry.count} for entry in response.entries]}
     except grpc.RpcError as e:
         if e.code() == grpc.StatusCode.NOT_FOUND:
@@ -140,10 +152,13 @@ async def get_post_likes_timeline(
 async def get_post_comments_timeline(
     post_id: str, 
     days: int = Query(7, ge=1, le=30),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(limit_reads)
 ):
     try:
-        response = stats_client.get_post_comments_timeline(post_id=post_id, days=days)
+        response = await load_with_fallback(
+            ("comments_timeline", post_id, days),
+            lambda: stats_client.get_post_comments_timeline(post_id=post_id, days=days),
+        )
         return {"entries": [{"date": entry.date, "count": entry.count} for entry in response.entries]}
     except grpc.RpcError as e:
         if e.code() == grpc.StatusCode.NOT_FOUND:
@@ -161,10 +176,16 @@ async def get_post_comments_timeline(
 async def get_top_posts(
     metric: str = Query("views", description="Metric to use: views, likes, or comments"),
     limit: int = Query(10, ge=1, le=50),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(limit_reads)
 ):
     try:
-        response = stats_client.get_top_posts(metric_type=metric, limit=limit)
+        key = ("posts", metric.lower(), limit)
+        response = await load_with_fallback(
+            key,
+            lambda: top_cache.get_or_load(
+                key, lambda: stats_client.get_top_posts(metric_type=metric, limit=limit)
+            ),
+        )
         return {
             "posts": [
                 {"post_id": post.post_id, "title": post.title, "count": post.count}
@@ -187,10 +208,16 @@ async def get_top_posts(
 async def get_top_users(
     metric: str = Query("views", description="Metric to use: views, likes, or comments"),
     limit: int = Query(10, ge=1, le=50),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(limit_reads)
 ):
     try:
-        response = stats_client.get_top_users(metric_type=metric, limit=limit)
+        key = ("users", metric.lower(), limit)
+        response = await load_with_fallback(
+            key,
+            lambda: top_cache.get_or_load(
+                key, lambda: stats_client.get_top_users(metric_type=metric, limit=limit)
+            ),
+        )
         return {
             "users": [
                 {"user_id": user.user_id, "username": user.username, "count": user.count}
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr
+from deadlines.budget import auth_budget
 from grpc_client.user_client import UserClient
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(auth_budget)])
 
 user_client = UserClient()
 
@@ -26,7 +27,7 @@ class UserLogin(BaseModel):
 async def register_user(user: UserCreate):
     try:
         logger.info(f"Register: {user.email}")
-        response = user_client.register(user.username, user.email, user.password)
+        response = await user_client.register(user.username, user.email, user.password)
         if not response.success:
             logger.warning(f"Register err: {response.message}")
             raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=response.message)
@@ -43,7 +44,7 @@ async def register_user(user: UserCreate):
 async def login_user(user: UserLogin):
     try:
         logger.info(f"Login: {user.email}")
-        response = user_client.login(user.email, user.password)
+        response = await user_client.login(user.email, user.password)
         if not response.success:
             logger.warning(f"Login err: {response.message}")
             raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail=response.message)
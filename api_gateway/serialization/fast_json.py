@@ -0,0 +1,60 @@
+import orjson
+from starlette.responses import Response
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content):
+        return orjson.dumps(content)
+
+
+def post_to_dict(post):
+    return {
+        "title": post.title,
+        "description": post.description,
+        "is_private": post.is_private,
+        "tags": list(post.tags),
+        "id": post.id,
+        "creator_id": post.creator_id,
+        "created_at": post.created_at,
+        "updated_at": post.updated_at,
+    }
+
+
+def comment_to_dict(comment):
+    return {
+        "id": comment.id,
+        "post_id": comment.post_id,
+        "user_id": comment.user_id,
+        "text": comment.text,
+        "created_at": comment.created_at,
+    }
+
+
+def posts_page_to_dict(response):
+    return {
+        "posts": [post_to_dict(post) for post in response.posts],
+        "total": response.total if response.HasField("total") else None,
+        "page": response.page,
+        "page_size": response.page_size,
+        "next_page_token": response.next_page_token or None,
+    }
+
+
+def search_page_to_dict(response):
+    return {
+        "posts": [post_to_dict(post) for post in response.posts],
+        "page_size": response.page_size,
+        "next_page_token": response.next_page_token or None,
+    }
+
+
+def comments_page_to_dict(response):
+    return {
+        "comments": [comment_to_dict(comment) for comment in response.comments],
+        "total": response.total,
+        "page": response.page,
+        "page_size": response.page_size,
+        "next_page_token": response.next_page_token or None,
+    }
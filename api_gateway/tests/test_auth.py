@@ -0,0 +1,74 @@
+import asyncio
+import time
+import jwt
+import pytest
+from unittest.mock import patch
+from fastapi import HTTPException
+
+from auth import jwt_auth
+from auth.jwt_auth import get_current_user, JWT_SECRET, JWT_ALGORITHM
+from cache.token_cache import TokenCache
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    jwt_auth.token_cache.clear()
+    yield
+    jwt_auth.token_cache.clear()
+
+
+def make_token(user_id="user-1", exp_in=3600):
+    return jwt.encode(
+        {"id": user_id, "exp": time.time() + exp_in}, JWT_SECRET, algorithm=JWT_ALGORITHM
+    )
+
+
+def test_token_cache_hit_and_miss():
+    cache = TokenCache(max_size=10)
+
+    assert cache.get("token") is None
+    cache.set("token", {"id": "user-1"})
+    assert cache.get("token") == {"id": "user-1"}
+
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_token_cache_expires_at_exp():
+    cache = TokenCache(max_size=10)
+    cache.set("token", {"id": "user-1", "exp": time.time() - 1})
+
+    assert cache.get("token") is None
+    assert len(cache.entries) == 0
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(max_size=2)
+    cache.set("a", {"id": "a"})
+    cache.set("b", {"id": "b"})
+    cache.get("a")
+    cache.set("c", {"id": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"id": "a"}
+    assert cache.get("c") == {"id": "c"}
+
+
+def test_get_current_user_decodes_token_once():
+    token = make_token()
+
+    with patch("auth.jwt_auth.jwt.decode", wraps=jwt.decode) as decode_mock:
+        first = asyncio.run(get_current_user(token))
+        second = asyncio.run(get_current_user(token))
+
+    assert first == second == {"user_id": "user-1"}
+    decode_mock.assert_called_once()
+    assert jwt_auth.token_cache.hits == 1
+
+
+def test_get_current_user_rejects_invalid_token():
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(get_current_user("not-a-token"))
+
+    assert exc.value.status_code == 401
+    assert len(jwt_auth.token_cache.entries) == 0
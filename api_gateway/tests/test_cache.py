@@ -0,0 +1,151 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from cache.singleflight import SingleFlight
+from cache.ttl_cache import TTLCache
+from cache.validator_cache import ValidatorCache, make_etag, etag_matches
+
+
+def test_singleflight_collapses_concurrent_calls():
+    group = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*[group.do("key", load) for _ in range(10)])
+
+    results = asyncio.run(run())
+
+    assert results == ["value"] * 10
+    assert len(calls) == 1
+    assert group.executed == 1
+    assert group.collapsed == 9
+    assert group.calls == {}
+
+
+def test_singleflight_propagates_errors_to_all_callers():
+    group = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            *[group.do("key", load) for _ in range(3)], return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert group.executed == 1
+
+
+def test_ttl_cache_hit_within_ttl():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return len(calls)
+
+    async def run():
+        first = await cache.get_or_load("key", load)
+        second = await cache.get_or_load("key", load)
+        return first, second
+
+    assert asyncio.run(run()) == (1, 1)
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_ttl_cache_serves_stale_and_refreshes_in_background():
+    cache = TTLCache(ttl=10, stale_ttl=100)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return len(calls)
+
+    async def run():
+        with patch("cache.ttl_cache.time.monotonic", return_value=0):
+            await cache.get_or_load("key", load)
+        with patch("cache.ttl_cache.time.monotonic", return_value=50):
+            stale = await cache.get_or_load("key", load)
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            fresh = await cache.get_or_load("key", load)
+        return stale, fresh
+
+    assert asyncio.run(run()) == (1, 2)
+    assert cache.stale_hits == 1
+
+
+def test_ttl_cache_reloads_after_stale_window():
+    cache = TTLCache(ttl=10, stale_ttl=10)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return len(calls)
+
+    async def run():
+        with patch("cache.ttl_cache.time.monotonic", return_value=0):
+            await cache.get_or_load("key", load)
+        with patch("cache.ttl_cache.time.monotonic", return_value=100):
+            return await cache.get_or_load("key", load)
+
+    assert asyncio.run(run()) == 2
+    assert cache.misses == 2
+
+
+def test_ttl_cache_does_not_store_failures():
+    cache = TTLCache(ttl=60)
+
+    async def load():
+        raise ValueError("Invalid metric type: invalid")
+
+    with pytest.raises(ValueError):
+        asyncio.run(cache.get_or_load("key", load))
+
+    assert cache.entries == {}
+
+
+def test_etag_matches_lists_and_weak_validators():
+    etag = make_etag("post-id", "2024-01-01T00:00:00")
+
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag[2:]}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_validator_cache_expires_and_invalidates():
+    cache = ValidatorCache(ttl=5)
+
+    with patch("cache.validator_cache.time.monotonic", return_value=0):
+        cache.set("post-id", '"a"')
+        cache.set("post-id", '"b"', ("comments", 1, 10))
+        assert cache.get("post-id") == '"a"'
+        assert cache.get("post-id", ("comments", 1, 10)) == '"b"'
+    with patch("cache.validator_cache.time.monotonic", return_value=10):
+        assert cache.get("post-id") is None
+
+    cache.invalidate("post-id")
+    assert cache.get("post-id", ("comments", 1, 10)) is None
+
+
+def test_validator_cache_get_any_checks_variants_in_order():
+    cache = ValidatorCache(ttl=5)
+    cache.set("post-id", '"owner"', ("post", "owner"))
+
+    assert cache.get_any("post-id", [("post", ""), ("post", "owner")]) == '"owner"'
+    assert cache.get_any("post-id", [("post", ""), ("post", "other")]) is None
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,134 @@
+import asyncio
+import grpc
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from prometheus_client import REGISTRY
+
+from grpc_client.base_client import BaseClient
+from grpc_client.circuit_breaker import CircuitBreaker, CircuitOpen, CLOSED, HALF_OPEN, OPEN
+
+
+class MockRpcError(grpc.RpcError):
+    def __init__(self, code: grpc.StatusCode, details: str = ""):
+        self._code = code
+        self._details = details
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+
+def make_breaker(**kwargs):
+    options = dict(
+        window=10,
+        min_calls=4,
+        failure_rate=0.5,
+        slow_call_rate=0.8,
+        slow_call_duration=1,
+        open_duration=5,
+        half_open_calls=2,
+    )
+    options.update(kwargs)
+    return CircuitBreaker("stats-service:50053", **options)
+
+
+def breaker_state():
+    return REGISTRY.get_sample_value(
+        "gateway_circuit_breaker_state", {"backend": "stats-service:50053"}
+    )
+
+
+def test_breaker_opens_on_error_rate_and_fails_fast():
+    breaker = make_breaker()
+
+    with patch("grpc_client.circuit_breaker.time.monotonic", return_value=100):
+        for code in [grpc.StatusCode.OK, grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.OK]:
+            breaker.record(code, 0.01)
+        assert breaker.state == CLOSED
+        breaker.record(grpc.StatusCode.DEADLINE_EXCEEDED, 0.01)
+        assert breaker.state == OPEN
+        assert breaker_state() == 2
+
+    with patch("grpc_client.circuit_breaker.time.monotonic", return_value=102):
+        with pytest.raises(CircuitOpen) as error:
+            breaker.allow()
+
+    assert error.value.retry_after == 3
+
+
+def test_breaker_ignores_application_errors():
+    breaker = make_breaker()
+
+    for _ in range(10):
+        breaker.record(grpc.StatusCode.NOT_FOUND, 0.01)
+
+    assert breaker.state == CLOSED
+
+
+def test_breaker_opens_on_slow_calls():
+    breaker = make_breaker()
+
+    for _ in range(4):
+        breaker.record(grpc.StatusCode.OK, 2)
+
+    assert breaker.state == OPEN
+
+
+def test_half_open_probes_close_breaker():
+    breaker = make_breaker()
+    with patch("grpc_client.circuit_breaker.time.monotonic", return_value=100):
+        breaker.trip()
+
+    with patch("grpc_client.circuit_breaker.time.monotonic", return_value=105):
+        breaker.allow()
+        breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert breaker_state() == 1
+        with pytest.raises(CircuitOpen):
+            breaker.allow()
+
+    breaker.record(grpc.StatusCode.OK, 0.01)
+    breaker.record(grpc.StatusCode.OK, 0.01)
+
+    assert breaker.state == CLOSED
+    assert breaker_state() == 0
+
+
+def test_failed_probe_reopens_breaker():
+    breaker = make_breaker()
+    with patch("grpc_client.circuit_breaker.time.monotonic", return_value=100):
+        breaker.trip()
+
+    with patch("grpc_client.circuit_breaker.time.monotonic", return_value=105):
+        breaker.allow()
+        breaker.record(grpc.StatusCode.UNAVAILABLE, 0.01)
+
+    assert breaker.state == OPEN
+    assert breaker.opened_at == 105
+
+
+def test_base_client_fails_fast_without_calling_backend():
+    backend = BaseClient("stats-service:50053", max_in_flight=10)
+    backend.breaker = make_breaker(min_calls=2)
+    calls = []
+
+    async def get_post_stats(request, timeout=None):
+        calls.append(request)
+        raise MockRpcError(grpc.StatusCode.UNAVAILABLE, "Connection refused")
+
+    backend.pool.stubs = [SimpleNamespace(GetPostStats=get_post_stats)]
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(grpc.RpcError):
+                await backend.call("GetPostStats", "request")
+        with pytest.raises(CircuitOpen):
+            await backend.call("GetPostStats", "request")
+
+    asyncio.run(run())
+
+    assert len(calls) == 2
+    assert backend.limiter.in_flight == 0
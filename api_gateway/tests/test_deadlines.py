@@ -0,0 +1,189 @@
+import asyncio
+from types import SimpleNamespace
+import grpc
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+
+from main import app
+from deadlines.budget import DEADLINE_BUDGETS, DeadlineExceeded, request_deadline, time_remaining
+from deadlines.disconnect import CancelOnDisconnectMiddleware, MAX_REQUEST_BODY_BYTES
+from grpc_client.base_client import BaseClient
+from proto import post_pb2
+
+
+class MockRpcError(grpc.RpcError):
+    def __init__(self, code: grpc.StatusCode, details: str = ""):
+        self._code = code
+        self._details = details
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_mock():
+    from routes.post_routes import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": "test-user-id"}
+    yield
+    app.dependency_overrides = {}
+
+
+@pytest.fixture
+def post_client_mock():
+    with patch("routes.post_routes.post_client", new_callable=AsyncMock) as mock:
+        yield mock
+
+
+def test_route_budget_is_visible_to_backend_calls(client, auth_mock, post_client_mock):
+    budgets = []
+
+    async def list_posts(**kwargs):
+        budgets.append(time_remaining())
+        return post_pb2.ListPostsResponse(page=1, page_size=10)
+
+    post_client_mock.list_posts.side_effect = list_posts
+
+    response = client.get("/posts/", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == 200
+    assert 0 < budgets[0] <= DEADLINE_BUDGETS["reads"]
+
+
+def test_base_client_passes_remaining_budget_as_timeout():
+    backend = BaseClient("post-service:50052", max_in_flight=10)
+    timeouts = []
+
+    async def method(request, timeout=None):
+        timeouts.append(timeout)
+        return request
+
+    backend.pool.stubs = [SimpleNamespace(Method=method)]
+
+    async def run():
+        await backend.call("Method", "no-deadline")
+        await backend.call("Method", "explicit", timeout=5)
+        with patch("deadlines.budget.time.monotonic", return_value=100):
+            request_deadline.set(101.5)
+            await backend.call("Method", "budget")
+            await backend.call("Method", "budget-and-explicit", timeout=1)
+
+    asyncio.run(run())
+
+    assert timeouts == [None, 5, 1.5, 1]
+
+
+def test_base_client_maps_budget_expiry_to_deadline_exceeded():
+    backend = BaseClient("post-service:50052", max_in_flight=10)
+
+    async def method(request, timeout=None):
+        raise MockRpcError(grpc.StatusCode.DEADLINE_EXCEEDED, "Deadline Exceeded")
+
+    backend.pool.stubs = [SimpleNamespace(Method=method)]
+
+    async def run():
+        request_deadline.set(0)
+        await backend.call("Method", "request")
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run())
+
+
+def test_deadline_exceeded_returns_504(client, auth_mock, post_client_mock):
+    post_client_mock.list_posts.side_effect = DeadlineExceeded("post-service:50052")
+
+    response = client.get("/posts/", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == 504
+
+
+def test_disconnect_cancels_in_flight_request():
+    cancelled = asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    middleware = CancelOnDisconnectMiddleware(slow_app)
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    async def run():
+        await asyncio.wait_for(
+            middleware({"type": "http", "method": "GET", "path": "/posts/"}, receive, send),
+            timeout=1,
+        )
+
+    asyncio.run(run())
+
+    assert cancelled.is_set()
+    assert middleware.cancelled == 1
+
+
+def test_disconnect_middleware_replays_request_body(client, auth_mock, post_client_mock):
+    post_client_mock.batch_get_posts.return_value = post_pb2.BatchGetPostsResponse()
+
+    response = client.post(
+        "/posts/batch-get",
+        json={"ids": ["post-1", "post-2"]},
+        headers={"Authorization": "Bearer test-token"},
+    )
+
+    assert response.status_code == 200
+    post_client_mock.batch_get_posts.assert_called_once_with(
+        post_ids=["post-1", "post-2"], user_id="test-user-id"
+    )
+
+
+def test_disconnect_middleware_rejects_oversized_content_length(client, auth_mock, post_client_mock):
+    response = client.post(
+        "/posts/batch-get",
+        data=b"x" * (MAX_REQUEST_BODY_BYTES + 1),
+        headers={"Authorization": "Bearer test-token", "Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request body too large"}
+    post_client_mock.batch_get_posts.assert_not_called()
+
+
+def test_disconnect_middleware_stops_buffering_chunked_body_over_limit():
+    chunk = b"x" * (MAX_REQUEST_BODY_BYTES // 2 + 1)
+    received = []
+    sent = []
+
+    async def app(scope, receive, send):
+        raise AssertionError("app must not run")
+
+    async def receive():
+        received.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": True}
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = CancelOnDisconnectMiddleware(app)
+    asyncio.run(middleware({"type": "http", "method": "POST", "path": "/posts/", "headers": []}, receive, send))
+
+    assert len(received) == 2
+    assert sent[0]["status"] == 413
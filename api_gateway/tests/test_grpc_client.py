@@ -0,0 +1,265 @@
+import asyncio
+import grpc
+import json
+import pytest
+from types import SimpleNamespace
+
+from grpc_client.base_client import resolver_target
+from grpc_client.channel_pool import ChannelPool, LEAST_LOADED, ROUND_ROBIN
+from grpc_client.hedging import HEDGE_DEFAULT_DELAY, LatencyTracker, hedged_call
+from grpc_client.post_client import PostClient
+from grpc_client.stats_client import StatsClient
+from limits.concurrency_limiter import ConcurrencyLimiter
+
+
+def test_resolver_target_defaults_to_dns():
+    assert resolver_target("post-service:50052") == "dns:///post-service:50052"
+    assert resolver_target("dns:///post-service:50052") == "dns:///post-service:50052"
+    assert resolver_target("ipv4:10.0.0.1:50052,10.0.0.2:50052") == "ipv4:10.0.0.1:50052,10.0.0.2:50052"
+
+
+def test_channels_use_round_robin_with_health_checks():
+    for client, service_name in [
+        (PostClient(), "post.PostService"),
+        (StatsClient(), "stats.StatsService"),
+    ]:
+        options = dict(client.channel_options())
+        config = json.loads(options["grpc.service_config"])
+
+        assert config["loadBalancingConfig"] == [{"round_robin": {}}]
+        assert config["healthCheckConfig"] == {"serviceName": service_name}
+
+
+def make_pool(size, selection):
+    pool = ChannelPool("post.PostService", "dns:///post-service:50052", None, [], size, selection)
+    pool.stubs = [f"stub-{index}" for index in range(size)]
+    return pool
+
+
+def test_channel_pool_round_robin_cycles_channels():
+    pool = make_pool(3, ROUND_ROBIN)
+
+    picked = []
+    for _ in range(4):
+        with pool.acquire() as stub:
+            picked.append(stub)
+
+    assert picked == ["stub-0", "stub-1", "stub-2", "stub-0"]
+
+
+def test_channel_pool_least_loaded_avoids_busy_channels():
+    pool = make_pool(3, LEAST_LOADED)
+
+    with pool.acquire() as first, pool.acquire() as second, pool.acquire() as third:
+        assert {first, second, third} == {"stub-0", "stub-1", "stub-2"}
+        assert dict(pool.in_flight) == {0: 1, 1: 1, 2: 1}
+        pool.in_flight[1] -= 1
+        with pool.acquire() as fourth:
+            assert fourth == "stub-1"
+        pool.in_flight[1] += 1
+
+    assert sum(pool.in_flight.values()) == 0
+
+
+def test_channel_pool_opens_independent_connections():
+    async def run():
+        pool = ChannelPool(
+            "post.PostService", "dns:///post-service:50052", PostClient.stub_class, [], 3
+        )
+        pool.connect()
+        try:
+            assert len(pool.channels) == 3
+            assert len(set(map(id, pool.stubs))) == 3
+        finally:
+            await pool.close()
+        assert pool.channels == []
+
+    asyncio.run(run())
+
+
+def test_channel_options_tune_keepalive_and_message_size():
+    options = dict(PostClient().channel_options())
+
+    assert options["grpc.keepalive_time_ms"] > 0
+    assert options["grpc.keepalive_timeout_ms"] > 0
+    assert options["grpc.max_receive_message_length"] == options["grpc.max_send_message_length"]
+    assert options["grpc.max_receive_message_length"] > 4 * 1024 * 1024
+
+
+class MockRpcError(grpc.RpcError):
+    def __init__(self, code: grpc.StatusCode, details: str = ""):
+        self._code = code
+        self._details = details
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+
+def test_retries_only_configured_for_idempotent_methods():
+    config = json.loads(dict(PostClient().channel_options())["grpc.service_config"])
+    retried, excluded = config["methodConfig"]
+
+    retried_methods = {name["method"] for name in retried["name"]}
+    assert retried_methods == {"GetPost", "ListPosts", "BatchGetPosts", "SearchPosts", "GetTagCounts", "GetComments"}
+    assert retried["retryPolicy"]["retryableStatusCodes"] == ["UNAVAILABLE"]
+
+    excluded_methods = {name["method"] for name in excluded["name"]}
+    assert {"CreatePost", "ViewPost", "AddComment"} <= excluded_methods
+    assert "retryPolicy" not in excluded
+    assert "hedgingPolicy" not in excluded
+
+
+def test_latency_tracker_uses_p95_once_warmed_up():
+    tracker = LatencyTracker(window=100, min_samples=20)
+
+    for _ in range(19):
+        tracker.record(0.5)
+    assert tracker.hedge_delay() == HEDGE_DEFAULT_DELAY
+
+    for i in range(100):
+        tracker.record((i + 1) / 1000)
+    assert tracker.hedge_delay() == pytest.approx(0.096)
+
+
+def test_hedged_call_returns_first_successful_attempt():
+    tracker = LatencyTracker(min_samples=0)
+    tracker.record(0.01)
+    cancelled = []
+    attempts = []
+
+    async def method(request, timeout=None):
+        attempts.append(timeout)
+        if len(attempts) == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        return "hedge"
+
+    async def run():
+        response = await hedged_call(method, "request", tracker, timeout=1)
+        await asyncio.sleep(0)
+        return response
+
+    response, hedged = asyncio.run(run())
+
+    assert (response, hedged) == ("hedge", True)
+    assert len(attempts) == 2
+    assert attempts[1] < 1
+    assert cancelled == [True]
+
+
+def test_hedged_call_raises_fatal_errors_without_hedging():
+    tracker = LatencyTracker(min_samples=0)
+    tracker.record(0.05)
+    attempts = []
+
+    async def method(request, timeout=None):
+        attempts.append(request)
+        raise MockRpcError(grpc.StatusCode.NOT_FOUND, "Post not found")
+
+    with pytest.raises(grpc.RpcError):
+        asyncio.run(hedged_call(method, "request", tracker))
+
+    assert len(attempts) == 1
+
+
+def test_hedged_call_waits_for_hedge_after_unavailable():
+    tracker = LatencyTracker(min_samples=0)
+    tracker.record(0.01)
+    attempts = []
+
+    async def method(request, timeout=None):
+        attempts.append(request)
+        if len(attempts) == 1:
+            await asyncio.sleep(0.05)
+            raise MockRpcError(grpc.StatusCode.UNAVAILABLE, "Replica stalled")
+        await asyncio.sleep(0.1)
+        return "hedge"
+
+    assert asyncio.run(hedged_call(method, "request", tracker)) == ("hedge", True)
+
+
+def test_hedged_call_records_winning_attempt_duration():
+    tracker = LatencyTracker(min_samples=0)
+    tracker.record(0.05)
+    attempts = []
+
+    async def method(request, timeout=None):
+        attempts.append(request)
+        if len(attempts) == 1:
+            await asyncio.sleep(10)
+        return "hedge"
+
+    assert asyncio.run(hedged_call(method, "request", tracker)) == ("hedge", True)
+    assert tracker.samples[-1] < 0.05
+
+
+def test_hedged_call_holds_limiter_slot_for_hedge():
+    tracker = LatencyTracker(min_samples=0)
+    tracker.record(0.01)
+    limiter = ConcurrencyLimiter("post-service:50052", 2)
+    limiter.in_flight = 1
+    in_flight = []
+
+    async def method(request, timeout=None):
+        in_flight.append(limiter.in_flight)
+        if len(in_flight) == 1:
+            await asyncio.sleep(10)
+        return "hedge"
+
+    async def run():
+        response = await hedged_call(method, "request", tracker, limiter=limiter)
+        await asyncio.sleep(0)
+        return response
+
+    assert asyncio.run(run()) == ("hedge", True)
+    assert in_flight == [1, 2]
+    assert limiter.in_flight == 1
+    assert limiter.shed == 0
+
+
+def test_hedged_call_skips_hedge_without_free_slot():
+    tracker = LatencyTracker(min_samples=0)
+    tracker.record(0.01)
+    limiter = ConcurrencyLimiter("post-service:50052", 1)
+    limiter.in_flight = 1
+    attempts = []
+
+    async def method(request, timeout=None):
+        attempts.append(request)
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert asyncio.run(hedged_call(method, "request", tracker, limiter=limiter)) == ("primary", False)
+    assert len(attempts) == 1
+    assert limiter.in_flight == 1
+    assert limiter.shed == 0
+
+
+def test_base_client_hedges_only_idempotent_methods():
+    client = PostClient()
+    calls = []
+
+    async def slow(request, timeout=None):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return request
+
+    client.pool.stubs = [SimpleNamespace(GetPost=slow, ViewPost=slow)]
+    client.latencies["GetPost"] = LatencyTracker(min_samples=0)
+    client.latencies["GetPost"].record(0.01)
+
+    async def run():
+        await client.call("GetPost", "read")
+        await client.call("ViewPost", "write")
+
+    asyncio.run(run())
+
+    assert calls == ["read", "read", "write"]
+    assert client.hedged == 1
+    assert "ViewPost" not in client.latencies
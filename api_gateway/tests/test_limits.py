@@ -0,0 +1,115 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+
+from main import app
+from grpc_client.base_client import BaseClient
+from limits.concurrency_limiter import ConcurrencyLimiter, BackendOverloaded
+from limits.rate_limiter import RateLimiter, rate_limiters
+from proto import post_pb2
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_mock():
+    from routes.post_routes import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": "test-user-id"}
+    yield
+    app.dependency_overrides = {}
+
+
+@pytest.fixture
+def post_client_mock():
+    with patch("routes.post_routes.post_client", new_callable=AsyncMock) as mock:
+        yield mock
+
+
+def test_rate_limiter_allows_burst_then_rejects():
+    limiter = RateLimiter(rate=2, burst=3)
+
+    with patch("limits.rate_limiter.time.monotonic", return_value=0):
+        assert [limiter.acquire("user") for _ in range(3)] == [0, 0, 0]
+        assert limiter.acquire("user") == pytest.approx(0.5)
+        assert limiter.acquire("other-user") == 0
+
+    with patch("limits.rate_limiter.time.monotonic", return_value=0.5):
+        assert limiter.acquire("user") == 0
+
+    assert limiter.allowed == 5
+    assert limiter.rejected == 1
+
+
+def test_engagement_limit_returns_429_with_retry_after(client, auth_mock, post_client_mock):
+    with patch.dict(rate_limiters, {"engagement": RateLimiter(rate=0.5, burst=2)}):
+        responses = [
+            client.post("/posts/post-id/view", headers={"Authorization": "Bearer test-token"})
+            for _ in range(3)
+        ]
+
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert responses[2].headers["Retry-After"] == "2"
+    assert post_client_mock.view_post.call_count == 2
+
+
+def test_limits_are_per_route_class(client, auth_mock, post_client_mock):
+    post_client_mock.get_comments.return_value = post_pb2.GetCommentsResponse(page=1, page_size=10)
+
+    with patch.dict(rate_limiters, {"engagement": RateLimiter(rate=1, burst=1)}):
+        client.post("/posts/post-id/like", headers={"Authorization": "Bearer test-token"})
+        like = client.post("/posts/post-id/like", headers={"Authorization": "Bearer test-token"})
+        get = client.get("/posts/post-id/comments", headers={"Authorization": "Bearer test-token"})
+
+    assert like.status_code == 429
+    assert get.status_code == 200
+
+
+def test_concurrency_limiter_sheds_when_full():
+    limiter = ConcurrencyLimiter("post-service:50052", max_in_flight=1)
+
+    with limiter.slot():
+        with pytest.raises(BackendOverloaded):
+            with limiter.slot():
+                pass
+        assert limiter.in_flight == 1
+
+    assert limiter.in_flight == 0
+    assert limiter.shed == 1
+
+
+def test_base_client_call_sheds_excess_requests():
+    backend = BaseClient("post-service:50052", max_in_flight=2)
+    release = asyncio.Event()
+
+    async def method(request, timeout=None):
+        await release.wait()
+        return request
+
+    backend.pool.stubs = [SimpleNamespace(Method=method)]
+
+    async def run():
+        calls = [asyncio.ensure_future(backend.call("Method", i)) for i in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert results[:2] == [0, 1]
+    assert isinstance(results[2], BackendOverloaded)
+    assert backend.limiter.in_flight == 0
+
+
+def test_backend_overloaded_returns_503(client, auth_mock, post_client_mock):
+    post_client_mock.list_posts.side_effect = BackendOverloaded("post-service:50052")
+
+    response = client.get("/posts/", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,58 @@
+import os
+import pytest
+import subprocess
+import sys
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from main import app, backend_clients
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def test_read_root(client):
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert response.json() == {"message": "API Gateway"}
+
+
+def test_ready_while_backends_connecting(client):
+    response = client.get("/ready")
+
+    assert response.status_code == 503
+    data = response.json()
+    assert data["ready"] == False
+    assert set(data["backends"]) == {"user-service", "post-service", "stats-service"}
+
+
+def test_ready_when_all_backends_connected(client):
+    patches = [patch.object(c, "is_ready", return_value=True) for c in backend_clients.values()]
+    for p in patches:
+        p.start()
+    try:
+        response = client.get("/ready")
+    finally:
+        for p in patches:
+            p.stop()
+
+    assert response.status_code == 200
+    assert response.json()["ready"] == True
+
+
+def test_main_imports_before_multiprocess_dir_exists(tmp_path):
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path / "prometheus"))
+
+    result = subprocess.run(
+        [sys.executable, "-c", "import main"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert not (tmp_path / "prometheus").exists()
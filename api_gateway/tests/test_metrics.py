@@ -0,0 +1,114 @@
+import asyncio
+import grpc
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from main import app
+from cache.token_cache import TokenCache
+from grpc_client.base_client import BaseClient
+from proto import post_pb2
+
+
+class MockRpcError(grpc.RpcError):
+    def __init__(self, code: grpc.StatusCode, details: str = ""):
+        self._code = code
+        self._details = details
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_mock():
+    from routes.post_routes import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": "test-user-id"}
+    yield
+    app.dependency_overrides = {}
+
+
+@pytest.fixture
+def post_client_mock():
+    with patch("routes.post_routes.post_client", new_callable=AsyncMock) as mock:
+        yield mock
+
+
+def test_http_metrics_use_route_template(client, auth_mock, post_client_mock):
+    post_client_mock.get_post.side_effect = MockRpcError(grpc.StatusCode.NOT_FOUND, "Not found")
+    labels = {"method": "GET", "route": "/posts/{post_id}", "status": "404"}
+    before = sample("gateway_http_requests_total", **labels)
+
+    client.get("/posts/missing-post", headers={"Authorization": "Bearer test-token"})
+
+    assert sample("gateway_http_requests_total", **labels) == before + 1
+    assert sample("gateway_http_request_duration_seconds_count", **labels) == before + 1
+    assert sample("gateway_http_requests_in_flight", method="GET", route="/posts/{post_id}") == 0
+
+
+def test_metrics_endpoint_exposes_prometheus_text(client):
+    client.get("/")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'gateway_http_requests_total{method="GET",route="/",status="200"}' in response.text
+
+
+def test_grpc_client_latency_by_method_and_code():
+    backend = BaseClient("post-service:50052", max_in_flight=10)
+    backend.service_name = "post.PostService"
+
+    async def get_post(request, timeout=None):
+        raise MockRpcError(grpc.StatusCode.NOT_FOUND, "Not found")
+
+    async def list_posts(request, timeout=None):
+        return post_pb2.ListPostsResponse()
+
+    backend.pool.stubs = [SimpleNamespace(GetPost=get_post, ListPosts=list_posts)]
+    labels = {"service": "post.PostService"}
+    not_found = sample(
+        "gateway_grpc_client_duration_seconds_count", method="GetPost", code="NOT_FOUND", **labels
+    )
+    ok = sample("gateway_grpc_client_duration_seconds_count", method="ListPosts", code="OK", **labels)
+
+    async def run():
+        with pytest.raises(grpc.RpcError):
+            await backend.call("GetPost", post_pb2.GetPostRequest())
+        await backend.call("ListPosts", post_pb2.ListPostsRequest())
+
+    asyncio.run(run())
+
+    assert sample(
+        "gateway_grpc_client_duration_seconds_count", method="GetPost", code="NOT_FOUND", **labels
+    ) == not_found + 1
+    assert sample(
+        "gateway_grpc_client_duration_seconds_count", method="ListPosts", code="OK", **labels
+    ) == ok + 1
+
+
+def test_cache_lookups_are_counted_by_result():
+    cache = TokenCache(name="test_tokens")
+
+    cache.get("token")
+    cache.set("token", {"id": "user"})
+    cache.get("token")
+    cache.get("token")
+
+    assert sample("gateway_cache_requests_total", cache="test_tokens", result="hit") == 2
+    assert sample("gateway_cache_requests_total", cache="test_tokens", result="miss") == 1
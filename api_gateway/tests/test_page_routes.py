@@ -0,0 +1,192 @@
+import asyncio
+import grpc
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from datetime import datetime
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+class MockRpcError(grpc.RpcError):
+    def __init__(self, code: grpc.StatusCode, details: str = ""):
+        self._code = code
+        self._details = details
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_mock():
+    from routes.page_routes import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": "test-user-id"}
+    yield
+    app.dependency_overrides = {}
+
+
+@pytest.fixture
+def post_client_mock():
+    mock = AsyncMock()
+    with patch("routes.post_routes.post_client", mock), patch("routes.page_routes.post_client", mock):
+        yield mock
+
+
+@pytest.fixture
+def stats_client_mock():
+    with patch("routes.page_routes.stats_client", new_callable=AsyncMock) as mock:
+        yield mock
+
+
+def make_post():
+    post = MagicMock()
+    post.id = "post-id"
+    post.title = "Test Post"
+    post.description = "Test Description"
+    post.creator_id = "creator-id"
+    post.created_at = datetime.now().isoformat()
+    post.updated_at = datetime.now().isoformat()
+    post.is_private = False
+    post.tags = ["test"]
+    return post
+
+
+def make_comments():
+    comment = MagicMock()
+    comment.id = "comment-1"
+    comment.post_id = "post-id"
+    comment.user_id = "user-1"
+    comment.text = "First comment"
+    comment.created_at = datetime.now().isoformat()
+
+    response = MagicMock()
+    response.comments = [comment]
+    response.total = 1
+    response.page = 1
+    response.page_size = 10
+    response.next_page_token = ""
+    return response
+
+
+def test_get_post_page(client, auth_mock, post_client_mock, stats_client_mock):
+    post_client_mock.get_post.return_value = make_post()
+    post_client_mock.get_comments.return_value = make_comments()
+    stats_client_mock.get_post_stats.return_value = MagicMock(views=10, likes=5, comments=1)
+
+    response = client.get("/posts/post-id/page", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["post"]["id"] == "post-id"
+    assert data["comments"]["total"] == 1
+    assert data["comments"]["comments"][0]["id"] == "comment-1"
+    assert data["stats"] == {"post_id": "post-id", "views": 10, "likes": 5, "comments": 1}
+
+
+def test_get_post_page_returns_partial_result_when_stats_slow(
+    client, auth_mock, post_client_mock, stats_client_mock
+):
+    post_client_mock.get_post.return_value = make_post()
+    post_client_mock.get_comments.return_value = make_comments()
+
+    async def slow_stats(post_id):
+        await asyncio.sleep(1)
+
+    stats_client_mock.get_post_stats.side_effect = slow_stats
+
+    with patch("routes.page_routes.PAGE_STATS_TIMEOUT", 0.01):
+        response = client.get(
+            "/posts/post-id/page", headers={"Authorization": "Bearer test-token"}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["post"]["id"] == "post-id"
+    assert data["stats"] is None
+
+
+def test_get_post_page_returns_partial_result_when_stats_fail(
+    client, auth_mock, post_client_mock, stats_client_mock
+):
+    post_client_mock.get_post.return_value = make_post()
+    post_client_mock.get_comments.return_value = make_comments()
+    stats_client_mock.get_post_stats.side_effect = MockRpcError(
+        grpc.StatusCode.UNAVAILABLE, "Unavailable"
+    )
+
+    response = client.get("/posts/post-id/page", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == 200
+    assert response.json()["stats"] is None
+
+
+def test_get_post_page_not_found(client, auth_mock, post_client_mock, stats_client_mock):
+    post_client_mock.get_post.side_effect = MockRpcError(grpc.StatusCode.NOT_FOUND, "Not found")
+    post_client_mock.get_comments.return_value = make_comments()
+    stats_client_mock.get_post_stats.return_value = MagicMock(views=0, likes=0, comments=0)
+
+    response = client.get("/posts/missing/page", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Post ID missing not found"
+
+
+
+def slow_call(cancelled):
+    async def call(**kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(kwargs["post_id"])
+            raise
+
+    return call
+
+
+def call_page_route(post_id, cancelled):
+    from routes.page_routes import get_post_page
+
+    async def run():
+        try:
+            await get_post_page(post_id, page=1, page_size=10, current_user={"user_id": "test-user-id"})
+        except Exception as e:
+            return e, list(cancelled)
+
+    return asyncio.run(run())
+
+
+def test_get_post_page_waits_for_cancelled_calls_when_post_fails(post_client_mock, stats_client_mock):
+    from fastapi import HTTPException
+
+    cancelled = []
+    post_client_mock.get_post.side_effect = MockRpcError(grpc.StatusCode.NOT_FOUND, "Not found")
+    post_client_mock.get_comments.side_effect = slow_call(cancelled)
+    stats_client_mock.get_post_stats.side_effect = slow_call(cancelled)
+
+    error, cancelled_before_return = call_page_route("missing", cancelled)
+
+    assert isinstance(error, HTTPException) and error.status_code == 404
+    assert cancelled_before_return == ["missing", "missing"]
+
+
+def test_get_post_page_cancels_stats_on_unexpected_error(post_client_mock, stats_client_mock):
+    from limits.concurrency_limiter import BackendOverloaded
+
+    cancelled = []
+    post_client_mock.get_post.side_effect = BackendOverloaded("post", 1)
+    post_client_mock.get_comments.return_value = make_comments()
+    stats_client_mock.get_post_stats.side_effect = slow_call(cancelled)
+
+    error, cancelled_before_return = call_page_route("post-id", cancelled)
+
+    assert isinstance(error, BackendOverloaded)
+    assert cancelled_before_return == ["post-id"]
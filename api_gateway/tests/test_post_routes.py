@@ -1,9 +1,20 @@
+import asyncio
+import grpc
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime
 from fastapi.testclient import TestClient
 
 from main import app
+from proto import post_pb2
+from limits.rate_limiter import rate_limiters
+from routes.post_routes import (
+    fetch_post,
+    get_post_flight,
+    PUBLIC_VIEWER,
+    tag_counts_cache,
+    validator_cache,
+)
 
 
 @pytest.fixture
@@ -22,10 +33,26 @@ def auth_mock():
 
 @pytest.fixture
 def post_client_mock():
-    with patch("routes.post_routes.post_client") as mock:
+    validator_cache.clear()
+    tag_counts_cache.clear()
+    for limiter in rate_limiters.values():
+        limiter.clear()
+    with patch("routes.post_routes.post_client", new_callable=AsyncMock) as mock:
         yield mock
 
 
+class MockRpcError(grpc.RpcError):
+    def __init__(self, code: grpc.StatusCode, details: str = ""):
+        self._code = code
+        self._details = details
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+
 def test_create_post(client, auth_mock, post_client_mock):
     mock_response = MagicMock()
     mock_response.id = "post-id"
@@ -140,6 +167,7 @@ def test_list_posts(client, auth_mock, post_client_mock):
     mock_response.total = 1
     mock_response.page = 1
     mock_response.page_size = 10
+    mock_response.next_page_token = "next-token"
 
     post_client_mock.list_posts.return_value = mock_response
 
@@ -154,9 +182,122 @@ def test_list_posts(client, auth_mock, post_client_mock):
     assert data["posts"][0]["id"] == "post-id"
     assert data["page"] == 1
     assert data["page_size"] == 10
+    assert data["next_page_token"] == "next-token"
     post_client_mock.list_posts.assert_called_once()
 
 
+def test_list_posts_with_page_token(client, auth_mock, post_client_mock):
+    post_client_mock.list_posts.return_value = post_pb2.ListPostsResponse(page=1, page_size=10)
+
+    response = client.get(
+        "/posts/?page_size=10&page_token=abc", headers={"Authorization": "Bearer test-token"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] is None
+    assert data["next_page_token"] is None
+    post_client_mock.list_posts.assert_called_once_with(
+        page=1,
+        page_size=10,
+        user_id="test-user-id",
+        page_token="abc",
+        include_total=False,
+        tags_any=[],
+        tags_all=[],
+    )
+
+
+def test_list_posts_with_tag_filters(client, auth_mock, post_client_mock):
+    post_client_mock.list_posts.return_value = post_pb2.ListPostsResponse(page=1, page_size=10)
+
+    response = client.get(
+        "/posts/?tags_any=python&tags_any=go&tags_all=backend",
+        headers={"Authorization": "Bearer test-token"},
+    )
+
+    assert response.status_code == 200
+    kwargs = post_client_mock.list_posts.call_args.kwargs
+    assert kwargs["tags_any"] == ["python", "go"]
+    assert kwargs["tags_all"] == ["backend"]
+
+
+def test_list_posts_rejects_too_many_tags(client, auth_mock, post_client_mock):
+    query = "&".join(f"tags_all=tag-{i}" for i in range(11))
+
+    response = client.get(f"/posts/?{query}", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == 422
+    post_client_mock.list_posts.assert_not_called()
+
+
+def test_search_posts(client, auth_mock, post_client_mock):
+    post_client_mock.search_posts.return_value = post_pb2.SearchPostsResponse(
+        posts=[
+            post_pb2.Post(
+                id="post-id",
+                title="gRPC tips",
+                description="Streaming",
+                creator_id="test-user-id",
+                created_at=datetime(2026, 1, 1).isoformat(),
+                updated_at=datetime(2026, 1, 1).isoformat(),
+            )
+        ],
+        page_size=10,
+        next_page_token="next-token",
+    )
+
+    response = client.get(
+        "/posts/search?q=grpc%20tips&page_token=abc", headers={"Authorization": "Bearer test-token"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [post["id"] for post in data["posts"]] == ["post-id"]
+    assert data["next_page_token"] == "next-token"
+    post_client_mock.search_posts.assert_awaited_once_with(
+        query="grpc tips", page_size=10, user_id="test-user-id", page_token="abc"
+    )
+    post_client_mock.get_post.assert_not_called()
+
+
+def test_search_posts_requires_query(client, auth_mock, post_client_mock):
+    response = client.get("/posts/search", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == 422
+    post_client_mock.search_posts.assert_not_called()
+
+
+def test_search_posts_invalid_page_token(client, auth_mock, post_client_mock):
+    post_client_mock.search_posts.side_effect = MockRpcError(
+        grpc.StatusCode.INVALID_ARGUMENT, "Invalid page_token"
+    )
+
+    response = client.get(
+        "/posts/search?q=grpc&page_token=bad", headers={"Authorization": "Bearer test-token"}
+    )
+
+    assert response.status_code == 400
+    assert "Invalid page_token" in response.json()["detail"]
+
+
+def test_get_tag_counts_is_cached(client, auth_mock, post_client_mock):
+    post_client_mock.get_tag_counts.return_value = post_pb2.GetTagCountsResponse(
+        tags=[post_pb2.TagCount(tag="python", post_count=7), post_pb2.TagCount(tag="go", post_count=3)]
+    )
+
+    for _ in range(2):
+        response = client.get("/posts/tags?limit=5", headers={"Authorization": "Bearer test-token"})
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "tags": [{"tag": "python", "count": 7}, {"tag": "go", "count": 3}]
+        }
+
+    post_client_mock.get_tag_counts.assert_awaited_once_with(limit=5)
+    post_client_mock.get_post.assert_not_called()
+
+
 def test_view_post(client, auth_mock, post_client_mock):
     post_client_mock.view_post.return_value = MagicMock()
     
@@ -247,6 +388,7 @@ def test_get_comments(client, auth_mock, post_client_mock):
     mock_response.total = 2
     mock_response.page = 1
     mock_response.page_size = 10
+    mock_response.next_page_token = "next-token"
     
     post_client_mock.get_comments.return_value = mock_response
     
@@ -261,6 +403,7 @@ def test_get_comments(client, auth_mock, post_client_mock):
     assert len(data["comments"]) == 2
     assert data["page"] == 1
     assert data["page_size"] == 10
+    assert data["next_page_token"] == "next-token"
     
     assert data["comments"][0]["id"] == "comment-1"
     assert data["comments"][0]["post_id"] == "post-id"
@@ -269,6 +412,286 @@ def test_get_comments(client, auth_mock, post_client_mock):
     
     post_client_mock.get_comments.assert_called_once_with(
         post_id="post-id",
+        user_id="test-user-id",
         page=1,
-        page_size=10
+        page_size=10,
+        page_token="",
+    )
+
+
+def test_fetch_post_coalesces_concurrent_requests(post_client_mock):
+    mock_response = MagicMock()
+    mock_response.id = "post-id"
+
+    async def slow_get_post(post_id, user_id):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    post_client_mock.get_post.side_effect = slow_get_post
+    collapsed_before = get_post_flight.collapsed
+
+    async def run():
+        return await asyncio.gather(
+            *[fetch_post("post-id", f"user-{i}") for i in range(20)]
+        )
+
+    results = asyncio.run(run())
+
+    assert all(r is mock_response for r in results)
+    post_client_mock.get_post.assert_called_once_with(post_id="post-id", user_id=PUBLIC_VIEWER)
+    assert get_post_flight.collapsed - collapsed_before == 19
+
+
+def test_get_private_post_uses_creator_key(client, auth_mock, post_client_mock):
+    mock_response = MagicMock()
+    mock_response.id = "post-id"
+    mock_response.title = "Private Post"
+    mock_response.description = "Private Description"
+    mock_response.creator_id = "test-user-id"
+    mock_response.created_at = datetime.now().isoformat()
+    mock_response.updated_at = datetime.now().isoformat()
+    mock_response.is_private = True
+    mock_response.tags = []
+
+    post_client_mock.get_post.side_effect = [
+        MockRpcError(grpc.StatusCode.PERMISSION_DENIED, "Permission denied"),
+        mock_response,
+    ]
+
+    response = client.get("/posts/post-id", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == 200
+    assert response.json()["is_private"] == True
+    assert post_client_mock.get_post.call_count == 2
+    post_client_mock.get_post.assert_called_with(post_id="post-id", user_id="test-user-id")
+
+
+def test_batch_get_posts(client, auth_mock, post_client_mock):
+    posts = []
+    for post_id in ["post-2", "post-1"]:
+        mock_post = MagicMock()
+        mock_post.id = post_id
+        mock_post.title = f"Post {post_id}"
+        mock_post.description = "Description"
+        mock_post.creator_id = "creator-id"
+        mock_post.created_at = datetime.now().isoformat()
+        mock_post.updated_at = datetime.now().isoformat()
+        mock_post.is_private = False
+        mock_post.tags = []
+        posts.append(mock_post)
+
+    mock_response = MagicMock()
+    mock_response.posts = posts
+    post_client_mock.batch_get_posts.return_value = mock_response
+
+    response = client.post(
+        "/posts/batch-get",
+        json={"ids": ["post-2", "post-1"]},
+        headers={"Authorization": "Bearer test-token"},
+    )
+
+    assert response.status_code == 200
+    assert [post["id"] for post in response.json()["posts"]] == ["post-2", "post-1"]
+    post_client_mock.batch_get_posts.assert_called_once_with(
+        post_ids=["post-2", "post-1"], user_id="test-user-id"
+    )
+
+
+def test_batch_get_posts_too_many_ids(client, auth_mock, post_client_mock):
+    response = client.post(
+        "/posts/batch-get",
+        json={"ids": [f"post-{i}" for i in range(101)]},
+        headers={"Authorization": "Bearer test-token"},
+    )
+
+    assert response.status_code == 422
+    post_client_mock.batch_get_posts.assert_not_called()
+
+
+def test_record_views_batch(client, auth_mock, post_client_mock):
+    mock_response = MagicMock()
+    mock_response.recorded = 2
+    mock_response.rejected_post_ids = ["private-post"]
+    post_client_mock.record_views.return_value = mock_response
+
+    response = client.post(
+        "/posts/views:batch",
+        json={
+            "views": [
+                {"post_id": "post-1", "viewed_at": "2026-01-01T10:00:00"},
+                {"post_id": "post-2"},
+                {"post_id": "private-post"},
+            ]
+        },
+        headers={"Authorization": "Bearer test-token"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"recorded": 2, "rejected_post_ids": ["private-post"]}
+    post_client_mock.record_views.assert_called_once_with(
+        views=[("post-1", "2026-01-01T10:00:00"), ("post-2", ""), ("private-post", "")],
+        user_id="test-user-id",
+    )
+
+
+def test_record_views_batch_too_large(client, auth_mock, post_client_mock):
+    response = client.post(
+        "/posts/views:batch",
+        json={"views": [{"post_id": f"post-{i}"} for i in range(501)]},
+        headers={"Authorization": "Bearer test-token"},
+    )
+
+    assert response.status_code == 422
+    post_client_mock.record_views.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "code, status_code",
+    [(grpc.StatusCode.INVALID_ARGUMENT, 400), (grpc.StatusCode.PERMISSION_DENIED, 403)],
+)
+def test_record_views_batch_maps_grpc_errors(client, auth_mock, post_client_mock, code, status_code):
+    post_client_mock.record_views.side_effect = MockRpcError(code, "Invalid viewed_at")
+
+    response = client.post(
+        "/posts/views:batch",
+        json={"views": [{"post_id": "post-1", "viewed_at": "2999-01-01T10:00:00"}]},
+        headers={"Authorization": "Bearer test-token"},
+    )
+
+    assert response.status_code == status_code
+
+
+def make_post_response(post_id="post-id", updated_at="2024-01-01T00:00:00"):
+    mock_response = MagicMock()
+    mock_response.id = post_id
+    mock_response.title = "Test Post"
+    mock_response.description = "Test Description"
+    mock_response.creator_id = "test-user-id"
+    mock_response.created_at = "2024-01-01T00:00:00"
+    mock_response.updated_at = updated_at
+    mock_response.is_private = False
+    mock_response.tags = []
+    return mock_response
+
+
+def test_get_post_returns_etag(client, auth_mock, post_client_mock):
+    post_client_mock.get_post.return_value = make_post_response()
+
+    response = client.get("/posts/post-id", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_get_post_not_modified_skips_backend(client, auth_mock, post_client_mock):
+    post_client_mock.get_post.return_value = make_post_response()
+
+    etag = client.get(
+        "/posts/post-id", headers={"Authorization": "Bearer test-token"}
+    ).headers["ETag"]
+    response = client.get(
+        "/posts/post-id",
+        headers={"Authorization": "Bearer test-token", "If-None-Match": etag},
+    )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    assert post_client_mock.get_post.call_count == 1
+
+
+def test_private_post_validator_is_not_shared_with_other_viewers(client, post_client_mock):
+    from routes.post_routes import get_current_user
+
+    private_post = make_post_response()
+    private_post.is_private = True
+    post_client_mock.get_post.return_value = private_post
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": "test-user-id"}
+    try:
+        owner = client.get("/posts/post-id", headers={"Authorization": "Bearer test-token"})
+        assert owner.status_code == 200
+
+        post_client_mock.get_post.side_effect = MockRpcError(
+            grpc.StatusCode.PERMISSION_DENIED, "Permission denied"
+        )
+        app.dependency_overrides[get_current_user] = lambda: {"user_id": "other-user"}
+        for if_none_match in ("*", owner.headers["ETag"]):
+            response = client.get(
+                "/posts/post-id",
+                headers={"Authorization": "Bearer test-token", "If-None-Match": if_none_match},
+            )
+
+            assert response.status_code == 403
+            assert "ETag" not in response.headers
+    finally:
+        app.dependency_overrides = {}
+
+
+def test_get_post_stale_etag_returns_body(client, auth_mock, post_client_mock):
+    post_client_mock.get_post.return_value = make_post_response()
+
+    response = client.get(
+        "/posts/post-id",
+        headers={"Authorization": "Bearer test-token", "If-None-Match": '"outdated"'},
     )
+
+    assert response.status_code == 200
+    assert response.json()["id"] == "post-id"
+
+
+def test_update_post_invalidates_etag(client, auth_mock, post_client_mock):
+    post_client_mock.get_post.return_value = make_post_response()
+    etag = client.get(
+        "/posts/post-id", headers={"Authorization": "Bearer test-token"}
+    ).headers["ETag"]
+
+    post_client_mock.update_post.return_value = make_post_response(
+        updated_at="2024-01-02T00:00:00"
+    )
+    update = client.put(
+        "/posts/post-id",
+        json={"title": "Test Post", "description": "Test Description"},
+        headers={"Authorization": "Bearer test-token"},
+    )
+    assert update.status_code == 200
+    post_client_mock.get_post.return_value = make_post_response(
+        updated_at="2024-01-02T00:00:00"
+    )
+
+    response = client.get(
+        "/posts/post-id",
+        headers={"Authorization": "Bearer test-token", "If-None-Match": etag},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert post_client_mock.get_post.call_count == 2
+
+
+def test_get_comments_not_modified(client, auth_mock, post_client_mock):
+    comment = MagicMock()
+    comment.id = "comment-1"
+    comment.post_id = "post-id"
+    comment.user_id = "user-1"
+    comment.text = "First comment"
+    comment.created_at = datetime.now().isoformat()
+
+    mock_response = MagicMock()
+    mock_response.comments = [comment]
+    mock_response.total = 1
+    mock_response.page = 1
+    mock_response.page_size = 10
+    mock_response.next_page_token = ""
+    post_client_mock.get_comments.return_value = mock_response
+
+    etag = client.get(
+        "/posts/post-id/comments", headers={"Authorization": "Bearer test-token"}
+    ).headers["ETag"]
+    response = client.get(
+        "/posts/post-id/comments",
+        headers={"Authorization": "Bearer test-token", "If-None-Match": etag},
+    )
+
+    assert response.status_code == 304
+    assert post_client_mock.get_comments.call_count == 1
@@ -0,0 +1,75 @@
+import json
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from proto import post_pb2
+from routes.post_routes import PaginatedResponse, GetCommentsResponse
+from serialization.fast_json import FastJSONResponse, posts_page_to_dict, comments_page_to_dict
+
+
+def test_posts_page_matches_response_model():
+    now = datetime.now().isoformat()
+    response = post_pb2.ListPostsResponse(
+        posts=[
+            post_pb2.Post(
+                id="post-id",
+                title="Тестовый пост",
+                description="Test Description",
+                creator_id="test-user-id",
+                created_at=now,
+                updated_at=now,
+                is_private=True,
+                tags=["test", "api"],
+            )
+        ],
+        total=1,
+        page=1,
+        page_size=10,
+        next_page_token="token",
+    )
+
+    body = FastJSONResponse(posts_page_to_dict(response)).body
+    expected = jsonable_encoder(PaginatedResponse(**posts_page_to_dict(response)))
+
+    assert json.loads(body) == expected
+
+
+def test_posts_page_without_total():
+    response = post_pb2.ListPostsResponse(page=1, page_size=10)
+
+    data = posts_page_to_dict(response)
+
+    assert data["total"] is None
+    assert data["next_page_token"] is None
+
+
+def test_comments_page_matches_response_model():
+    now = datetime.now().isoformat()
+    response = post_pb2.GetCommentsResponse(
+        comments=[
+            post_pb2.Comment(
+                id="comment-1",
+                post_id="post-id",
+                user_id="user-1",
+                text="First comment",
+                created_at=now,
+            )
+        ],
+        total=1,
+        page=1,
+        page_size=10,
+    )
+
+    body = FastJSONResponse(comments_page_to_dict(response)).body
+    expected = jsonable_encoder(GetCommentsResponse(**comments_page_to_dict(response)))
+
+    assert json.loads(body) == expected
+
+
+def test_fast_json_response_headers():
+    response = FastJSONResponse({"posts": []}, headers={"ETag": '"abc"'})
+
+    assert response.media_type == "application/json"
+    assert response.headers["etag"] == '"abc"'
+    assert response.body == b'{"posts":[]}'
@@ -1,12 +1,13 @@
 import grpc
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, AsyncMock, patch
 from datetime import datetime, timedelta
 from fastapi.testclient import TestClient
 from fastapi import status
 
 from main import app
-from routes.stats_routes import stats_client
+from grpc_client.circuit_breaker import CircuitOpen
+from routes.stats_routes import stats_client, top_cache, fallback_cache
 
 client = TestClient(app)
 
@@ -20,8 +21,12 @@ def auth_mock():
 
 @pytest.fixture
 def stats_client_mock():
-    with patch("routes.stats_routes.stats_client") as mock:
+    top_cache.clear()
+    fallback_cache.clear()
+    with patch("routes.stats_routes.stats_client", new_callable=AsyncMock) as mock:
         yield mock
+    top_cache.clear()
+    fallback_cache.clear()
     
 class MockRpcError(grpc.RpcError):
     def __init__(self, code: grpc.StatusCode, details: str = ""):
@@ -172,4 +177,40 @@ def test_get_top_users_max_limit(auth_mock, stats_client_mock):
 
 def test_unauthorized_access():
     response = client.get("/stats/posts/post123")
-    assert response.status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_get_top_posts_served_from_cache(auth_mock, stats_client_mock):
+    grpc_response = MagicMock()
+    grpc_response.posts = [MagicMock(post_id="post1", title="Post 1", count=1000)]
+    stats_client_mock.get_top_posts.return_value = grpc_response
+
+    for _ in range(3):
+        response = client.get(
+            "/stats/top/posts?metric=views&limit=1",
+            headers={"Authorization": "Bearer test-token"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    stats_client_mock.get_top_posts.assert_called_once_with(metric_type="views", limit=1)
+
+def test_get_post_stats_falls_back_when_circuit_open(auth_mock, stats_client_mock):
+    grpc_response = MagicMock()
+    grpc_response.views = 100
+    grpc_response.likes = 50
+    grpc_response.comments = 30
+    stats_client_mock.get_post_stats.return_value = grpc_response
+
+    client.get("/stats/posts/post123", headers={"Authorization": "Bearer test-token"})
+    stats_client_mock.get_post_stats.side_effect = CircuitOpen("stats-service:50053", 3)
+    response = client.get("/stats/posts/post123", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["views"] == 100
+
+def test_get_post_stats_circuit_open_without_fallback(auth_mock, stats_client_mock):
+    stats_client_mock.get_post_stats.side_effect = CircuitOpen("stats-service:50053", 3)
+
+    response = client.get("/stats/posts/post123", headers={"Authorization": "Bearer test-token"})
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "3"
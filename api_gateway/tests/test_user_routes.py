@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from fastapi.testclient import TestClient
 
 from main import app
@@ -12,7 +12,7 @@ def client():
 
 @pytest.fixture
 def user_client_mock():
-    with patch("routes.user_routes.user_client") as mock:
+    with patch("routes.user_routes.user_client", new_callable=AsyncMock) as mock:
         yield mock
 
 
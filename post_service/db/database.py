@@ -1,9 +1,13 @@
 import os
 import time
+import asyncio
 import logging
-from sqlalchemy import create_engine
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from dotenv import load_dotenv
 
 logging.basicConfig(level=logging.INFO)
@@ -13,35 +17,138 @@ load_dotenv()
 
 Base = declarative_base()
 
-DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/postservice")
+
+def async_database_url(url):
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    return url
+
+
+DATABASE_URL = async_database_url(
+    os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/postservice")
+)
+STATEMENT_TIMEOUT_MARGIN_MS = int(os.getenv("STATEMENT_TIMEOUT_MARGIN_MS", "20"))
+MAX_DEADLINE_SECONDS = float(os.getenv("MAX_DEADLINE_SECONDS", "86400"))
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", os.getenv("GRPC_MAX_CONCURRENT_RPCS", "20")))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "0"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check out a database connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Connection checkouts that gave up after the pool timeout",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Database connections currently checked out",
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_capacity_connections",
+    "Maximum database connections the pool will open",
+)
 
 engine = None
 SessionLocal = None
 
 
-def init_db(max_retries=5, retry_delay=2):
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+DB_POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout() if engine is not None else 0)
+DB_POOL_CAPACITY.set(DB_POOL_SIZE + max(DB_MAX_OVERFLOW, 0))
+
+
+def create_db_engine():
+    return create_async_engine(
+        DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+
+async def init_db(max_retries=8, retry_delay=0.5, max_retry_delay=10):
     global engine, SessionLocal
     for attempt in range(max_retries):
         try:
             logger.info(f"Connecting DB {attempt+1}")
-            engine = create_engine(DATABASE_URL)
-            engine.connect()
-            SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-            Base.metadata.create_all(bind=engine)
+            engine = create_db_engine()
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            SessionLocal = sessionmaker(
+                engine,
+                class_=AsyncSession,
+                autocommit=False,
+                autoflush=False,
+                expire_on_commit=False,
+            )
             logger.info("DB connected")
             return
         except Exception as e:
             logger.warning(f"DB error {attempt+1}: {e}")
+            if engine is not None:
+                await engine.dispose()
             if attempt < max_retries - 1:
-                logger.info(f"Retry {retry_delay} sec")
-                time.sleep(retry_delay)
+                delay = min(retry_delay * 2 ** attempt, max_retry_delay)
+                logger.info(f"Retry {delay} sec")
+                await asyncio.sleep(delay)
             else:
                 logger.error("DB failed")
                 raise
 
 
-def get_db():
+async def close_db():
+    global engine, SessionLocal
+    if engine is not None:
+        await engine.dispose()
+        engine = None
+        SessionLocal = None
+
+
+def statement_timeout_ms(time_remaining):
+    if time_remaining is None or time_remaining > MAX_DEADLINE_SECONDS:
+        return None
+    return max(int(time_remaining * 1000) - STATEMENT_TIMEOUT_MARGIN_MS, 1)
+
+
+def statement_timeout_listener(deadline):
+    def set_statement_timeout(session, transaction, connection):
+        connection.execute(
+            text("SELECT set_config('statement_timeout', :timeout, true)"),
+            {"timeout": str(statement_timeout_ms(deadline - time.monotonic()))},
+        )
+
+    return set_statement_timeout
+
+
+async def get_db(time_remaining=None):
     global SessionLocal
     if not SessionLocal:
-        init_db()
-    return SessionLocal()
+        await init_db()
+    db = SessionLocal()
+    if statement_timeout_ms(time_remaining) is not None:
+        event.listen(
+            db.sync_session,
+            "after_begin",
+            statement_timeout_listener(time.monotonic() + time_remaining),
+        )
+    return db
@@ -0,0 +1,41 @@
+import os
+import time
+import logging
+from alembic import command
+from alembic.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ALEMBIC_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def alembic_config(database_url=None):
+    config = Config(ALEMBIC_CONFIG)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_CONFIG), "migrations"))
+    if database_url:
+        config.set_main_option("sqlalchemy.url", database_url)
+    return config
+
+
+def run_migrations(revision="head", max_retries=8, retry_delay=0.5, max_retry_delay=10):
+    config = alembic_config()
+    for attempt in range(max_retries):
+        try:
+            logger.info(f"Migrating DB to {revision} {attempt+1}")
+            command.upgrade(config, revision)
+            logger.info("DB migrated")
+            return
+        except Exception as e:
+            logger.warning(f"DB error {attempt+1}: {e}")
+            if attempt < max_retries - 1:
+                delay = min(retry_delay * 2 ** attempt, max_retry_delay)
+                logger.info(f"Retry {delay} sec")
+                time.sleep(delay)
+            else:
+                logger.error("DB migration failed")
+                raise
+
+
+if __name__ == "__main__":
+    run_migrations()
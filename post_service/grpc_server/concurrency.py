@@ -0,0 +1,32 @@
+import asyncio
+import grpc
+
+from grpc_server.readiness import HEALTH_SERVICE_PREFIX
+
+
+class ConcurrencyInterceptor(grpc.aio.ServerInterceptor):
+    def __init__(self, limit):
+        self.slots = asyncio.Semaphore(limit)
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if (
+            handler is None
+            or handler.unary_unary is None
+            or handler_call_details.method.startswith(HEALTH_SERVICE_PREFIX)
+        ):
+            return handler
+
+        behavior = handler.unary_unary
+
+        async def limited(request, context):
+            if self.slots.locked():
+                await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Too many concurrent RPCs")
+            async with self.slots:
+                return await behavior(request, context)
+
+        return grpc.unary_unary_rpc_method_handler(
+            limited,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
@@ -0,0 +1,30 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_page_token(*values):
+    payload = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_page_token(token):
+    padded = token + "=" * (-len(token) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    if not isinstance(values, list):
+        raise ValueError("Malformed page token")
+    return values
+
+
+def decode_time_cursor(token):
+    created_at, row_id = decode_page_token(token)
+    if not isinstance(row_id, str):
+        raise ValueError("Malformed page token")
+    return datetime.fromisoformat(created_at), row_id
+
+
+def decode_rank_cursor(token):
+    rank, created_at, row_id = decode_page_token(token)
+    if isinstance(rank, bool) or not isinstance(rank, (int, float)) or not isinstance(row_id, str):
+        raise ValueError("Malformed page token")
+    return float(rank), datetime.fromisoformat(created_at), row_id
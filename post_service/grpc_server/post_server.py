@@ -1,22 +1,93 @@
+import asyncio
 import logging
 import uuid
 import grpc
-from concurrent import futures
-from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, or_, desc, func, insert, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from proto import post_pb2, post_pb2_grpc
-from models.post_model import Post, PostView, PostLike, Comment
+from models.post_model import Post, PostView, PostLike, Comment, TagCount, SEARCH_CONFIG
 from db.database import get_db
+from grpc_server.page_tokens import encode_page_token, decode_rank_cursor, decode_time_cursor
 from broker.producer import get_kafka_producer, POST_VIEW_TOPIC, POST_LIKE_TOPIC, POST_COMMENT_TOPIC
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MAX_BATCH_GET_SIZE = 100
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+MAX_RECORD_VIEWS_SIZE = 500
+MAX_VIEW_AGE = timedelta(days=7)
+MAX_VIEW_CLOCK_SKEW = timedelta(minutes=5)
+MAX_TAG_FILTERS = 10
+DEFAULT_TAG_COUNTS_LIMIT = 20
+MAX_TAG_COUNTS_LIMIT = 100
+MAX_SEARCH_QUERY_LENGTH = 256
+QUERY_CANCELED = "57014"
+
+
+def error_code(e):
+    if getattr(getattr(e, "orig", None), "pgcode", None) == QUERY_CANCELED:
+        return grpc.StatusCode.DEADLINE_EXCEEDED
+    return grpc.StatusCode.INTERNAL
+
+
+async def publish(topic, event):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: get_kafka_producer().send_message(topic, event))
+
+
+async def publish_batch(topic, events):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: get_kafka_producer().send_messages(topic, events))
+
+
+def parse_viewed_at(value, now):
+    if not value:
+        return now
+    viewed_at = datetime.fromisoformat(value)
+    if viewed_at.tzinfo is not None:
+        viewed_at = viewed_at.astimezone(timezone.utc).replace(tzinfo=None)
+    if viewed_at > now + MAX_VIEW_CLOCK_SKEW:
+        raise ValueError(f"{value} is in the future")
+    if viewed_at < now - MAX_VIEW_AGE:
+        raise ValueError(f"{value} is older than {MAX_VIEW_AGE.days} days")
+    return viewed_at
+
+
+def visible_to(user_id):
+    return or_(
+        Post.is_private == False,
+        and_(Post.is_private == True, Post.creator_id == user_id),
+    )
+
+
+def counted_tags(tags, is_private):
+    if is_private:
+        return set()
+    return set(tags or [])
+
+
+async def adjust_tag_counts(db, old_tags, new_tags):
+    deltas = Counter(new_tags - old_tags)
+    deltas.subtract(old_tags - new_tags)
+    rows = [{"tag": tag, "post_count": delta} for tag, delta in sorted(deltas.items()) if delta]
+    if not rows:
+        return
+    statement = pg_insert(TagCount).values(rows)
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[TagCount.tag],
+            set_={"post_count": TagCount.post_count + statement.excluded.post_count},
+        )
+    )
+
 
 class PostServicer(post_pb2_grpc.PostServiceServicer):
-    def CreatePost(self, request, context):
-        db = get_db()
+    async def CreatePost(self, request, context):
+        db = await get_db(context.time_remaining())
         try:
             post_id = str(uuid.uuid4())
             now = datetime.now()
@@ -35,8 +106,9 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
             )
 
             db.add(post)
-            db.commit()
-            db.refresh(post)
+            await adjust_tag_counts(db, set(), counted_tags(post.tags, post.is_private))
+            await db.commit()
+            await db.refresh(post)
             
             logger.info(f"Post created successfully: {post_id}")
 
@@ -51,20 +123,20 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 tags=post.tags,
             )
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Create post error: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Error creating post: {str(e)}")
             return post_pb2.Post()
         finally:
-            db.close()
+            await db.close()
 
-    def UpdatePost(self, request, context):
-        db = get_db()
+    async def UpdatePost(self, request, context):
+        db = await get_db(context.time_remaining())
         try:
             logger.info(f"Update post: {request.id}")
 
-            post = db.query(Post).filter(Post.id == request.id).first()
+            post = await db.get(Post, request.id, with_for_update=True)
 
             if not post:
                 logger.warning(f"Update post: {request.id} not found")
@@ -78,14 +150,18 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 context.set_details("Permission denied")
                 return post_pb2.Post()
 
+            old_tags = counted_tags(post.tags, post.is_private)
+
             post.title = request.title
             post.description = request.description
             post.is_private = request.is_private
             post.tags = list(request.tags)
             post.updated_at = datetime.utcnow()
 
-            db.commit()
-            db.refresh(post)
+            await adjust_tag_counts(db, old_tags, counted_tags(post.tags, post.is_private))
+
+            await db.commit()
+            await db.refresh(post)
             
             logger.info(f"Post updated successfully: {request.id}")
 
@@ -100,20 +176,20 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 tags=post.tags,
             )
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Update post error: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Error updating post: {str(e)}")
             return post_pb2.Post()
         finally:
-            db.close()
+            await db.close()
 
-    def DeletePost(self, request, context):
-        db = get_db()
+    async def DeletePost(self, request, context):
+        db = await get_db(context.time_remaining())
         try:
             logger.info(f"Delete post: {request.id}")
             
-            post = db.query(Post).filter(Post.id == request.id).first()
+            post = await db.get(Post, request.id, with_for_update=True)
 
             if not post:
                 logger.warning(f"Delete post: {request.id} not found")
@@ -127,27 +203,28 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 context.set_details("Permission denied")
                 return post_pb2.DeleteResponse(success=False)
 
-            db.delete(post)
-            db.commit()
+            await adjust_tag_counts(db, counted_tags(post.tags, post.is_private), set())
+            await db.delete(post)
+            await db.commit()
             
             logger.info(f"Post deleted successfully: {request.id}")
 
             return post_pb2.DeleteResponse(success=True)
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Delete post error: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Error deleting post: {str(e)}")
             return post_pb2.DeleteResponse(success=False)
         finally:
-            db.close()
+            await db.close()
 
-    def GetPost(self, request, context):
-        db = get_db()
+    async def GetPost(self, request, context):
+        db = await get_db(context.time_remaining())
         try:
             logger.info(f"Get post: {request.id}")
             
-            post = db.query(Post).filter(Post.id == request.id).first()
+            post = await db.get(Post, request.id)
 
             if not post:
                 logger.warning(f"Get post: {request.id} not found")
@@ -175,33 +252,61 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
             )
         except Exception as e:
             logger.error(f"Get post error: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Error getting post: {str(e)}")
             return post_pb2.Post()
         finally:
-            db.close()
+            await db.close()
 
-    def ListPosts(self, request, context):
-        db = get_db()
+    async def ListPosts(self, request, context):
+        page_size = max(1, min(MAX_PAGE_SIZE, request.page_size or DEFAULT_PAGE_SIZE))
         try:
-            logger.info(f"List posts: page={request.page}, page_size={request.page_size}, user_id={request.user_id}")
-            
-            query = db.query(Post).filter(
-                or_(
-                    Post.is_private == False,
-                    and_(Post.is_private == True, Post.creator_id == request.user_id),
-                )
-            )
+            cursor = decode_time_cursor(request.page_token) if request.page_token else None
+        except (ValueError, TypeError) as e:
+            logger.warning(f"List posts: invalid page token: {str(e)}")
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Invalid page_token")
+            return post_pb2.ListPostsResponse()
 
-            total = query.count()
+        tags_any = list(dict.fromkeys(request.tags_any))
+        tags_all = list(dict.fromkeys(request.tags_all))
+        if len(tags_any) > MAX_TAG_FILTERS or len(tags_all) > MAX_TAG_FILTERS:
+            logger.warning(f"List posts: tag filters exceed limit {MAX_TAG_FILTERS}")
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"At most {MAX_TAG_FILTERS} tags per filter")
+            return post_pb2.ListPostsResponse()
 
-            posts = (
-                query.limit(request.page_size).offset((request.page - 1) * request.page_size).all()
+        db = await get_db(context.time_remaining())
+        try:
+            logger.info(f"List posts: page={request.page}, page_size={page_size}, cursor={cursor is not None}, user_id={request.user_id}, tags_any={tags_any}, tags_all={tags_all}")
+
+            filters = [visible_to(request.user_id)]
+            if tags_any:
+                filters.append(Post.tags.overlap(tags_any))
+            if tags_all:
+                filters.append(Post.tags.contains(tags_all))
+
+            query = (
+                select(Post)
+                .where(*filters)
+                .order_by(desc(Post.created_at), desc(Post.id))
+                .limit(page_size + 1)
             )
+            if cursor is not None:
+                query = query.where(tuple_(Post.created_at, Post.id) < cursor)
+            elif request.page > 1:
+                query = query.offset((request.page - 1) * page_size)
 
-            response = post_pb2.ListPostsResponse(
-                total=total, page=request.page, page_size=request.page_size
-            )
+            posts = (await db.execute(query)).scalars().all()
+
+            response = post_pb2.ListPostsResponse(page=max(1, request.page), page_size=page_size)
+
+            if len(posts) > page_size:
+                posts = posts[:page_size]
+                response.next_page_token = encode_page_token(posts[-1].created_at, posts[-1].id)
+
+            if request.include_total:
+                response.total = await db.scalar(select(func.count()).select_from(Post).where(*filters))
 
             for post in posts:
                 response.posts.append(
@@ -216,24 +321,169 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                         tags=post.tags,
                     )
                 )
-            
-            logger.info(f"Retrieved {len(posts)} posts out of {total}")
+
+            logger.info(f"Retrieved {len(posts)} posts, more={bool(response.next_page_token)}")
 
             return response
         except Exception as e:
             logger.error(f"List posts error: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Error getting post list: {str(e)}")
             return post_pb2.ListPostsResponse()
         finally:
-            db.close()
+            await db.close()
+
+    async def SearchPosts(self, request, context):
+        query_text = request.query.strip()
+        if not query_text or len(query_text) > MAX_SEARCH_QUERY_LENGTH:
+            logger.warning(f"Search posts: invalid query length {len(query_text)}")
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Query must be 1 to {MAX_SEARCH_QUERY_LENGTH} characters")
+            return post_pb2.SearchPostsResponse()
+
+        page_size = max(1, min(MAX_PAGE_SIZE, request.page_size or DEFAULT_PAGE_SIZE))
+        try:
+            cursor = decode_rank_cursor(request.page_token) if request.page_token else None
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Search posts: invalid page token: {str(e)}")
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Invalid page_token")
+            return post_pb2.SearchPostsResponse()
+
+        db = await get_db(context.time_remaining())
+        try:
+            logger.info(f"Search posts: page_size={page_size}, cursor={cursor is not None}, user_id={request.user_id}")
+
+            ts_query = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), query_text)
+            rank = func.ts_rank(Post.search_vector, ts_query)
+
+            query = (
+                select(Post, rank.label("rank"))
+                .where(visible_to(request.user_id), Post.search_vector.op("@@")(ts_query))
+                .order_by(desc(rank), desc(Post.created_at), desc(Post.id))
+                .limit(page_size + 1)
+            )
+            if cursor is not None:
+                query = query.where(tuple_(rank, Post.created_at, Post.id) < cursor)
+
+            rows = (await db.execute(query)).all()
+
+            response = post_pb2.SearchPostsResponse(page_size=page_size)
+
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                last, last_rank = rows[-1]
+                response.next_page_token = encode_page_token(last_rank, last.created_at, last.id)
+
+            for post, _ in rows:
+                response.posts.append(
+                    post_pb2.Post(
+                        id=post.id,
+                        title=post.title,
+                        description=post.description,
+                        creator_id=post.creator_id,
+                        created_at=post.created_at.isoformat(),
+                        updated_at=post.updated_at.isoformat(),
+                        is_private=post.is_private,
+                        tags=post.tags,
+                    )
+                )
+
+            logger.info(f"Found {len(rows)} posts, more={bool(response.next_page_token)}")
+
+            return response
+        except Exception as e:
+            logger.error(f"Search posts error: {str(e)}")
+            context.set_code(error_code(e))
+            context.set_details(f"Error searching posts: {str(e)}")
+            return post_pb2.SearchPostsResponse()
+        finally:
+            await db.close()
+
+    async def BatchGetPosts(self, request, context):
+        if len(request.ids) > MAX_BATCH_GET_SIZE:
+            logger.warning(f"Batch get posts: {len(request.ids)} ids exceeds limit {MAX_BATCH_GET_SIZE}")
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"At most {MAX_BATCH_GET_SIZE} ids per request")
+            return post_pb2.BatchGetPostsResponse()
+
+        db = await get_db(context.time_remaining())
+        try:
+            ids = list(dict.fromkeys(request.ids))
+            logger.info(f"Batch get posts: {len(ids)} ids, user_id={request.user_id}")
+
+            if not ids:
+                return post_pb2.BatchGetPostsResponse()
+
+            posts = (await db.execute(select(Post).where(Post.id.in_(ids)))).scalars().all()
+
+            visible = {
+                post.id: post
+                for post in posts
+                if not post.is_private or post.creator_id == request.user_id
+            }
+
+            response = post_pb2.BatchGetPostsResponse()
+            for post_id in ids:
+                post = visible.get(post_id)
+                if post is None:
+                    continue
+                response.posts.append(
+                    post_pb2.Post(
+                        id=post.id,
+                        title=post.title,
+                        description=post.description,
+                        creator_id=post.creator_id,
+                        created_at=post.created_at.isoformat(),
+                        updated_at=post.updated_at.isoformat(),
+                        is_private=post.is_private,
+                        tags=post.tags,
+                    )
+                )
+
+            logger.info(f"Retrieved {len(response.posts)} of {len(ids)} requested posts")
+
+            return response
+        except Exception as e:
+            logger.error(f"Batch get posts error: {str(e)}")
+            context.set_code(error_code(e))
+            context.set_details(f"Error getting posts: {str(e)}")
+            return post_pb2.BatchGetPostsResponse()
+        finally:
+            await db.close()
+
+    async def GetTagCounts(self, request, context):
+        limit = max(1, min(MAX_TAG_COUNTS_LIMIT, request.limit or DEFAULT_TAG_COUNTS_LIMIT))
+        db = await get_db(context.time_remaining())
+        try:
+            logger.info(f"Get tag counts: limit={limit}")
+
+            counts = (
+                await db.execute(
+                    select(TagCount)
+                    .where(TagCount.post_count > 0)
+                    .order_by(desc(TagCount.post_count), TagCount.tag)
+                    .limit(limit)
+                )
+            ).scalars().all()
+
+            return post_pb2.GetTagCountsResponse(
+                tags=[post_pb2.TagCount(tag=count.tag, post_count=count.post_count) for count in counts]
+            )
+        except Exception as e:
+            logger.error(f"Get tag counts error: {str(e)}")
+            context.set_code(error_code(e))
+            context.set_details(f"Error getting tag counts: {str(e)}")
+            return post_pb2.GetTagCountsResponse()
+        finally:
+            await db.close()
 
-    def ViewPost(self, request, context):
-        db = get_db()
+    async def ViewPost(self, request, context):
+        db = await get_db(context.time_remaining())
         try:
             logger.info(f"View post: {request.post_id} by user {request.user_id}")
             
-            post = db.query(Post).filter(Post.id == request.post_id).first()
+            post = await db.get(Post, request.post_id)
             if not post:
                 logger.warning(f"View post: {request.post_id} not found")
                 context.set_code(grpc.StatusCode.NOT_FOUND)
@@ -251,10 +501,10 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 id=view_id,
                 post_id=request.post_id,
                 user_id=request.user_id,
-                viewed_at=datetime.now()
+                viewed_at=datetime.utcnow()
             )
             db.add(post_view)
-            db.commit()
+            await db.commit()
             
             event = {
                 "view_id": view_id,
@@ -263,7 +513,7 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 "viewed_at": post_view.viewed_at.isoformat()
             }
             
-            sent = get_kafka_producer().send_message(POST_VIEW_TOPIC, event)
+            sent = await publish(POST_VIEW_TOPIC, event)
             if sent:
                 logger.info(f"Post view event sent: post_id={request.post_id}, user_id={request.user_id}")
             else:
@@ -273,20 +523,100 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
             
             return post_pb2.ViewPostResponse()
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"View post error: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Internal server error: {str(e)}")
             return post_pb2.ViewPostResponse()
         finally:
-            db.close()
+            await db.close()
+    
+    async def RecordViews(self, request, context):
+        if len(request.views) > MAX_RECORD_VIEWS_SIZE:
+            logger.warning(f"Record views: {len(request.views)} views exceeds limit {MAX_RECORD_VIEWS_SIZE}")
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"At most {MAX_RECORD_VIEWS_SIZE} views per request")
+            return post_pb2.RecordViewsResponse()
+
+        try:
+            now = datetime.utcnow()
+            views = [(view.post_id, parse_viewed_at(view.viewed_at, now)) for view in request.views]
+        except ValueError as e:
+            logger.warning(f"Record views: invalid viewed_at: {str(e)}")
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Invalid viewed_at: {str(e)}")
+            return post_pb2.RecordViewsResponse()
+
+        if not views:
+            return post_pb2.RecordViewsResponse()
+
+        db = await get_db(context.time_remaining())
+        try:
+            ids = list(dict.fromkeys(post_id for post_id, _ in views))
+            logger.info(f"Record views: {len(views)} views of {len(ids)} posts by user {request.user_id}")
+
+            visible = {
+                post_id
+                for (post_id,) in (
+                    await db.execute(
+                        select(Post.id).where(
+                            Post.id.in_(ids),
+                            or_(Post.is_private == False, Post.creator_id == request.user_id),
+                        )
+                    )
+                ).all()
+            }
+
+            rows = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "post_id": post_id,
+                    "user_id": request.user_id,
+                    "viewed_at": viewed_at,
+                }
+                for post_id, viewed_at in views
+                if post_id in visible
+            ]
+
+            if rows:
+                await db.execute(insert(PostView).values(rows))
+                await db.commit()
+
+                events = [
+                    {
+                        "view_id": row["id"],
+                        "post_id": row["post_id"],
+                        "user_id": row["user_id"],
+                        "viewed_at": row["viewed_at"].isoformat(),
+                    }
+                    for row in rows
+                ]
+
+                sent = await publish_batch(POST_VIEW_TOPIC, events)
+                if sent:
+                    logger.info(f"{len(events)} post view events sent for user {request.user_id}")
+                else:
+                    logger.warning(f"Failed to send {len(events)} post view events to Kafka")
+
+            rejected = [post_id for post_id in ids if post_id not in visible]
+            logger.info(f"Recorded {len(rows)} views, rejected {len(rejected)} posts")
+
+            return post_pb2.RecordViewsResponse(recorded=len(rows), rejected_post_ids=rejected)
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Record views error: {str(e)}")
+            context.set_code(error_code(e))
+            context.set_details(f"Internal server error: {str(e)}")
+            return post_pb2.RecordViewsResponse()
+        finally:
+            await db.close()
     
-    def LikePost(self, request, context):
-        db = get_db()
+    async def LikePost(self, request, context):
+        db = await get_db(context.time_remaining())
         try:
             logger.info(f"Like post: {request.post_id} by user {request.user_id}")
             
-            post = db.query(Post).filter(Post.id == request.post_id).first()
+            post = await db.get(Post, request.post_id)
             if not post:
                 logger.warning(f"Like post: {request.post_id} not found")
                 context.set_code(grpc.StatusCode.NOT_FOUND)
@@ -299,10 +629,14 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 context.set_details("You don't have permission to like this post")
                 return post_pb2.LikePostResponse()
             
-            existing_like = db.query(PostLike).filter(
-                PostLike.post_id == request.post_id,
-                PostLike.user_id == request.user_id
-            ).first()
+            existing_like = (
+                await db.execute(
+                    select(PostLike).where(
+                        PostLike.post_id == request.post_id,
+                        PostLike.user_id == request.user_id
+                    )
+                )
+            ).scalars().first()
             
             if existing_like:
                 logger.warning(f"Like post: already liked post {request.post_id} by user {request.user_id}")
@@ -318,7 +652,7 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 liked_at=datetime.now()
             )
             db.add(post_like)
-            db.commit()
+            await db.commit()
 
             event = {
                 "like_id": like_id,
@@ -327,7 +661,7 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 "liked_at": post_like.liked_at.isoformat()
             }
             
-            sent = get_kafka_producer().send_message(POST_LIKE_TOPIC, event)
+            sent = await publish(POST_LIKE_TOPIC, event)
             if sent:
                 logger.info(f"Post like event sent: post_id={request.post_id}, user_id={request.user_id}")
             else:
@@ -337,20 +671,20 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
             
             return post_pb2.LikePostResponse()
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Like post error: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Internal server error: {str(e)}")
             return post_pb2.LikePostResponse()
         finally:
-            db.close()
+            await db.close()
     
-    def AddComment(self, request, context):
-        db = get_db()
+    async def AddComment(self, request, context):
+        db = await get_db(context.time_remaining())
         try:
             logger.info(f"Add comment to post: {request.post_id} by user {request.user_id}")
             
-            post = db.query(Post).filter(Post.id == request.post_id).first()
+            post = await db.get(Post, request.post_id)
             if not post:
                 logger.warning(f"Add comment: post {request.post_id} not found")
                 context.set_code(grpc.StatusCode.NOT_FOUND)
@@ -374,7 +708,13 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 created_at=created_at
             )
             db.add(comment)
-            db.commit()
+            await db.execute(
+                update(Post)
+                .where(Post.id == request.post_id)
+                .values(comments_count=Post.comments_count + 1, updated_at=Post.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
 
             event = {
                 "comment_id": comment_id,
@@ -384,7 +724,7 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 "created_at": created_at.isoformat(),
             }
             
-            sent = get_kafka_producer().send_message(POST_COMMENT_TOPIC, event)
+            sent = await publish(POST_COMMENT_TOPIC, event)
             if sent:
                 logger.info(f"Post comment event sent: post_id={request.post_id}, user_id={request.user_id}")
             else:
@@ -400,20 +740,30 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 created_at=created_at.isoformat()
             )
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Add comment error: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Internal server error: {str(e)}")
             return post_pb2.Comment()
         finally:
-            db.close()
+            await db.close()
     
-    def GetComments(self, request, context):
-        db = get_db()
+    async def GetComments(self, request, context):
+        page = max(1, request.page)
+        page_size = max(1, min(MAX_PAGE_SIZE, request.page_size or DEFAULT_PAGE_SIZE))
+        try:
+            cursor = decode_time_cursor(request.page_token) if request.page_token else None
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Get comments: invalid page token: {str(e)}")
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Invalid page_token")
+            return post_pb2.GetCommentsResponse()
+
+        db = await get_db(context.time_remaining())
         try:
-            logger.info(f"Get comments for post: {request.post_id}, page={request.page}, page_size={request.page_size}")
+            logger.info(f"Get comments for post: {request.post_id}, page={page}, page_size={page_size}, cursor={cursor is not None}")
 
-            post = db.query(Post).filter(Post.id == request.post_id).first()
+            post = await db.get(Post, request.post_id)
             if not post:
                 logger.warning(f"Get comments: post {request.post_id} not found")
                 context.set_code(grpc.StatusCode.NOT_FOUND)
@@ -425,23 +775,24 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 context.set_code(grpc.StatusCode.PERMISSION_DENIED)
                 context.set_details("You don't have permission to view comments of this post")
                 return post_pb2.GetCommentsResponse()
-            
-            total_comments = db.query(Comment).filter(
-                Comment.post_id == request.post_id
-            ).count()
-            
-            page = max(1, request.page)
-            page_size = max(1, min(100, request.page_size))
-            
-            comments = db.query(Comment).filter(
-                Comment.post_id == request.post_id
-            ).order_by(
-                desc(Comment.created_at)
-            ).offset(
-                (page - 1) * page_size
-            ).limit(
-                page_size
-            ).all()
+
+            query = (
+                select(Comment)
+                .where(Comment.post_id == request.post_id)
+                .order_by(desc(Comment.created_at), desc(Comment.id))
+                .limit(page_size + 1)
+            )
+            if cursor is not None:
+                query = query.where(tuple_(Comment.created_at, Comment.id) < cursor)
+            elif page > 1:
+                query = query.offset((page - 1) * page_size)
+
+            comments = (await db.execute(query)).scalars().all()
+
+            next_page_token = ""
+            if len(comments) > page_size:
+                comments = comments[:page_size]
+                next_page_token = encode_page_token(comments[-1].created_at, comments[-1].id)
             
             comment_list = []
             for c in comments:
@@ -454,18 +805,19 @@ class PostServicer(post_pb2_grpc.PostServiceServicer):
                 )
                 comment_list.append(comment_pb)
             
-            logger.info(f"Retrieved {len(comments)} comments out of {total_comments} for post {request.post_id}")
+            logger.info(f"Retrieved {len(comments)} comments out of {post.comments_count} for post {request.post_id}")
             
             return post_pb2.GetCommentsResponse(
                 comments=comment_list,
-                total=total_comments,
+                total=post.comments_count,
                 page=page,
                 page_size=page_size,
+                next_page_token=next_page_token,
             )
         except Exception as e:
             logger.error(f"Get comments error: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Internal server error: {str(e)}")
             return post_pb2.GetCommentsResponse()
         finally:
-            db.close()
+            await db.close()
@@ -0,0 +1,20 @@
+import grpc
+
+HEALTH_SERVICE_PREFIX = "/grpc.health.v1.Health/"
+
+
+async def unavailable(request, context):
+    await context.abort(grpc.StatusCode.UNAVAILABLE, "Service dependencies are not ready")
+
+
+class ReadinessInterceptor(grpc.aio.ServerInterceptor):
+    def __init__(self):
+        self.ready = False
+
+    def set_ready(self):
+        self.ready = True
+
+    async def intercept_service(self, continuation, handler_call_details):
+        if self.ready or handler_call_details.method.startswith(HEALTH_SERVICE_PREFIX):
+            return await continuation(handler_call_details)
+        return grpc.unary_unary_rpc_method_handler(unavailable)
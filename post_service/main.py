@@ -1,53 +1,100 @@
-import concurrent.futures
+import asyncio
 import grpc
-import time
 import logging
 import os
 import signal
-import sys
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+from prometheus_client import start_http_server
 from grpc_server.post_server import PostServicer
-from proto import post_pb2_grpc
-from db.database import init_db
+from grpc_server.readiness import ReadinessInterceptor
+from grpc_server.concurrency import ConcurrencyInterceptor
+from proto import post_pb2, post_pb2_grpc
+from metrics.interceptor import MetricsInterceptor
+from db.database import init_db, close_db
 from broker.producer import init_kafka_producer, close_kafka_producer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def signal_handler(sig, frame):
-    logger.info("Stopping")
-    if "server" in globals():
-        server.stop(0)
-        close_kafka_producer() 
-    sys.exit(0)
+SERVICE_NAME = post_pb2.DESCRIPTOR.services_by_name["PostService"].full_name
+
+SHUTDOWN_GRACE = float(os.getenv("GRPC_SHUTDOWN_GRACE", "5"))
+MAX_CONCURRENT_RPCS = int(os.getenv("GRPC_MAX_CONCURRENT_RPCS", "20"))
+MAX_MESSAGE_BYTES = int(os.getenv("GRPC_MAX_MESSAGE_BYTES", str(16 * 1024 * 1024)))
+
+SERVER_OPTIONS = [
+    ("grpc.max_connection_age_ms", int(os.getenv("GRPC_MAX_CONNECTION_AGE_MS", "30000"))),
+    ("grpc.max_connection_age_grace_ms", int(os.getenv("GRPC_MAX_CONNECTION_AGE_GRACE_MS", "5000"))),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.min_ping_interval_without_data_ms", int(os.getenv("GRPC_MIN_PING_INTERVAL_MS", "10000"))),
+    ("grpc.max_concurrent_streams", int(os.getenv("GRPC_MAX_CONCURRENT_STREAMS", "100"))),
+    ("grpc.max_send_message_length", MAX_MESSAGE_BYTES),
+    ("grpc.max_receive_message_length", MAX_MESSAGE_BYTES),
+]
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
 
 
-signal.signal(signal.SIGINT, signal_handler)
-signal.signal(signal.SIGTERM, signal_handler)
+async def init_dependencies(health_servicer, readiness, stop):
+    try:
+        logger.info("DB and Kafka init")
+        await asyncio.gather(
+            init_db(),
+            asyncio.get_running_loop().run_in_executor(None, init_kafka_producer),
+        )
+    except Exception as e:
+        logger.error(f"Dependency init failed: {e}")
+        stop.set()
+        return
 
+    readiness.set_ready()
+    await health_servicer.set("", health_pb2.HealthCheckResponse.SERVING)
+    await health_servicer.set(SERVICE_NAME, health_pb2.HealthCheckResponse.SERVING)
+    logger.info("Post service ready")
 
-def serve():
-    global server
 
-    logger.info("DB init")
-    init_db()
+async def shutdown(server, health_servicer):
+    logger.info("Stopping")
+    await health_servicer.enter_graceful_shutdown()
+    await server.stop(SHUTDOWN_GRACE)
+    await close_db()
+    close_kafka_producer()
 
-    logger.info("Kafka init")
-    init_kafka_producer()
 
+async def serve():
     logger.info("gRPC starting")
-    server = grpc.server(concurrent.futures.ThreadPoolExecutor(max_workers=10))
+    readiness = ReadinessInterceptor()
+    server = grpc.aio.server(
+        interceptors=[MetricsInterceptor(), readiness, ConcurrencyInterceptor(MAX_CONCURRENT_RPCS)],
+        options=SERVER_OPTIONS,
+    )
     post_pb2_grpc.add_PostServiceServicer_to_server(PostServicer(), server)
 
+    health_servicer = health.aio.HealthServicer()
+    await health_servicer.set("", health_pb2.HealthCheckResponse.NOT_SERVING)
+    await health_servicer.set(SERVICE_NAME, health_pb2.HealthCheckResponse.NOT_SERVING)
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+
     port = os.getenv("GRPC_PORT", "50052")
 
     server.add_insecure_port(f"[::]:{str(port)}")
-    server.start()
+    await server.start()
+    start_http_server(METRICS_PORT)
 
     logger.info(f"gRPC post server launched on port {str(port)}")
 
-    server.wait_for_termination()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    init_task = asyncio.create_task(init_dependencies(health_servicer, readiness, stop))
+
+    await stop.wait()
+    init_task.cancel()
+    await shutdown(server, health_servicer)
 
 
 if __name__ == "__main__":
-    serve()
+    asyncio.run(serve())
@@ -0,0 +1,44 @@
+import grpc
+import time
+from prometheus_client import Gauge, Histogram
+
+GRPC_SERVER_LATENCY = Histogram(
+    "grpc_server_handling_seconds",
+    "Latency of gRPC handlers",
+    ["grpc_service", "grpc_method", "grpc_code"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+GRPC_SERVER_IN_FLIGHT = Gauge(
+    "grpc_server_in_flight",
+    "gRPC handlers currently running",
+    ["grpc_service", "grpc_method"],
+)
+
+
+class MetricsInterceptor(grpc.aio.ServerInterceptor):
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+
+        service, method = handler_call_details.method.lstrip("/").rsplit("/", 1)
+        behavior = handler.unary_unary
+
+        async def observed(request, context):
+            in_flight = GRPC_SERVER_IN_FLIGHT.labels(service, method)
+            in_flight.inc()
+            started = time.perf_counter()
+            try:
+                return await behavior(request, context)
+            finally:
+                in_flight.dec()
+                code = context.code() or grpc.StatusCode.OK
+                GRPC_SERVER_LATENCY.labels(service, method, code.name).observe(
+                    time.perf_counter() - started
+                )
+
+        return grpc.unary_unary_rpc_method_handler(
+            observed,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
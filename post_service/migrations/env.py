@@ -0,0 +1,67 @@
+import asyncio
+from alembic import context
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from db.database import Base, DATABASE_URL, async_database_url
+from models import post_model
+
+MIGRATION_LOCK_ID = 720523
+MIGRATION_LOCK_POLL = 0.5
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def database_url():
+    return async_database_url(config.get_main_option("sqlalchemy.url") or DATABASE_URL)
+
+
+def run_migrations_offline():
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def acquire_migration_lock(connection):
+    while not await connection.scalar(text("SELECT pg_try_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID}):
+        await connection.commit()
+        await asyncio.sleep(MIGRATION_LOCK_POLL)
+    await connection.commit()
+
+
+async def run_migrations_online():
+    engine = create_async_engine(database_url(), poolclass=NullPool)
+    try:
+        async with engine.connect() as connection:
+            await acquire_migration_lock(connection)
+            try:
+                await connection.run_sync(do_run_migrations)
+            finally:
+                await connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+                await connection.commit()
+    finally:
+        await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,78 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 10:00:00
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def existing_tables():
+    if context.is_offline_mode():
+        return set()
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    tables = existing_tables()
+    if "posts" not in tables:
+        op.create_table(
+            "posts",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("description", sa.String(), nullable=False),
+            sa.Column("creator_id", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.Column("is_private", sa.Boolean(), nullable=True),
+            sa.Column("tags", postgresql.ARRAY(sa.String()), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    if "post_views" not in tables:
+        op.create_table(
+            "post_views",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("post_id", sa.String(), nullable=False),
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("viewed_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["post_id"], ["posts.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    if "post_likes" not in tables:
+        op.create_table(
+            "post_likes",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("post_id", sa.String(), nullable=False),
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("liked_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["post_id"], ["posts.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("post_id", "user_id", name="post_id_and_user_id"),
+        )
+    if "comments" not in tables:
+        op.create_table(
+            "comments",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("post_id", sa.String(), nullable=False),
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("text", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["post_id"], ["posts.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+
+def downgrade():
+    op.drop_table("comments")
+    op.drop_table("post_likes")
+    op.drop_table("post_views")
+    op.drop_table("posts")
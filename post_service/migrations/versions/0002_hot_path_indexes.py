@@ -0,0 +1,43 @@
+"""comments counter and hot path indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 10:30:00
+
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_posts_created_at_id", "posts (created_at, id)"),
+    ("ix_posts_public_created_at_id", "posts (created_at, id) WHERE NOT is_private"),
+    ("ix_posts_creator_id_created_at_id", "posts (creator_id, created_at, id)"),
+    ("ix_post_views_post_id", "post_views (post_id)"),
+    ("ix_comments_post_id_created_at_id", "comments (post_id, created_at DESC, id DESC)"),
+]
+
+
+def upgrade():
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS comments_count INTEGER DEFAULT 0 NOT NULL")
+    op.execute(
+        """
+        UPDATE posts SET comments_count = counts.total
+        FROM (SELECT post_id, count(*) AS total FROM comments GROUP BY post_id) AS counts
+        WHERE posts.id = counts.post_id AND posts.comments_count <> counts.total
+        """
+    )
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    op.drop_column("posts", "comments_count")
@@ -0,0 +1,46 @@
+"""tag filter index and tag counts
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tag_counts",
+        sa.Column("tag", sa.String(), nullable=False),
+        sa.Column("post_count", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("tag"),
+    )
+    op.create_index("ix_tag_counts_post_count_tag", "tag_counts", [sa.text("post_count DESC"), "tag"])
+    op.execute(
+        """
+        INSERT INTO tag_counts (tag, post_count)
+        SELECT tag, count(*)
+        FROM (
+            SELECT DISTINCT posts.id, tag
+            FROM posts, unnest(posts.tags) AS tag
+            WHERE posts.is_private IS NOT TRUE
+        ) AS post_tags
+        GROUP BY tag
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_tags ON posts USING gin (tags)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_posts_tags")
+    op.drop_index("ix_tag_counts_post_count_tag", table_name="tag_counts")
+    op.drop_table("tag_counts")
@@ -0,0 +1,41 @@
+"""full text search vector
+
+Adding a STORED generated column rewrites the whole posts table while
+holding an ACCESS EXCLUSIVE lock, so reads and writes on posts block
+for the duration of the upgrade. Run it in a maintenance window on
+large tables.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 14:00:00
+
+"""
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade():
+    op.execute(
+        f"ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_search_vector ON posts USING gin (search_vector)"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_posts_search_vector")
+    op.drop_column("posts", "search_vector")
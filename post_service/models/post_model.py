@@ -1,11 +1,17 @@
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import Column, String, Boolean, DateTime, Table, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Computed, String, Boolean, DateTime, Index, Integer, Table, ForeignKey, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from db.database import Base
 
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
 
 class Post(Base):
     __tablename__ = "posts"
@@ -18,11 +24,21 @@ class Post(Base):
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     is_private = Column(Boolean, default=False)
     tags = Column(ARRAY(String), default=[])
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR, persisted=True)))
 
     views = relationship("PostView", back_populates="post", cascade="all, delete-orphan")
     likes = relationship("PostLike", back_populates="post", cascade="all, delete-orphan")
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_public_created_at_id", "created_at", "id", postgresql_where=~is_private),
+        Index("ix_posts_creator_id_created_at_id", "creator_id", "created_at", "id"),
+        Index("ix_posts_tags", "tags", postgresql_using="gin"),
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 
 class PostView(Base):
     __tablename__ = "post_views"
@@ -34,6 +50,10 @@ class PostView(Base):
     
     post = relationship("Post", back_populates="views")
     
+    __table_args__ = (
+        Index("ix_post_views_post_id", "post_id"),
+    )
+    
     def __repr__(self):
         return f"<PostView(id='{self.id}', post_id='{self.post_id}', user_id='{self.user_id}')>"
 
@@ -67,5 +87,23 @@ class Comment(Base):
     
     post = relationship("Post", back_populates="comments")
     
+    __table_args__ = (
+        Index("ix_comments_post_id_created_at_id", post_id, created_at.desc(), id.desc()),
+    )
+    
     def __repr__(self):
         return f"<Comment(id='{self.id}', post_id='{self.post_id}', user_id='{self.user_id}')>"
+
+
+class TagCount(Base):
+    __tablename__ = "tag_counts"
+
+    tag = Column(String, primary_key=True)
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_tag_counts_post_count_tag", post_count.desc(), tag),
+    )
+
+    def __repr__(self):
+        return f"<TagCount(tag='{self.tag}', post_count={self.post_count})>"
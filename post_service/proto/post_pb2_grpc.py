@@ -59,11 +59,31 @@ class PostServiceStub(object):
                 request_serializer=post__pb2.ListPostsRequest.SerializeToString,
                 response_deserializer=post__pb2.ListPostsResponse.FromString,
                 _registered_method=True)
+        self.BatchGetPosts = channel.unary_unary(
+                '/post.PostService/BatchGetPosts',
+                request_serializer=post__pb2.BatchGetPostsRequest.SerializeToString,
+                response_deserializer=post__pb2.BatchGetPostsResponse.FromString,
+                _registered_method=True)
+        self.SearchPosts = channel.unary_unary(
+                '/post.PostService/SearchPosts',
+                request_serializer=post__pb2.SearchPostsRequest.SerializeToString,
+                response_deserializer=post__pb2.SearchPostsResponse.FromString,
+                _registered_method=True)
+        self.GetTagCounts = channel.unary_unary(
+                '/post.PostService/GetTagCounts',
+                request_serializer=post__pb2.GetTagCountsRequest.SerializeToString,
+                response_deserializer=post__pb2.GetTagCountsResponse.FromString,
+                _registered_method=True)
         self.ViewPost = channel.unary_unary(
                 '/post.PostService/ViewPost',
                 request_serializer=post__pb2.ViewPostRequest.SerializeToString,
                 response_deserializer=post__pb2.ViewPostResponse.FromString,
                 _registered_method=True)
+        self.RecordViews = channel.unary_unary(
+                '/post.PostService/RecordViews',
+                request_serializer=post__pb2.RecordViewsRequest.SerializeToString,
+                response_deserializer=post__pb2.RecordViewsResponse.FromString,
+                _registered_method=True)
         self.LikePost = channel.unary_unary(
                 '/post.PostService/LikePost',
                 request_serializer=post__pb2.LikePostRequest.SerializeToString,
@@ -114,12 +134,36 @@ class PostServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BatchGetPosts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SearchPosts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTagCounts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ViewPost(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def RecordViews(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def LikePost(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -166,11 +210,31 @@ def add_PostServiceServicer_to_server(servicer, server):
                     request_deserializer=post__pb2.ListPostsRequest.FromString,
                     response_serializer=post__pb2.ListPostsResponse.SerializeToString,
             ),
+            'BatchGetPosts': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetPosts,
+                    request_deserializer=post__pb2.BatchGetPostsRequest.FromString,
+                    response_serializer=post__pb2.BatchGetPostsResponse.SerializeToString,
+            ),
+            'SearchPosts': grpc.unary_unary_rpc_method_handler(
+                    servicer.SearchPosts,
+                    request_deserializer=post__pb2.SearchPostsRequest.FromString,
+                    response_serializer=post__pb2.SearchPostsResponse.SerializeToString,
+            ),
+            'GetTagCounts': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTagCounts,
+                    request_deserializer=post__pb2.GetTagCountsRequest.FromString,
+                    response_serializer=post__pb2.GetTagCountsResponse.SerializeToString,
+            ),
             'ViewPost': grpc.unary_unary_rpc_method_handler(
                     servicer.ViewPost,
                     request_deserializer=post__pb2.ViewPostRequest.FromString,
                     response_serializer=post__pb2.ViewPostResponse.SerializeToString,
             ),
+            'RecordViews': grpc.unary_unary_rpc_method_handler(
+                    servicer.RecordViews,
+                    request_deserializer=post__pb2.RecordViewsRequest.FromString,
+                    response_serializer=post__pb2.RecordViewsResponse.SerializeToString,
+            ),
             'LikePost': grpc.unary_unary_rpc_method_handler(
                     servicer.LikePost,
                     request_deserializer=post__pb2.LikePostRequest.FromString,
@@ -332,6 +396,87 @@ class PostService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def BatchGetPosts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/post.PostService/BatchGetPosts',
+            post__pb2.BatchGetPostsRequest.SerializeToString,
+            post__pb2.BatchGetPostsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SearchPosts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/post.PostService/SearchPosts',
+            post__pb2.SearchPostsRequest.SerializeToString,
+            post__pb2.SearchPostsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetTagCounts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/post.PostService/GetTagCounts',
+            post__pb2.GetTagCountsRequest.SerializeToString,
+            post__pb2.GetTagCountsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def ViewPost(request,
             target,
@@ -359,6 +504,33 @@ class PostService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def RecordViews(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/post.PostService/RecordViews',
+            post__pb2.RecordViewsRequest.SerializeToString,
+            post__pb2.RecordViewsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def LikePost(request,
             target,
@@ -0,0 +1,49 @@
+import asyncio
+import grpc
+from unittest.mock import patch, AsyncMock, MagicMock
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+
+from grpc_server.concurrency import ConcurrencyInterceptor
+from grpc_server.post_server import PostServicer
+from proto import post_pb2, post_pb2_grpc
+
+
+async def slow_tag_counts(*args):
+    await asyncio.sleep(0.2)
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = []
+    return result
+
+
+async def call_with_health_watch_open():
+    server = grpc.aio.server(interceptors=[ConcurrencyInterceptor(1)])
+    post_pb2_grpc.add_PostServiceServicer_to_server(PostServicer(), server)
+    health_servicer = health.aio.HealthServicer()
+    await health_servicer.set("", health_pb2.HealthCheckResponse.SERVING)
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    await server.start()
+    try:
+        async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+            watch = health_pb2_grpc.HealthStub(channel).Watch(health_pb2.HealthCheckRequest())
+            assert (await watch.read()).status == health_pb2.HealthCheckResponse.SERVING
+
+            stub = post_pb2_grpc.PostServiceStub(channel)
+            with patch("grpc_server.post_server.get_db", new_callable=AsyncMock) as db_mock:
+                db_mock.return_value.execute.side_effect = slow_tag_counts
+                first = asyncio.ensure_future(stub.GetTagCounts(post_pb2.GetTagCountsRequest(limit=10)))
+                await asyncio.sleep(0.05)
+                rejected = None
+                try:
+                    await stub.GetTagCounts(post_pb2.GetTagCountsRequest(limit=10))
+                except grpc.RpcError as e:
+                    rejected = e.code()
+                await first
+            watch.cancel()
+    finally:
+        await server.stop(None)
+    return rejected
+
+
+def test_concurrency_limit_skips_health_watch_streams():
+    assert asyncio.run(call_with_health_watch_open()) == grpc.StatusCode.RESOURCE_EXHAUSTED
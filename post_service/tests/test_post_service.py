@@ -1,11 +1,14 @@
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import grpc
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.dialects import postgresql
 
 from grpc_server.post_server import PostServicer
-from models.post_model import Post
+from grpc_server.page_tokens import encode_page_token
+from models.post_model import Post, TagCount
 from proto import post_pb2
 
 
@@ -14,9 +17,11 @@ def post_servicer():
     servicer = PostServicer()
 
     context = MagicMock()
+    context.time_remaining.return_value = None
 
-    with patch("grpc_server.post_server.get_db") as db_mock:
-        session_mock = MagicMock()
+    with patch("grpc_server.post_server.get_db", new_callable=AsyncMock) as db_mock:
+        session_mock = AsyncMock()
+        session_mock.add = MagicMock()
         db_mock.return_value = session_mock
 
         yield servicer, context, session_mock
@@ -28,10 +33,33 @@ def kafka_mock():
         producer_mock = MagicMock()
         kafka_producer_mock.return_value = producer_mock
         producer_mock.send_message.return_value = True
-        
+
         yield producer_mock
 
 
+def scalars_result(items):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = items
+    result.scalars.return_value.first.return_value = items[0] if items else None
+    return result
+
+
+def rows_result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+def tag_count_deltas(session_mock):
+    statements = [
+        call.args[0] for call in session_mock.execute.await_args_list
+        if getattr(getattr(call.args[0], "table", None), "name", None) == TagCount.__tablename__
+    ]
+    assert len(statements) == 1
+    params = statements[0].compile(dialect=postgresql.dialect()).params
+    return {params[f"tag_m{i}"]: params[f"post_count_m{i}"] for i in range(len(params) // 2)}
+
+
 def test_create_post(post_servicer):
     servicer, context, session_mock = post_servicer
 
@@ -43,7 +71,7 @@ def test_create_post(post_servicer):
         tags=["tag1", "tag2"],
     )
 
-    response = servicer.CreatePost(request, context)
+    response = asyncio.run(servicer.CreatePost(request, context))
 
     assert response.id is not None
     assert response.title == "Test Post"
@@ -53,7 +81,25 @@ def test_create_post(post_servicer):
     assert list(response.tags) == ["tag1", "tag2"]
 
     session_mock.add.assert_called_once()
-    session_mock.commit.assert_called_once()
+    session_mock.commit.assert_awaited_once()
+    assert tag_count_deltas(session_mock) == {"tag1": 1, "tag2": 1}
+
+
+def test_create_private_post_skips_tag_counts(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    request = post_pb2.CreatePostRequest(
+        title="Test Post",
+        description="Test Description",
+        creator_id="user1",
+        is_private=True,
+        tags=["tag1"],
+    )
+
+    asyncio.run(servicer.CreatePost(request, context))
+
+    session_mock.execute.assert_not_awaited()
+    session_mock.commit.assert_awaited_once()
 
 
 def test_update_post(post_servicer):
@@ -65,12 +111,7 @@ def test_update_post(post_servicer):
     post_mock.creator_id = "user1"
     post_mock.created_at = datetime.utcnow()
 
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-
-    session_mock.query.return_value = query_mock
-    query_mock.filter.return_value = filter_mock
-    filter_mock.first.return_value = post_mock
+    session_mock.get.return_value = post_mock
 
     request = post_pb2.UpdatePostRequest(
         id=post_id,
@@ -81,7 +122,7 @@ def test_update_post(post_servicer):
         tags=["tag3", "tag4"],
     )
 
-    response = servicer.UpdatePost(request, context)
+    response = asyncio.run(servicer.UpdatePost(request, context))
 
     assert response.id == post_id
     assert post_mock.title == "Updated Post"
@@ -89,18 +130,13 @@ def test_update_post(post_servicer):
     assert post_mock.is_private == True
     assert post_mock.tags == ["tag3", "tag4"]
 
-    session_mock.commit.assert_called_once()
+    session_mock.commit.assert_awaited_once()
 
 
 def test_update_post_not_found(post_servicer):
     servicer, context, session_mock = post_servicer
 
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-
-    session_mock.query.return_value = query_mock
-    query_mock.filter.return_value = filter_mock
-    filter_mock.first.return_value = None
+    session_mock.get.return_value = None
 
     post_id = str(uuid.uuid4())
     request = post_pb2.UpdatePostRequest(
@@ -112,7 +148,7 @@ def test_update_post_not_found(post_servicer):
         tags=["tag3", "tag4"],
     )
 
-    servicer.UpdatePost(request, context)
+    asyncio.run(servicer.UpdatePost(request, context))
 
     context.set_code.assert_called_with(grpc.StatusCode.NOT_FOUND)
 
@@ -125,21 +161,16 @@ def test_delete_post(post_servicer):
     post_mock.id = post_id
     post_mock.creator_id = "user1"
 
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-
-    session_mock.query.return_value = query_mock
-    query_mock.filter.return_value = filter_mock
-    filter_mock.first.return_value = post_mock
+    session_mock.get.return_value = post_mock
 
     request = post_pb2.DeletePostRequest(id=post_id, creator_id="user1")
 
-    response = servicer.DeletePost(request, context)
+    response = asyncio.run(servicer.DeletePost(request, context))
 
     assert response.success == True
 
-    session_mock.delete.assert_called_once_with(post_mock)
-    session_mock.commit.assert_called_once()
+    session_mock.delete.assert_awaited_once_with(post_mock)
+    session_mock.commit.assert_awaited_once()
 
 
 def test_get_post(post_servicer):
@@ -156,16 +187,11 @@ def test_get_post(post_servicer):
     post_mock.is_private = False
     post_mock.tags = ["tag1", "tag2"]
 
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-
-    session_mock.query.return_value = query_mock
-    query_mock.filter.return_value = filter_mock
-    filter_mock.first.return_value = post_mock
+    session_mock.get.return_value = post_mock
 
     request = post_pb2.GetPostRequest(id=post_id, user_id="user1")
 
-    response = servicer.GetPost(request, context)
+    response = asyncio.run(servicer.GetPost(request, context))
 
     assert response.id == post_id
     assert response.title == "Test Post"
@@ -177,31 +203,27 @@ def test_view_post_success(post_servicer, kafka_mock):
 
     post_id = str(uuid.uuid4())
     user_id = "user1"
-    
+
     post_mock = MagicMock()
     post_mock.id = post_id
     post_mock.creator_id = "creator1"
     post_mock.is_private = False
-    
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-    session_mock.query.return_value = query_mock
-    query_mock.filter.return_value = filter_mock
-    filter_mock.first.return_value = post_mock
-    
+
+    session_mock.get.return_value = post_mock
+
     request = post_pb2.ViewPostRequest(
         post_id=post_id,
         user_id=user_id
     )
 
-    response = servicer.ViewPost(request, context)
-    
+    response = asyncio.run(servicer.ViewPost(request, context))
+
     session_mock.add.assert_called_once()
-    
-    session_mock.commit.assert_called_once()
-    
+
+    session_mock.commit.assert_awaited_once()
+
     kafka_mock.send_message.assert_called_once()
-    
+
     context.set_code.assert_not_called()
 
 
@@ -210,26 +232,22 @@ def test_view_post_not_found(post_servicer, kafka_mock):
 
     post_id = str(uuid.uuid4())
     user_id = "user1"
-    
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-    session_mock.query.return_value = query_mock
-    query_mock.filter.return_value = filter_mock
-    filter_mock.first.return_value = None
-    
+
+    session_mock.get.return_value = None
+
     request = post_pb2.ViewPostRequest(
         post_id=post_id,
         user_id=user_id
     )
-    
-    servicer.ViewPost(request, context)
-    
+
+    asyncio.run(servicer.ViewPost(request, context))
+
     session_mock.add.assert_not_called()
-    
-    session_mock.commit.assert_not_called()
-    
+
+    session_mock.commit.assert_not_awaited()
+
     kafka_mock.send_message.assert_not_called()
-    
+
     context.set_code.assert_called_with(grpc.StatusCode.NOT_FOUND)
 
 
@@ -238,32 +256,27 @@ def test_view_private_post_denied(post_servicer, kafka_mock):
 
     post_id = str(uuid.uuid4())
     user_id = "user1"
-    
+
     post_mock = MagicMock()
     post_mock.id = post_id
-    post_mock.creator_id = "creator1"  
-    post_mock.is_private = True        
-    
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-    session_mock.query.return_value = query_mock
-    query_mock.filter.return_value = filter_mock
-    filter_mock.first.return_value = post_mock
-    
-    
+    post_mock.creator_id = "creator1"
+    post_mock.is_private = True
+
+    session_mock.get.return_value = post_mock
+
     request = post_pb2.ViewPostRequest(
         post_id=post_id,
         user_id=user_id
     )
-    
-    servicer.ViewPost(request, context)
-    
+
+    asyncio.run(servicer.ViewPost(request, context))
+
     session_mock.add.assert_not_called()
-    
-    session_mock.commit.assert_not_called()
-    
+
+    session_mock.commit.assert_not_awaited()
+
     kafka_mock.send_message.assert_not_called()
-    
+
     context.set_code.assert_called_with(grpc.StatusCode.PERMISSION_DENIED)
 
 
@@ -272,35 +285,28 @@ def test_like_post_success(post_servicer, kafka_mock):
 
     post_id = str(uuid.uuid4())
     user_id = "user1"
-    
+
     post_mock = MagicMock()
     post_mock.id = post_id
     post_mock.creator_id = "creator1"
     post_mock.is_private = False
-    
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-    first_mock = MagicMock()
-    
-    session_mock.query.side_effect = [query_mock, query_mock]
-    query_mock.filter.side_effect = [filter_mock, filter_mock]
-    filter_mock.first.side_effect = [post_mock, None]  
-    
-    
+
+    session_mock.get.return_value = post_mock
+    session_mock.execute.return_value = scalars_result([])
+
     request = post_pb2.LikePostRequest(
         post_id=post_id,
         user_id=user_id
     )
-    
-    response = servicer.LikePost(request, context)
-    
-    
+
+    response = asyncio.run(servicer.LikePost(request, context))
+
     session_mock.add.assert_called_once()
-    
-    session_mock.commit.assert_called_once()
-    
+
+    session_mock.commit.assert_awaited_once()
+
     kafka_mock.send_message.assert_called_once()
-    
+
     context.set_code.assert_not_called()
 
 
@@ -309,36 +315,30 @@ def test_like_post_already_liked(post_servicer, kafka_mock):
 
     post_id = str(uuid.uuid4())
     user_id = "user1"
-    
+
     post_mock = MagicMock()
     post_mock.id = post_id
     post_mock.creator_id = "creator1"
     post_mock.is_private = False
-    
+
     like_mock = MagicMock()
-    
-    
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-    
-    session_mock.query.side_effect = [query_mock, query_mock]
-    query_mock.filter.side_effect = [filter_mock, filter_mock]
-    filter_mock.first.side_effect = [post_mock, like_mock]  
-    
-    
+
+    session_mock.get.return_value = post_mock
+    session_mock.execute.return_value = scalars_result([like_mock])
+
     request = post_pb2.LikePostRequest(
         post_id=post_id,
         user_id=user_id
     )
-    
-    servicer.LikePost(request, context)
-    
+
+    asyncio.run(servicer.LikePost(request, context))
+
     session_mock.add.assert_not_called()
-    
-    session_mock.commit.assert_not_called()
-    
+
+    session_mock.commit.assert_not_awaited()
+
     kafka_mock.send_message.assert_not_called()
-    
+
     context.set_code.assert_called_with(grpc.StatusCode.ALREADY_EXISTS)
 
 
@@ -348,38 +348,39 @@ def test_add_comment_success(post_servicer, kafka_mock):
     post_id = str(uuid.uuid4())
     user_id = "user1"
     comment_text = "This is a test comment"
-    
+
     post_mock = MagicMock()
     post_mock.id = post_id
     post_mock.creator_id = "creator1"
     post_mock.is_private = False
-    
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-    session_mock.query.return_value = query_mock
-    query_mock.filter.return_value = filter_mock
-    filter_mock.first.return_value = post_mock
-    
+
+    session_mock.get.return_value = post_mock
+
     request = post_pb2.AddCommentRequest(
         post_id=post_id,
         user_id=user_id,
         text=comment_text
     )
-    
-    response = servicer.AddComment(request, context)
-    
+
+    response = asyncio.run(servicer.AddComment(request, context))
+
     assert response.post_id == post_id
     assert response.user_id == user_id
     assert response.text == comment_text
     assert response.id is not None
     assert response.created_at is not None
-    
+
     session_mock.add.assert_called_once()
-    
-    session_mock.commit.assert_called_once()
-    
+
+    session_mock.execute.assert_awaited_once()
+    counter_update = str(session_mock.execute.call_args[0][0])
+    assert "comments_count=(posts.comments_count +" in counter_update
+    assert "updated_at=posts.updated_at" in counter_update
+
+    session_mock.commit.assert_awaited_once()
+
     kafka_mock.send_message.assert_called_once()
-    
+
     context.set_code.assert_not_called()
 
 
@@ -408,32 +409,10 @@ def test_get_comments_success(post_servicer):
     comment2.text = "Comment 2"
     comment2.created_at = datetime.now()
 
-    post_query_mock = MagicMock()
-    count_query_mock = MagicMock()
-    comments_query_mock = MagicMock()
-    
-    post_filter_mock = MagicMock()
-    count_filter_mock = MagicMock()
-    comments_filter_mock = MagicMock()
-    
-    post_query_mock.filter.return_value = post_filter_mock
-    post_filter_mock.first.return_value = post_mock
-    
-    count_query_mock.filter.return_value = count_filter_mock
-    count_filter_mock.count.return_value = 2
-    
-    comments_query_mock.filter.return_value = comments_filter_mock
-    
-    order_mock = MagicMock()
-    offset_mock = MagicMock()
-    limit_mock = MagicMock()
-    
-    comments_filter_mock.order_by.return_value = order_mock
-    order_mock.offset.return_value = offset_mock
-    offset_mock.limit.return_value = limit_mock
-    limit_mock.all.return_value = [comment1, comment2]
-    
-    session_mock.query.side_effect = [post_query_mock, count_query_mock, comments_query_mock]
+    post_mock.comments_count = 2
+
+    session_mock.get.return_value = post_mock
+    session_mock.execute.return_value = scalars_result([comment1, comment2])
 
     request = post_pb2.GetCommentsRequest(
         post_id=post_id,
@@ -441,40 +420,89 @@ def test_get_comments_success(post_servicer):
         page_size=10
     )
 
-    response = servicer.GetComments(request, context)
+    response = asyncio.run(servicer.GetComments(request, context))
 
     assert response.total == 2
     assert response.page == 1
     assert response.page_size == 10
     assert len(response.comments) == 2
-    
+
     assert response.comments[0].id == comment1.id
     assert response.comments[0].post_id == post_id
     assert response.comments[0].user_id == "user1"
     assert response.comments[0].text == "Comment 1"
-    
+    assert response.next_page_token == ""
+
+    session_mock.scalar.assert_not_awaited()
+    session_mock.execute.assert_awaited_once()
+    statement = str(session_mock.execute.call_args[0][0])
+    assert "ORDER BY comments.created_at DESC, comments.id DESC" in statement
+    assert "count" not in statement.lower()
+
     context.set_code.assert_not_called()
 
 
+def test_get_comments_continues_from_page_token(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    post_mock = make_post_mock("post-1")
+    post_mock.comments_count = 100000
+    comments = []
+    for i in range(3):
+        comment = MagicMock()
+        comment.id = f"comment-{i}"
+        comment.post_id = "post-1"
+        comment.user_id = "user1"
+        comment.text = f"Comment {i}"
+        comment.created_at = datetime(2026, 1, 1, 10, 0, i)
+        comments.append(comment)
+
+    session_mock.get.return_value = post_mock
+    session_mock.execute.return_value = scalars_result(comments)
+    token = encode_page_token(datetime(2026, 1, 1, 11, 0, 0), "comment-x")
+
+    request = post_pb2.GetCommentsRequest(
+        post_id="post-1", page_size=2, user_id="user1", page_token=token
+    )
+
+    response = asyncio.run(servicer.GetComments(request, context))
+
+    assert [comment.id for comment in response.comments] == ["comment-0", "comment-1"]
+    assert response.total == 100000
+    assert response.next_page_token == encode_page_token(comments[1].created_at, "comment-1")
+    statement = str(session_mock.execute.call_args[0][0])
+    assert "(comments.created_at, comments.id) <" in statement
+    assert "OFFSET" not in statement
+
+
+def test_get_comments_of_private_post_checks_user(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    session_mock.get.return_value = make_post_mock("post-1", creator_id="owner", is_private=True)
+
+    request = post_pb2.GetCommentsRequest(post_id="post-1", page=1, page_size=10, user_id="other")
+
+    asyncio.run(servicer.GetComments(request, context))
+
+    context.set_code.assert_called_with(grpc.StatusCode.PERMISSION_DENIED)
+    session_mock.execute.assert_not_awaited()
+
+
 def test_get_comments_post_not_found(post_servicer):
     servicer, context, session_mock = post_servicer
 
     post_id = str(uuid.uuid4())
-    
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-    session_mock.query.return_value = query_mock
-    query_mock.filter.return_value = filter_mock
-    filter_mock.first.return_value = None
-    
+
+    session_mock.get.return_value = None
+
     request = post_pb2.GetCommentsRequest(
         post_id=post_id,
         page=1,
         page_size=10
     )
-    
-    servicer.GetComments(request, context)
-    
+
+    asyncio.run(servicer.GetComments(request, context))
+
     context.set_code.assert_called_with(grpc.StatusCode.NOT_FOUND)
 
 
@@ -484,41 +512,37 @@ def test_add_comment_to_private_post_by_owner(post_servicer, kafka_mock):
     post_id = str(uuid.uuid4())
     creator_id = "creator1"
     comment_text = "Self comment on private post"
-    
+
     post_mock = MagicMock()
     post_mock.id = post_id
     post_mock.creator_id = creator_id
     post_mock.is_private = True
-    
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-    session_mock.query.return_value = query_mock
-    query_mock.filter.return_value = filter_mock
-    filter_mock.first.return_value = post_mock
-    
+
+    session_mock.get.return_value = post_mock
+
     request = post_pb2.AddCommentRequest(
         post_id=post_id,
         user_id=creator_id,
         text=comment_text
     )
-    
+
     with patch('grpc_server.post_server.uuid.uuid4', return_value='comment-123'):
-        response = servicer.AddComment(request, context)
-    
+        response = asyncio.run(servicer.AddComment(request, context))
+
     assert response.id == 'comment-123'
     assert response.post_id == post_id
     assert response.user_id == creator_id
     assert response.text == comment_text
-    
+
     session_mock.add.assert_called_once()
     added_comment = session_mock.add.call_args[0][0]
     assert added_comment.id == 'comment-123'
     assert added_comment.post_id == post_id
     assert added_comment.user_id == creator_id
     assert added_comment.text == comment_text
-    
-    session_mock.commit.assert_called_once()
-    
+
+    session_mock.commit.assert_awaited_once()
+
     kafka_mock.send_message.assert_called_once()
     topic, event = kafka_mock.send_message.call_args[0]
     assert topic == "post_comments"
@@ -526,7 +550,7 @@ def test_add_comment_to_private_post_by_owner(post_servicer, kafka_mock):
     assert event["post_id"] == post_id
     assert event["user_id"] == creator_id
     assert event["text"] == comment_text
-    
+
     context.set_code.assert_not_called()
 
 
@@ -535,7 +559,7 @@ def test_get_post_with_private_access(post_servicer):
 
     post_id = str(uuid.uuid4())
     creator_id = "owner123"
-    
+
     post_mock = MagicMock()
     post_mock.id = post_id
     post_mock.title = "Private Post"
@@ -546,33 +570,27 @@ def test_get_post_with_private_access(post_servicer):
     post_mock.is_private = True
     post_mock.tags = ["private", "secret"]
 
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-
-    session_mock.query.return_value = query_mock
-    query_mock.filter.return_value = filter_mock
-    filter_mock.first.return_value = post_mock
+    session_mock.get.return_value = post_mock
 
     request = post_pb2.GetPostRequest(
-        id=post_id, 
+        id=post_id,
         user_id=creator_id
     )
 
-    response = servicer.GetPost(request, context)
+    response = asyncio.run(servicer.GetPost(request, context))
+
+    session_mock.get.assert_awaited_with(Post, post_id)
 
-    session_mock.query.assert_called_with(Post)
-    query_mock.filter.assert_called()
-    
     assert response.id == post_id
     assert response.title == "Private Post"
     assert response.description == "Private Description"
     assert response.creator_id == creator_id
     assert response.is_private == True
     assert list(response.tags) == ["private", "secret"]
-    
+
     context.set_code.assert_not_called()
-    
-    session_mock.close.assert_called_once()
+
+    session_mock.close.assert_awaited_once()
 
 
 def test_update_post_updated_at_timestamp(post_servicer):
@@ -581,7 +599,7 @@ def test_update_post_updated_at_timestamp(post_servicer):
     post_id = str(uuid.uuid4())
     original_created_at = datetime(2025, 1, 1, 10, 0, 0)
     original_updated_at = datetime(2025, 1, 1, 10, 0, 0)
-    
+
     post_mock = MagicMock()
     post_mock.id = post_id
     post_mock.creator_id = "user1"
@@ -592,12 +610,7 @@ def test_update_post_updated_at_timestamp(post_servicer):
     post_mock.is_private = False
     post_mock.tags = ["original"]
 
-    query_mock = MagicMock()
-    filter_mock = MagicMock()
-
-    session_mock.query.return_value = query_mock
-    query_mock.filter.return_value = filter_mock
-    filter_mock.first.return_value = post_mock
+    session_mock.get.return_value = post_mock
 
     request = post_pb2.UpdatePostRequest(
         id=post_id,
@@ -612,26 +625,470 @@ def test_update_post_updated_at_timestamp(post_servicer):
     with patch('grpc_server.post_server.datetime') as mock_datetime:
         mock_datetime.utcnow.return_value = fixed_time
         mock_datetime.now.return_value = fixed_time
-        
-        response = servicer.UpdatePost(request, context)
 
-    session_mock.query.assert_called_with(Post)
-    
+        response = asyncio.run(servicer.UpdatePost(request, context))
+
+    session_mock.get.assert_awaited_with(Post, post_id, with_for_update=True)
+
     assert post_mock.title == "Updated Title"
     assert post_mock.description == "Updated Description"
     assert post_mock.is_private == True
     assert post_mock.tags == ["updated", "modified"]
-    
+
     assert post_mock.updated_at == fixed_time
-    
+
     assert post_mock.created_at == original_created_at
-    
-    session_mock.commit.assert_called_once()
-    session_mock.refresh.assert_called_once_with(post_mock)
-    
+
+    assert tag_count_deltas(session_mock) == {"original": -1}
+
+    session_mock.commit.assert_awaited_once()
+    session_mock.refresh.assert_awaited_once_with(post_mock)
+
     assert response.id == post_id
     assert response.title == "Updated Title"
     assert response.updated_at == fixed_time.isoformat()
     assert response.created_at == original_created_at.isoformat()
-    
+
+    context.set_code.assert_not_called()
+
+
+def make_post_mock(post_id, creator_id="creator1", is_private=False):
+    post_mock = MagicMock()
+    post_mock.id = post_id
+    post_mock.title = f"Post {post_id}"
+    post_mock.description = "Description"
+    post_mock.creator_id = creator_id
+    post_mock.created_at = datetime.utcnow()
+    post_mock.updated_at = datetime.utcnow()
+    post_mock.is_private = is_private
+    post_mock.tags = []
+    return post_mock
+
+
+def test_list_posts(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    posts = [make_post_mock(f"post-{i}") for i in range(3)]
+    session_mock.execute.return_value = scalars_result(posts)
+
+    request = post_pb2.ListPostsRequest(page_size=2, user_id="user1")
+
+    response = asyncio.run(servicer.ListPosts(request, context))
+
+    assert [post.id for post in response.posts] == ["post-0", "post-1"]
+    assert response.next_page_token == encode_page_token(posts[1].created_at, "post-1")
+    assert not response.HasField("total")
+    session_mock.scalar.assert_not_awaited()
+    statement = str(session_mock.execute.call_args[0][0])
+    assert "ORDER BY posts.created_at DESC, posts.id DESC" in statement
+    assert "OFFSET" not in statement
+    context.set_code.assert_not_called()
+
+
+def test_list_posts_continues_from_page_token(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    session_mock.execute.return_value = scalars_result([make_post_mock("post-9")])
+    session_mock.scalar.return_value = 12
+    token = encode_page_token(datetime(2026, 1, 1, 10, 0, 0, 123456), "post-8")
+
+    request = post_pb2.ListPostsRequest(
+        page_size=2, user_id="user1", page_token=token, include_total=True
+    )
+
+    response = asyncio.run(servicer.ListPosts(request, context))
+
+    assert [post.id for post in response.posts] == ["post-9"]
+    assert response.next_page_token == ""
+    assert response.total == 12
+    statement = session_mock.execute.call_args[0][0]
+    assert "(posts.created_at, posts.id) <" in str(statement)
+    assert "OFFSET" not in str(statement)
+    params = statement.compile().params
+    assert datetime(2026, 1, 1, 10, 0, 0, 123456) in params.values()
+    assert "post-8" in params.values()
+
+
+def test_list_posts_rejects_invalid_page_token(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    for token in ["not-a-token", encode_page_token("yesterday", "post-1"), encode_page_token(1)]:
+        context.reset_mock()
+        request = post_pb2.ListPostsRequest(page_size=2, user_id="user1", page_token=token)
+
+        asyncio.run(servicer.ListPosts(request, context))
+
+        context.set_code.assert_called_with(grpc.StatusCode.INVALID_ARGUMENT)
+
+    session_mock.execute.assert_not_awaited()
+
+
+def test_update_post_moves_tag_counts(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    post_mock = make_post_mock("post-1", creator_id="user1")
+    post_mock.tags = ["keep", "drop", "drop"]
+    session_mock.get.return_value = post_mock
+
+    request = post_pb2.UpdatePostRequest(
+        id="post-1",
+        title="Title",
+        description="Description",
+        creator_id="user1",
+        tags=["keep", "add"],
+    )
+
+    asyncio.run(servicer.UpdatePost(request, context))
+
+    assert tag_count_deltas(session_mock) == {"add": 1, "drop": -1}
+    context.set_code.assert_not_called()
+
+
+def test_delete_post_releases_tag_counts(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    post_mock = make_post_mock("post-1", creator_id="user1")
+    post_mock.tags = ["a", "b"]
+    session_mock.get.return_value = post_mock
+
+    response = asyncio.run(
+        servicer.DeletePost(post_pb2.DeletePostRequest(id="post-1", creator_id="user1"), context)
+    )
+
+    assert response.success
+    session_mock.get.assert_awaited_once_with(Post, "post-1", with_for_update=True)
+    assert tag_count_deltas(session_mock) == {"a": -1, "b": -1}
+    session_mock.delete.assert_awaited_once_with(post_mock)
+
+
+def test_list_posts_filters_by_tags(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    session_mock.execute.return_value = scalars_result([make_post_mock("post-1")])
+    session_mock.scalar.return_value = 1
+
+    request = post_pb2.ListPostsRequest(
+        page_size=2,
+        user_id="user1",
+        tags_any=["python", "go", "python"],
+        tags_all=["backend"],
+        include_total=True,
+    )
+
+    response = asyncio.run(servicer.ListPosts(request, context))
+
+    assert [post.id for post in response.posts] == ["post-1"]
+    for statement in (session_mock.execute.call_args[0][0], session_mock.scalar.call_args[0][0]):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        assert "posts.tags && " in str(compiled)
+        assert "posts.tags @> " in str(compiled)
+        assert ["python", "go"] in compiled.params.values()
+        assert ["backend"] in compiled.params.values()
+    context.set_code.assert_not_called()
+
+
+def test_list_posts_rejects_too_many_tags(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    request = post_pb2.ListPostsRequest(tags_any=[f"tag-{i}" for i in range(11)])
+
+    asyncio.run(servicer.ListPosts(request, context))
+
+    context.set_code.assert_called_with(grpc.StatusCode.INVALID_ARGUMENT)
+    session_mock.execute.assert_not_awaited()
+
+
+def test_get_tag_counts(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    session_mock.execute.return_value = scalars_result(
+        [TagCount(tag="python", post_count=7), TagCount(tag="go", post_count=3)]
+    )
+
+    response = asyncio.run(servicer.GetTagCounts(post_pb2.GetTagCountsRequest(limit=500), context))
+
+    assert [(tag.tag, tag.post_count) for tag in response.tags] == [("python", 7), ("go", 3)]
+    statement = session_mock.execute.call_args[0][0]
+    assert "ORDER BY tag_counts.post_count DESC, tag_counts.tag" in str(statement)
+    assert 100 in statement.compile().params.values()
+    context.set_code.assert_not_called()
+
+
+def test_search_posts_ranks_and_pages(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    posts = [make_post_mock(f"post-{i}") for i in range(3)]
+    session_mock.execute.return_value = rows_result([(post, 0.5 - i * 0.1) for i, post in enumerate(posts)])
+
+    request = post_pb2.SearchPostsRequest(query=" grpc tips ", page_size=2, user_id="user1")
+
+    response = asyncio.run(servicer.SearchPosts(request, context))
+
+    assert [post.id for post in response.posts] == ["post-0", "post-1"]
+    assert response.next_page_token == encode_page_token(0.4, posts[1].created_at, "post-1")
+    compiled = session_mock.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+    assert "posts.search_vector @@ websearch_to_tsquery('english'::regconfig" in str(compiled)
+    assert "ORDER BY ts_rank(posts.search_vector" in str(compiled)
+    assert "posts.creator_id = " in str(compiled)
+    assert "grpc tips" in compiled.params.values()
     context.set_code.assert_not_called()
+
+
+def test_search_posts_continues_from_page_token(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    session_mock.execute.return_value = rows_result([(make_post_mock("post-9"), 0.1)])
+    token = encode_page_token(0.25, datetime(2026, 1, 1, 10, 0, 0), "post-8")
+
+    request = post_pb2.SearchPostsRequest(query="grpc", page_size=2, page_token=token)
+
+    response = asyncio.run(servicer.SearchPosts(request, context))
+
+    assert [post.id for post in response.posts] == ["post-9"]
+    assert response.next_page_token == ""
+    statement = session_mock.execute.call_args[0][0]
+    compiled = statement.compile(dialect=postgresql.dialect())
+    assert "(ts_rank(posts.search_vector" in str(compiled)
+    assert 0.25 in compiled.params.values()
+    assert datetime(2026, 1, 1, 10, 0, 0) in compiled.params.values()
+    assert "post-8" in compiled.params.values()
+
+
+def test_search_posts_rejects_invalid_requests(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    requests = [
+        post_pb2.SearchPostsRequest(query="   "),
+        post_pb2.SearchPostsRequest(query="x" * 257),
+        post_pb2.SearchPostsRequest(query="grpc", page_token=encode_page_token("high", "2026-01-01T00:00:00", "p")),
+        post_pb2.SearchPostsRequest(query="grpc", page_token=encode_page_token(datetime(2026, 1, 1), "p")),
+    ]
+    for request in requests:
+        context.reset_mock()
+
+        asyncio.run(servicer.SearchPosts(request, context))
+
+        context.set_code.assert_called_with(grpc.StatusCode.INVALID_ARGUMENT)
+
+    session_mock.execute.assert_not_awaited()
+
+
+def test_batch_get_posts_preserves_order_and_filters_private(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    public_1 = make_post_mock("post-1")
+    public_2 = make_post_mock("post-2")
+    private_other = make_post_mock("post-3", creator_id="creator2", is_private=True)
+    private_own = make_post_mock("post-4", creator_id="user1", is_private=True)
+
+    session_mock.execute.return_value = scalars_result([public_1, private_own, private_other, public_2])
+
+    request = post_pb2.BatchGetPostsRequest(
+        ids=["post-2", "missing", "post-3", "post-4", "post-1", "post-2"],
+        user_id="user1",
+    )
+
+    response = asyncio.run(servicer.BatchGetPosts(request, context))
+
+    assert [post.id for post in response.posts] == ["post-2", "post-4", "post-1"]
+    session_mock.execute.assert_awaited_once()
+    context.set_code.assert_not_called()
+    session_mock.close.assert_awaited_once()
+
+
+def test_batch_get_posts_rejects_too_many_ids(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    request = post_pb2.BatchGetPostsRequest(
+        ids=[str(i) for i in range(101)],
+        user_id="user1",
+    )
+
+    asyncio.run(servicer.BatchGetPosts(request, context))
+
+    context.set_code.assert_called_with(grpc.StatusCode.INVALID_ARGUMENT)
+    session_mock.execute.assert_not_awaited()
+
+
+def test_record_views_batches_insert_and_kafka(post_servicer, kafka_mock):
+    servicer, context, session_mock = post_servicer
+    kafka_mock.send_messages.return_value = True
+
+    session_mock.execute.side_effect = [rows_result([("post-1",), ("post-2",)]), MagicMock()]
+    viewed_at = (datetime.utcnow() - timedelta(hours=1)).replace(microsecond=0)
+    offset = timezone(timedelta(hours=3))
+
+    request = post_pb2.RecordViewsRequest(
+        user_id="user1",
+        views=[
+            post_pb2.ViewEvent(post_id="post-1", viewed_at=viewed_at.isoformat()),
+            post_pb2.ViewEvent(post_id="post-2"),
+            post_pb2.ViewEvent(post_id="private"),
+            post_pb2.ViewEvent(
+                post_id="post-1",
+                viewed_at=viewed_at.replace(tzinfo=timezone.utc).astimezone(offset).isoformat(),
+            ),
+        ],
+    )
+
+    response = asyncio.run(servicer.RecordViews(request, context))
+
+    assert response.recorded == 3
+    assert list(response.rejected_post_ids) == ["private"]
+    assert session_mock.execute.await_count == 2
+    session_mock.commit.assert_awaited_once()
+    kafka_mock.send_message.assert_not_called()
+    kafka_mock.send_messages.assert_called_once()
+    topic, events = kafka_mock.send_messages.call_args[0]
+    assert topic == "post_views"
+    assert [event["post_id"] for event in events] == ["post-1", "post-2", "post-1"]
+    assert events[0]["viewed_at"] == viewed_at.isoformat()
+    assert events[2]["viewed_at"] == viewed_at.isoformat()
+    context.set_code.assert_not_called()
+
+
+def test_record_views_skips_insert_when_nothing_visible(post_servicer, kafka_mock):
+    servicer, context, session_mock = post_servicer
+
+    session_mock.execute.return_value = rows_result([])
+
+    request = post_pb2.RecordViewsRequest(
+        user_id="user1", views=[post_pb2.ViewEvent(post_id="missing")]
+    )
+
+    response = asyncio.run(servicer.RecordViews(request, context))
+
+    assert response.recorded == 0
+    assert list(response.rejected_post_ids) == ["missing"]
+    session_mock.execute.assert_awaited_once()
+    session_mock.commit.assert_not_awaited()
+    kafka_mock.send_messages.assert_not_called()
+
+
+def test_record_views_rejects_invalid_batches(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    too_many = post_pb2.RecordViewsRequest(
+        user_id="user1", views=[post_pb2.ViewEvent(post_id=str(i)) for i in range(501)]
+    )
+    asyncio.run(servicer.RecordViews(too_many, context))
+    context.set_code.assert_called_with(grpc.StatusCode.INVALID_ARGUMENT)
+
+    context.reset_mock()
+    bad_timestamp = post_pb2.RecordViewsRequest(
+        user_id="user1", views=[post_pb2.ViewEvent(post_id="post-1", viewed_at="yesterday")]
+    )
+    asyncio.run(servicer.RecordViews(bad_timestamp, context))
+    context.set_code.assert_called_with(grpc.StatusCode.INVALID_ARGUMENT)
+
+    for viewed_at in (datetime.utcnow() + timedelta(hours=1), datetime.utcnow() - timedelta(days=8)):
+        context.reset_mock()
+        out_of_range = post_pb2.RecordViewsRequest(
+            user_id="user1", views=[post_pb2.ViewEvent(post_id="post-1", viewed_at=viewed_at.isoformat())]
+        )
+        asyncio.run(servicer.RecordViews(out_of_range, context))
+        context.set_code.assert_called_with(grpc.StatusCode.INVALID_ARGUMENT)
+
+    session_mock.execute.assert_not_awaited()
+
+
+def test_concurrent_requests_are_not_serialized(post_servicer):
+    servicer, context, session_mock = post_servicer
+
+    async def slow_get(model, post_id):
+        await asyncio.sleep(0.05)
+        return make_post_mock(post_id)
+
+    session_mock.get.side_effect = slow_get
+
+    async def run():
+        started = asyncio.get_running_loop().time()
+        responses = await asyncio.gather(
+            *(
+                servicer.GetPost(post_pb2.GetPostRequest(id=f"post-{i}", user_id="user1"), context)
+                for i in range(50)
+            )
+        )
+        return responses, asyncio.get_running_loop().time() - started
+
+    responses, elapsed = asyncio.run(run())
+
+    assert [response.id for response in responses] == [f"post-{i}" for i in range(50)]
+    assert elapsed < 0.5
+
+
+def test_get_db_sets_statement_timeout_on_every_transaction():
+    from db import database
+
+    session_mock = MagicMock()
+    with patch.object(database, "SessionLocal", return_value=session_mock), \
+            patch.object(database.event, "listen") as listen_mock, \
+            patch.object(database.time, "monotonic", return_value=100):
+        db = asyncio.run(database.get_db(1.5))
+
+    assert db is session_mock
+    target, name, listener = listen_mock.call_args[0]
+    assert (target, name) == (session_mock.sync_session, "after_begin")
+
+    connection = MagicMock()
+    with patch.object(database.time, "monotonic", return_value=100.5):
+        listener(session_mock.sync_session, MagicMock(), connection)
+    statement, params = connection.execute.call_args[0]
+    assert "statement_timeout" in str(statement)
+    assert params == {"timeout": str(1000 - database.STATEMENT_TIMEOUT_MARGIN_MS)}
+
+
+def test_get_db_without_deadline_skips_statement_timeout():
+    from db import database
+
+    with patch.object(database, "SessionLocal", return_value=MagicMock()), \
+            patch.object(database.event, "listen") as listen_mock:
+        asyncio.run(database.get_db(None))
+        asyncio.run(database.get_db(9.223372036854776e18))
+
+    listen_mock.assert_not_called()
+
+
+def test_database_url_uses_asyncpg_driver():
+    from db import database
+
+    assert database.async_database_url("postgresql://u:p@db:5432/posts") == "postgresql+asyncpg://u:p@db:5432/posts"
+    assert database.async_database_url("postgresql+asyncpg://u:p@db/posts") == "postgresql+asyncpg://u:p@db/posts"
+
+
+def test_db_engine_uses_configured_pool():
+    from db import database
+
+    engine = database.create_db_engine()
+    pool = engine.sync_engine.pool
+
+    assert isinstance(pool, database.InstrumentedQueuePool)
+    assert pool.size() == database.DB_POOL_SIZE
+    assert pool._max_overflow == database.DB_MAX_OVERFLOW
+    assert pool._timeout == database.DB_POOL_TIMEOUT
+    assert pool._recycle == database.DB_POOL_RECYCLE
+    assert pool._pre_ping == database.DB_POOL_PRE_PING
+
+
+def test_get_post_passes_deadline_to_db(post_servicer):
+    servicer, context, session_mock = post_servicer
+    context.time_remaining.return_value = 0.25
+    session_mock.get.return_value = None
+
+    with patch("grpc_server.post_server.get_db", new_callable=AsyncMock, return_value=session_mock) as db_mock:
+        asyncio.run(servicer.GetPost(post_pb2.GetPostRequest(id="post1", user_id="user1"), context))
+
+    db_mock.assert_awaited_once_with(0.25)
+
+
+def test_statement_timeout_maps_to_deadline_exceeded(post_servicer):
+    from sqlalchemy.exc import OperationalError
+
+    servicer, context, session_mock = post_servicer
+    query_canceled = Exception("canceling statement due to statement timeout")
+    query_canceled.pgcode = "57014"
+    session_mock.get.side_effect = OperationalError("SELECT", {}, query_canceled)
+
+    asyncio.run(servicer.GetPost(post_pb2.GetPostRequest(id="post1", user_id="user1"), context))
+
+    context.set_code.assert_called_with(grpc.StatusCode.DEADLINE_EXCEEDED)
@@ -0,0 +1,48 @@
+import asyncio
+import grpc
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+
+from grpc_server.post_server import PostServicer
+from grpc_server.readiness import ReadinessInterceptor
+from models.post_model import TagCount
+from proto import post_pb2, post_pb2_grpc
+
+
+async def serve_until_ready():
+    readiness = ReadinessInterceptor()
+    server = grpc.aio.server(interceptors=[readiness])
+    post_pb2_grpc.add_PostServiceServicer_to_server(PostServicer(), server)
+    health_servicer = health.aio.HealthServicer()
+    await health_servicer.set("", health_pb2.HealthCheckResponse.NOT_SERVING)
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    await server.start()
+    try:
+        async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+            stub = post_pb2_grpc.PostServiceStub(channel)
+            with pytest.raises(grpc.RpcError) as error:
+                await stub.GetTagCounts(post_pb2.GetTagCountsRequest(limit=10))
+            health_response = await health_pb2_grpc.HealthStub(channel).Check(health_pb2.HealthCheckRequest())
+
+            readiness.set_ready()
+            with patch("grpc_server.post_server.get_db", new_callable=AsyncMock) as db_mock:
+                session_mock = AsyncMock()
+                result = MagicMock()
+                result.scalars.return_value.all.return_value = [TagCount(tag="python", post_count=2)]
+                session_mock.execute.return_value = result
+                db_mock.return_value = session_mock
+
+                response = await stub.GetTagCounts(post_pb2.GetTagCountsRequest(limit=10))
+    finally:
+        await server.stop(None)
+    return error.value.code(), health_response.status, response
+
+
+def test_rpcs_are_unavailable_until_dependencies_are_ready():
+    code, health_status, response = asyncio.run(serve_until_ready())
+
+    assert code == grpc.StatusCode.UNAVAILABLE
+    assert health_status == health_pb2.HealthCheckResponse.NOT_SERVING
+    assert [(tag.tag, tag.post_count) for tag in response.tags] == [("python", 2)]
@@ -25,16 +25,16 @@ KAFKA_GROUP_ID = os.getenv("KAFKA_GROUP_ID", "stats-service")
 
 
 class KafkaMessageConsumer:
-    def __init__(self, bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS, group_id=KAFKA_GROUP_ID, max_retries=10, retry_delay=5):
+    def __init__(self, bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS, group_id=KAFKA_GROUP_ID, max_retries=10, retry_delay=0.5, max_retry_delay=10):
         self.bootstrap_servers = bootstrap_servers
         self.group_id = group_id
         self.topics = [POST_VIEW_TOPIC, POST_LIKE_TOPIC, POST_COMMENT_TOPIC]
         self.consumer = None
         self.running = False
         self.thread = None
-        self.connect_with_retry(max_retries, retry_delay)
+        self.connect_with_retry(max_retries, retry_delay, max_retry_delay)
     
-    def connect_with_retry(self, max_retries=10, retry_delay=5):
+    def connect_with_retry(self, max_retries=10, retry_delay=0.5, max_retry_delay=10):
         for attempt in range(max_retries):
             try:
                 logger.info(f"Connecting Kafka Consumer {attempt+1}")
@@ -56,8 +56,9 @@ class KafkaMessageConsumer:
             except Exception as e:
                 logger.warning(f"Kafka Consumer error {attempt+1}: {e}")
                 if attempt < max_retries - 1:
-                    logger.info(f"Retry in {retry_delay} sec")
-                    time.sleep(retry_delay)
+                    delay = min(retry_delay * 2 ** attempt, max_retry_delay)
+                    logger.info(f"Retry in {delay} sec")
+                    time.sleep(delay)
                 else:
                     logger.error("Kafka Consumer connection failed")
                     raise
@@ -1,4 +1,5 @@
 import os
+import math
 import time
 import logging
 from clickhouse_driver import Client
@@ -15,8 +16,23 @@ CLICKHOUSE_USER = os.getenv("CLICKHOUSE_USER", "default")
 CLICKHOUSE_PASSWORD = os.getenv("CLICKHOUSE_PASSWORD", "")
 CLICKHOUSE_DB = os.getenv("CLICKHOUSE_DB", "default")
 
+MAX_DEADLINE_SECONDS = float(os.getenv("MAX_DEADLINE_SECONDS", "86400"))
+
 clickhouse_client = None
 
+
+class DeadlineTooShort(Exception):
+    pass
+
+
+def query_settings(time_remaining):
+    if time_remaining is None or time_remaining > MAX_DEADLINE_SECONDS:
+        return None
+    if time_remaining < 1:
+        raise DeadlineTooShort(f"{time_remaining:.3f}s left, below the 1s max_execution_time")
+    return {"max_execution_time": math.floor(time_remaining)}
+
+
 def create_tables(client):
     try:
         client.execute('''
@@ -61,7 +77,7 @@ def create_tables(client):
         logger.error(f"Error creating ClickHouse tables: {e}")
         raise
 
-def init_db(max_retries=5, retry_delay=2):
+def init_db(max_retries=8, retry_delay=0.5, max_retry_delay=10):
     global clickhouse_client
     for attempt in range(max_retries):
         try:
@@ -84,8 +100,9 @@ def init_db(max_retries=5, retry_delay=2):
         except Exception as e:
             logger.warning(f"ClickHouse error {attempt+1}: {e}")
             if attempt < max_retries - 1:
-                logger.info(f"Retry in {retry_delay} sec")
-                time.sleep(retry_delay)
+                delay = min(retry_delay * 2 ** attempt, max_retry_delay)
+                logger.info(f"Retry in {delay} sec")
+                time.sleep(delay)
             else:
                 logger.error("ClickHouse connection failed")
                 raise
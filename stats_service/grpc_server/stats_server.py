@@ -4,32 +4,45 @@ from datetime import datetime
 from concurrent import futures
 from proto import stats_pb2, stats_pb2_grpc
 from models.stats_model import StatsView, StatsLike, StatsComment
-from db.database import get_db
+from db.database import DeadlineTooShort, get_db, query_settings
+from clickhouse_driver.errors import ErrorCodes, ServerException
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def error_code(e):
+    if isinstance(e, DeadlineTooShort):
+        return grpc.StatusCode.DEADLINE_EXCEEDED
+    if isinstance(e, ServerException) and e.code == ErrorCodes.TIMEOUT_EXCEEDED:
+        return grpc.StatusCode.DEADLINE_EXCEEDED
+    return grpc.StatusCode.INTERNAL
+
+
 class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
     def GetPostStats(self, request, context):
         try:
             logger.info(f"Getting stats for post: {request.post_id}")
             
             db = get_db()
+            settings = query_settings(context.time_remaining())
             
             views = db.execute(
                 "SELECT COUNT(*) FROM post_views WHERE post_id = %(post_id)s",
-                {"post_id": request.post_id}
+                {"post_id": request.post_id},
+                settings=settings,
             )[0][0]
             
             likes = db.execute(
                 "SELECT COUNT(*) FROM post_likes WHERE post_id = %(post_id)s",
-                {"post_id": request.post_id}
+                {"post_id": request.post_id},
+                settings=settings,
             )[0][0]
             
             comments = db.execute(
                 "SELECT COUNT(*) FROM post_comments WHERE post_id = %(post_id)s",
-                {"post_id": request.post_id}
+                {"post_id": request.post_id},
+                settings=settings,
             )[0][0]
             
             logger.info(f"Retrieved stats for post {request.post_id}: views={views}, likes={likes}, comments={comments}")
@@ -41,7 +54,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             )
         except Exception as e:
             logger.error(f"Error in GetPostStats: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Internal error: {str(e)}")
             return stats_pb2.PostStatsResponse()
 
@@ -50,6 +63,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             logger.info(f"Getting views timeline for post: {request.post_id}")
             
             db = get_db()
+            settings = query_settings(context.time_remaining())
             
             params = {
                 "post_id": request.post_id
@@ -83,7 +97,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             
             query += " GROUP BY day ORDER BY day"
             
-            result = db.execute(query, params)
+            result = db.execute(query, params, settings=settings)
             
             entries = [
                 stats_pb2.TimelineEntry(date=day.strftime('%Y-%m-%d'), count=count)
@@ -95,7 +109,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             return stats_pb2.PostTimelineResponse(entries=entries)
         except Exception as e:
             logger.error(f"Error in GetPostViewsTimeline: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Internal error: {str(e)}")
             return stats_pb2.PostTimelineResponse()
 
@@ -105,6 +119,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             logger.info(f"Getting likes timeline for post: {request.post_id}")
             
             db = get_db()
+            settings = query_settings(context.time_remaining())
             
             query = """
                 SELECT 
@@ -134,7 +149,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             
             query += " GROUP BY day ORDER BY day"
             
-            result = db.execute(query, params)
+            result = db.execute(query, params, settings=settings)
             
             entries = [
                 stats_pb2.TimelineEntry(date=day.strftime('%Y-%m-%d'), count=count)
@@ -146,7 +161,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             return stats_pb2.PostTimelineResponse(entries=entries)
         except Exception as e:
             logger.error(f"Error in GetPostLikesTimeline: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Internal error: {str(e)}")
             return stats_pb2.PostTimelineResponse()
 
@@ -155,6 +170,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             logger.info(f"Getting comments timeline for post: {request.post_id}")
             
             db = get_db()
+            settings = query_settings(context.time_remaining())
             
             query = """
                 SELECT 
@@ -184,7 +200,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             
             query += " GROUP BY day ORDER BY day"
             
-            result = db.execute(query, params)
+            result = db.execute(query, params, settings=settings)
             
             entries = [
                 stats_pb2.TimelineEntry(date=day.strftime('%Y-%m-%d'), count=count)
@@ -196,7 +212,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             return stats_pb2.PostTimelineResponse(entries=entries)
         except Exception as e:
             logger.error(f"Error in GetPostCommentsTimeline: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Internal error: {str(e)}")
             return stats_pb2.PostTimelineResponse()
 
@@ -213,6 +229,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             logger.info(f"Getting top {limit} posts by {metric_type}")
             
             db = get_db()
+            settings = query_settings(context.time_remaining())
             
             if metric_type == "views":
                 table = "post_views"
@@ -231,7 +248,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
                 LIMIT {limit}
             """
             
-            result = db.execute(query)
+            result = db.execute(query, settings=settings)
             
             entries = [
                 stats_pb2.TopPostEntry(
@@ -246,7 +263,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             return stats_pb2.TopPostsResponse(posts=entries)
         except Exception as e:
             logger.error(f"Error in GetTopPosts: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Internal error: {str(e)}")
             return stats_pb2.TopPostsResponse()
 
@@ -263,6 +280,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             logger.info(f"Getting top {limit} users by {metric_type}")
             
             db = get_db()
+            settings = query_settings(context.time_remaining())
             
             if metric_type == "views":
                 table = "post_views"
@@ -281,7 +299,7 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
                 LIMIT {limit}
             """
             
-            result = db.execute(query)
+            result = db.execute(query, settings=settings)
             
             entries = [
                 stats_pb2.TopUserEntry(
@@ -296,6 +314,6 @@ class StatsServicer(stats_pb2_grpc.StatsServiceServicer):
             return stats_pb2.TopUsersResponse(users=entries)
         except Exception as e:
             logger.error(f"Error in GetTopUsers: {str(e)}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(error_code(e))
             context.set_details(f"Internal error: {str(e)}")
             return stats_pb2.TopUsersResponse()
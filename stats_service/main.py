@@ -1,12 +1,16 @@
 import concurrent.futures
 import grpc
-import time
 import logging
 import os
 import signal
 import sys
+import threading
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+from prometheus_client import start_http_server
 from grpc_server.stats_server import StatsServicer
-from proto import stats_pb2_grpc
+from grpc_server.readiness import ReadinessInterceptor
+from proto import stats_pb2, stats_pb2_grpc
+from metrics.interceptor import MetricsInterceptor
 from db.database import init_db
 from broker.consumer import init_kafka_consumer, get_kafka_consumer, close_kafka_consumer
 
@@ -16,34 +20,77 @@ logger = logging.getLogger(__name__)
 def signal_handler(sig, frame):
     logger.info("Stopping")
     if server:
-        server.stop(0)
+        health_servicer.enter_graceful_shutdown()
+        server.stop(SHUTDOWN_GRACE).wait()
     close_kafka_consumer()
     sys.exit(0)
 
 signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
+SERVICE_NAME = stats_pb2.DESCRIPTOR.services_by_name["StatsService"].full_name
+
+SHUTDOWN_GRACE = float(os.getenv("GRPC_SHUTDOWN_GRACE", "5"))
+MAX_MESSAGE_BYTES = int(os.getenv("GRPC_MAX_MESSAGE_BYTES", str(16 * 1024 * 1024)))
+
+SERVER_OPTIONS = [
+    ("grpc.max_connection_age_ms", int(os.getenv("GRPC_MAX_CONNECTION_AGE_MS", "30000"))),
+    ("grpc.max_connection_age_grace_ms", int(os.getenv("GRPC_MAX_CONNECTION_AGE_GRACE_MS", "5000"))),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.min_ping_interval_without_data_ms", int(os.getenv("GRPC_MIN_PING_INTERVAL_MS", "10000"))),
+    ("grpc.max_concurrent_streams", int(os.getenv("GRPC_MAX_CONCURRENT_STREAMS", "100"))),
+    ("grpc.max_send_message_length", MAX_MESSAGE_BYTES),
+    ("grpc.max_receive_message_length", MAX_MESSAGE_BYTES),
+]
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+
+
+def init_dependencies(health_servicer, readiness):
+    try:
+        logger.info("ClickHouse and Kafka consumer init")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            dependencies = [executor.submit(init_db), executor.submit(init_kafka_consumer)]
+            for dependency in dependencies:
+                dependency.result()
+        get_kafka_consumer().start()
+    except Exception as e:
+        logger.error(f"Dependency init failed: {e}")
+        server.stop(0)
+        return
+
+    readiness.set_ready()
+    health_servicer.set("", health_pb2.HealthCheckResponse.SERVING)
+    health_servicer.set(SERVICE_NAME, health_pb2.HealthCheckResponse.SERVING)
+    logger.info("Stats service ready")
+
 def serve():
-    global server
-    
-    logger.info("ClickHouse init")
-    init_db()
-    
-    logger.info("Kafka consumer init")
-    init_kafka_consumer()
-    get_kafka_consumer().start()
+    global server, health_servicer
     
     logger.info("gRPC starting")
-    server = grpc.server(concurrent.futures.ThreadPoolExecutor(max_workers=10))
+    readiness = ReadinessInterceptor()
+    server = grpc.server(
+        concurrent.futures.ThreadPoolExecutor(max_workers=10),
+        interceptors=[MetricsInterceptor(), readiness],
+        options=SERVER_OPTIONS,
+    )
     stats_pb2_grpc.add_StatsServiceServicer_to_server(StatsServicer(), server)
     
+    health_servicer = health.HealthServicer()
+    health_servicer.set("", health_pb2.HealthCheckResponse.NOT_SERVING)
+    health_servicer.set(SERVICE_NAME, health_pb2.HealthCheckResponse.NOT_SERVING)
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    
     port = os.getenv("GRPC_PORT", "50053")
     
     server.add_insecure_port(f"[::]:{str(port)}")
     server.start()
+    start_http_server(METRICS_PORT)
     
     logger.info(f"gRPC stats server launched on port {str(port)}")
     
+    threading.Thread(target=init_dependencies, args=(health_servicer, readiness), daemon=True).start()
+    
     server.wait_for_termination()
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+import grpc
+import pytest
+from concurrent import futures
+from unittest.mock import patch
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+
+from grpc_server.readiness import ReadinessInterceptor
+from grpc_server.stats_server import StatsServicer
+from proto import stats_pb2, stats_pb2_grpc
+
+
+@pytest.fixture
+def server():
+    readiness = ReadinessInterceptor()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2), interceptors=[readiness])
+    stats_pb2_grpc.add_StatsServiceServicer_to_server(StatsServicer(), server)
+    health_servicer = health.HealthServicer()
+    health_servicer.set("", health_pb2.HealthCheckResponse.NOT_SERVING)
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    try:
+        with grpc.insecure_channel(f"localhost:{port}") as channel:
+            yield readiness, channel
+    finally:
+        server.stop(None)
+
+
+def test_rpcs_are_unavailable_until_dependencies_are_ready(server):
+    readiness, channel = server
+    stub = stats_pb2_grpc.StatsServiceStub(channel)
+
+    with pytest.raises(grpc.RpcError) as error:
+        stub.GetPostStats(stats_pb2.PostStatsRequest(post_id="post-1"))
+    assert error.value.code() == grpc.StatusCode.UNAVAILABLE
+
+    health_response = health_pb2_grpc.HealthStub(channel).Check(health_pb2.HealthCheckRequest())
+    assert health_response.status == health_pb2.HealthCheckResponse.NOT_SERVING
+
+    readiness.set_ready()
+    with patch("grpc_server.stats_server.get_db") as db_mock:
+        db_mock.return_value.execute.return_value = [(1,)]
+
+        response = stub.GetPostStats(stats_pb2.PostStatsRequest(post_id="post-1"))
+
+    assert response.views == 1
@@ -16,6 +16,7 @@ from grpc_server.stats_server import StatsServicer
 def stats_servicer():
     servicer = StatsServicer()
     context = MagicMock()
+    context.time_remaining.return_value = None
 
     with patch("grpc_server.stats_server.get_db") as db_mock:
         db_instance_mock = MagicMock()
@@ -322,6 +323,79 @@ def test_get_top_posts_by_comments_with_sql_injection_prevention(stats_servicer)
     context.set_code.assert_not_called()
 
 
+def test_get_post_stats_uses_deadline_as_execution_limit(stats_servicer):
+    servicer, context, db_mock = stats_servicer
+    context.time_remaining.return_value = 1.9
+
+    db_mock.execute.side_effect = [
+        [(1,)],
+        [(2,)],
+        [(3,)],
+    ]
+
+    request = stats_pb2.PostStatsRequest(post_id=str(uuid.uuid4()))
+    servicer.GetPostStats(request, context)
+
+    for call in db_mock.execute.call_args_list:
+        assert call[1]["settings"] == {"max_execution_time": 1}
+
+def test_get_top_posts_timeout_maps_to_deadline_exceeded(stats_servicer):
+    from clickhouse_driver.errors import ErrorCodes, ServerException
+
+    servicer, context, db_mock = stats_servicer
+    context.time_remaining.return_value = 1.5
+
+    db_mock.execute.side_effect = ServerException(
+        "Timeout exceeded: elapsed 1 seconds", code=ErrorCodes.TIMEOUT_EXCEEDED
+    )
+
+    request = stats_pb2.TopRequest(metric_type=stats_pb2.TopRequest.MetricType.VIEWS, limit=5)
+    servicer.GetTopPosts(request, context)
+
+    assert db_mock.execute.call_args[1]["settings"] == {"max_execution_time": 1}
+    context.set_code.assert_called_with(grpc.StatusCode.DEADLINE_EXCEEDED)
+
+def test_sub_second_deadline_fails_fast(stats_servicer):
+    servicer, context, db_mock = stats_servicer
+    context.time_remaining.return_value = 0.2
+
+    servicer.GetPostStats(stats_pb2.PostStatsRequest(post_id=str(uuid.uuid4())), context)
+
+    db_mock.execute.assert_not_called()
+    context.set_code.assert_called_with(grpc.StatusCode.DEADLINE_EXCEEDED)
+
+def test_query_settings_without_deadline():
+    from db.database import query_settings
+
+    assert query_settings(None) is None
+    assert query_settings(9.223372036854776e18) is None
+
+
+@pytest.mark.parametrize("timeout, settings", [(None, None), (5, {"max_execution_time": 4})])
+def test_sync_server_deadline_becomes_execution_limit(timeout, settings):
+    from concurrent import futures
+    from proto import stats_pb2_grpc
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    stats_pb2_grpc.add_StatsServiceServicer_to_server(StatsServicer(), server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    try:
+        with patch("grpc_server.stats_server.get_db") as db_mock, \
+                grpc.insecure_channel(f"localhost:{port}") as channel:
+            db_mock.return_value.execute.return_value = [(1,)]
+
+            response = stats_pb2_grpc.StatsServiceStub(channel).GetPostStats(
+                stats_pb2.PostStatsRequest(post_id="post-1"), timeout=timeout
+            )
+
+            assert response.views == 1
+            for call in db_mock.return_value.execute.call_args_list:
+                assert call[1]["settings"] == settings
+    finally:
+        server.stop(None)
+
+
 @pytest.fixture(scope="module")
 def kafka_producer():
     producer = KafkaProducer(
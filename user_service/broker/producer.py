@@ -18,12 +18,12 @@ KAFKA_BOOTSTRAP_SERVERS = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "kafka:29092")
 
 
 class KafkaMessageProducer:    
-    def __init__(self, bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS, max_retries=5, retry_delay=2):
+    def __init__(self, bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS, max_retries=8, retry_delay=0.5, max_retry_delay=10):
         self.bootstrap_servers = bootstrap_servers
         self.producer = None
-        self.connect_with_retry(max_retries, retry_delay)
+        self.connect_with_retry(max_retries, retry_delay, max_retry_delay)
     
-    def connect_with_retry(self, max_retries=5, retry_delay=2):
+    def connect_with_retry(self, max_retries=8, retry_delay=0.5, max_retry_delay=10):
         for attempt in range(max_retries):
             try:
                 logger.info(f"Connecting Kafka {attempt+1}")
@@ -39,8 +39,9 @@ class KafkaMessageProducer:
             except Exception as e:
                 logger.warning(f"Kafka error {attempt+1}: {e}")
                 if attempt < max_retries - 1:
-                    logger.info(f"Retry in {retry_delay} sec")
-                    time.sleep(retry_delay)
+                    delay = min(retry_delay * 2 ** attempt, max_retry_delay)
+                    logger.info(f"Retry in {delay} sec")
+                    time.sleep(delay)
                 else:
                     logger.error("Kafka connection failed")
                     raise
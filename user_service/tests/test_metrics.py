@@ -0,0 +1,59 @@
+import grpc
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from prometheus_client import REGISTRY
+
+from metrics.interceptor import MetricsInterceptor
+
+
+def latency_count(method, code):
+    return REGISTRY.get_sample_value(
+        "grpc_server_handling_seconds_count",
+        {"grpc_service": "test.Service", "grpc_method": method, "grpc_code": code},
+    ) or 0
+
+
+def in_flight(method):
+    return REGISTRY.get_sample_value(
+        "grpc_server_in_flight", {"grpc_service": "test.Service", "grpc_method": method}
+    ) or 0
+
+
+def intercept(method, behavior):
+    return MetricsInterceptor().intercept_service(
+        lambda details: grpc.unary_unary_rpc_method_handler(behavior),
+        SimpleNamespace(method=f"/test.Service/{method}"),
+    )
+
+
+def test_interceptor_records_latency_and_in_flight():
+    seen = []
+
+    def behavior(request, context):
+        seen.append(in_flight("Get"))
+        return "response"
+
+    context = MagicMock()
+    context.code.return_value = None
+    before = latency_count("Get", "OK")
+
+    assert intercept("Get", behavior).unary_unary("request", context) == "response"
+
+    assert seen == [1]
+    assert in_flight("Get") == 0
+    assert latency_count("Get", "OK") == before + 1
+
+
+def test_interceptor_labels_latency_with_status_code():
+    def behavior(request, context):
+        context.code.return_value = grpc.StatusCode.NOT_FOUND
+        return None
+
+    context = MagicMock()
+    context.code.return_value = None
+    before = latency_count("Missing", "NOT_FOUND")
+
+    intercept("Missing", behavior).unary_unary("request", context)
+
+    assert in_flight("Missing") == 0
+    assert latency_count("Missing", "NOT_FOUND") == before + 1
@@ -0,0 +1,47 @@
+import grpc
+import pytest
+from concurrent import futures
+from unittest.mock import patch
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+
+from grpc_server.readiness import ReadinessInterceptor
+from grpc_server.user_server import UserServicer
+from proto import user_pb2, user_pb2_grpc
+
+
+@pytest.fixture
+def server():
+    readiness = ReadinessInterceptor()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2), interceptors=[readiness])
+    user_pb2_grpc.add_UserServiceServicer_to_server(UserServicer(), server)
+    health_servicer = health.HealthServicer()
+    health_servicer.set("", health_pb2.HealthCheckResponse.NOT_SERVING)
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    try:
+        with grpc.insecure_channel(f"localhost:{port}") as channel:
+            yield readiness, channel
+    finally:
+        server.stop(None)
+
+
+def test_rpcs_are_unavailable_until_dependencies_are_ready(server):
+    readiness, channel = server
+    stub = user_pb2_grpc.UserServiceStub(channel)
+
+    with pytest.raises(grpc.RpcError) as error:
+        stub.Login(user_pb2.LoginRequest(email="test@example.com", password="password123"))
+    assert error.value.code() == grpc.StatusCode.UNAVAILABLE
+
+    health_response = health_pb2_grpc.HealthStub(channel).Check(health_pb2.HealthCheckRequest())
+    assert health_response.status == health_pb2.HealthCheckResponse.NOT_SERVING
+
+    readiness.set_ready()
+    with patch("grpc_server.user_server.get_db") as db_mock:
+        db_mock.return_value.query.return_value.filter.return_value.first.return_value = None
+
+        response = stub.Login(user_pb2.LoginRequest(email="test@example.com", password="password123"))
+
+    assert response.success is False
+    assert response.message == "Invalid credentials"
@@ -177,3 +177,39 @@ def test_login_invalid_credentials(user_servicer):
     
     assert response.success == False
     assert response.message == "Invalid credentials"
+
+
+def test_db_engine_uses_configured_pool():
+    from db import database
+
+    engine = database.create_db_engine()
+
+    assert isinstance(engine.pool, database.InstrumentedQueuePool)
+    assert engine.pool.size() == database.DB_POOL_SIZE
+    assert engine.pool._max_overflow == database.DB_MAX_OVERFLOW
+    assert engine.pool._timeout == database.DB_POOL_TIMEOUT
+    assert engine.pool._recycle == database.DB_POOL_RECYCLE
+    assert engine.pool._pre_ping == database.DB_POOL_PRE_PING
+
+
+def test_pool_checkout_wait_and_timeouts_are_measured():
+    from prometheus_client import REGISTRY
+    from sqlalchemy import create_engine, exc
+    from db import database
+
+    engine = create_engine(
+        "sqlite://",
+        poolclass=database.InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    waits = REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count") or 0
+    timeouts = REGISTRY.get_sample_value("db_pool_checkout_timeouts_total") or 0
+
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count") == waits + 2
+    assert REGISTRY.get_sample_value("db_pool_checkout_timeouts_total") == timeouts + 1